@@ -2,11 +2,15 @@
 Authentication utilities for TutorConnect application.
 """
 from functools import wraps
-from flask import session, redirect, url_for, flash, current_app, request
+from flask import session, redirect, url_for, flash, current_app, request, g
+from sqlalchemy.orm import joinedload
+from db import db
 from models.student import Student
 from models.tutor import Tutor, TutorStatus
 from models.admin import Admin
 from models.user import UserRole
+from models.user_directory import UserDirectory
+from utils.password_hashing import PasswordHashingBusy
 
 def login_user(user_id, role, fullname):
     """
@@ -29,27 +33,53 @@ def logout_user():
     """Log out the current user by clearing their session data."""
     session.clear()
 
-def get_current_user():
+# User model and relationships to eager load for each role. Relationships
+# listed here are rendered on most pages of that role's area (profile and
+# settings), so they are fetched in the same query as the user.
+USER_MODELS = {
+    UserRole.STUDENT.value: Student,
+    UserRole.TUTOR.value: Tutor,
+    UserRole.ADMIN.value: Admin,
+}
+EAGER_LOADS = {
+    UserRole.STUDENT.value: (Student.subjects,),
+    UserRole.TUTOR.value: (Tutor.subjects,),
+    UserRole.ADMIN.value: (),
+}
+
+def load_current_user():
     """
-    Get the currently logged in user.
+    Resolve the logged in user once per request and store it in g.current_user.
     
-    Returns:
-        User or None: The current user or None if no user is logged in
+    Registered as a before_request handler. Sessions that point at a user
+    that no longer exists are cleared.
     """
+    g.current_user = None
+    if request.endpoint == 'static':
+        return
     if 'user_id' not in session or 'user_role' not in session:
-        return None
+        return
         
-    user_id = session['user_id']
     role = session['user_role']
+    model = USER_MODELS.get(role)
+    if model is None:
+        return
+    
+    options = [joinedload(relationship) for relationship in EAGER_LOADS[role]]
+    g.current_user = db.session.get(model, session['user_id'], options=options)
+    if g.current_user is None:
+        logout_user()
+
+def get_current_user():
+    """
+    Get the currently logged in user.
     
-    if role == UserRole.STUDENT.value:
-        return Student.query.get(user_id)
-    elif role == UserRole.TUTOR.value:
-        return Tutor.query.get(user_id)
-    elif role == UserRole.ADMIN.value:
-        return Admin.query.get(user_id)
-    else:
-        return None
+    Returns:
+        User or None: The current user or None if no user is logged in
+    """
+    if 'current_user' not in g:
+        load_current_user()
+    return g.current_user
 
 def authenticate_user(email, password):
     """
@@ -60,26 +90,24 @@ def authenticate_user(email, password):
         password (str): The user's password
         
     Returns:
-        User or None: The authenticated user or None if authentication failed
+        User, str or None: The authenticated user, 'unverified_tutor',
+            'busy' if password checks are saturated, or None if
+            authentication failed
     """
-    # Try to find the user as a student first
-    user = Student.query.filter_by(email=email).first()
-    
-    # If not found, try as a tutor
-    if not user:
-        user = Tutor.query.filter_by(email=email).first()
-        # Check if tutor is verified before allowing login
-        if user and user.status != TutorStatus.VERIFIED:
-            # Return a special indicator for unverified tutors
-            return 'unverified_tutor'
+    # Resolve the account in any role with a single directory lookup
+    user = UserDirectory.find_user(email)
     
-    # If still not found, try as admin (admin login should use separate function)
-    if not user:
-        user = Admin.query.filter_by(email=email).first()
+    # Check if tutor is verified before allowing login
+    if isinstance(user, Tutor) and user.status != TutorStatus.VERIFIED:
+        # Return a special indicator for unverified tutors
+        return 'unverified_tutor'
         
     # Verify password if user was found
-    if user and user.verify_password(password):
-        return user
+    try:
+        if user and user.verify_password(password):
+            return user
+    except PasswordHashingBusy:
+        return 'busy'
         
     return None
 
@@ -92,12 +120,16 @@ def authenticate_admin(email, password):
         password (str): The admin's password
         
     Returns:
-        Admin or None: The authenticated admin or None if authentication failed
+        Admin, str or None: The authenticated admin, 'busy' if password
+            checks are saturated, or None if authentication failed
     """
-    admin = Admin.query.filter_by(email=email).first()
+    admin = UserDirectory.find_user(email, roles=[UserRole.ADMIN])
     
-    if admin and admin.verify_password(password):
-        return admin
+    try:
+        if admin and admin.verify_password(password):
+            return admin
+    except PasswordHashingBusy:
+        return 'busy'
         
     return None
 
@@ -113,7 +145,7 @@ def login_required(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
+        if get_current_user() is None:
             flash('Please log in to access this page.', 'error')
             next_url = request.url if request.url else None
             return redirect(url_for('main.login', next=next_url))
@@ -133,7 +165,8 @@ def role_required(roles):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            if 'user_role' not in session or session['user_role'] not in roles:
+            user = get_current_user()
+            if user is None or user.role.value not in roles:
                 flash('You do not have permission to access this page.', 'error')
                 return redirect(url_for('main.index'))
             return f(*args, **kwargs)
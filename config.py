@@ -21,9 +21,67 @@ SQLALCHEMY_DATABASE_URI = f'mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_H
 SQLALCHEMY_TRACK_MODIFICATIONS = True
 SQLALCHEMY_ECHO = os.environ.get('SQLALCHEMY_ECHO', True)
 
+# Tutor search settings
+SUBJECT_VOCABULARY_TTL = int(os.environ.get('SUBJECT_VOCABULARY_TTL', 300))  # Seconds before the subject dropdown cache is rebuilt
+TUTOR_SEARCH_PAGE_SIZE = int(os.environ.get('TUTOR_SEARCH_PAGE_SIZE', 12))  # Tutors shown per search results page
+TUTOR_SEARCH_MAX_IN_IDS = int(os.environ.get('TUTOR_SEARCH_MAX_IN_IDS', 500))  # Larger search candidate sets are filtered in Python while paging instead of sent as an IN list
+TUTOR_SEARCH_INDEX_MAX_AGE = int(os.environ.get('TUTOR_SEARCH_INDEX_MAX_AGE', 300))  # Seconds before the text search index is rebuilt to pick up tutor changes made by other processes
+
+# Availability settings
+AVAILABILITY_INDEX_MAX_AGE = int(os.environ.get('AVAILABILITY_INDEX_MAX_AGE', 3600))  # Seconds before the search index reloads bitmaps rebuilt by other processes
+AVAILABILITY_OCCURRENCE_WEEKS = int(os.environ.get('AVAILABILITY_OCCURRENCE_WEEKS', 10))  # Weeks of weekly availability expanded into UTC occurrences (must cover the booking window plus the longest series)
+
+# Booking settings
+BOOKING_SERIES_MAX_WEEKS = int(os.environ.get('BOOKING_SERIES_MAX_WEEKS', 8))  # Most sessions in one weekly recurring booking
+
+# Tutor inbox settings
+TUTOR_INBOX_PAGE_SIZE = int(os.environ.get('TUTOR_INBOX_PAGE_SIZE', 20))  # Messages shown per inbox page
+
+# Live update (Server-Sent Events) settings. Every open stream holds a server thread for as long as
+# the tab is open, so only enable them on a threaded or async server (e.g. gunicorn with gthread/gevent).
+EVENTS_ENABLED = os.environ.get('EVENTS_ENABLED', 'false').lower() in ['true', 'on', '1']
+EVENTS_MAX_STREAMS = int(os.environ.get('EVENTS_MAX_STREAMS', 20))  # Concurrent streams per process; others back off and retry
+EVENTS_MAX_STREAM_SECONDS = float(os.environ.get('EVENTS_MAX_STREAM_SECONDS', 300))  # Streams are closed after this long and the browser reconnects
+EVENTS_BACKEND = os.environ.get('EVENTS_BACKEND', 'local')  # 'local' (single process), 'sqlite' (multiple workers) or 'module:Class'
+EVENTS_SQLITE_PATH = os.environ.get('EVENTS_SQLITE_PATH', os.path.join(BASE_DIR, 'events.sqlite3'))
+EVENTS_POLL_INTERVAL = float(os.environ.get('EVENTS_POLL_INTERVAL', 0.25))  # Seconds between polls of the SQLite relay
+EVENTS_KEEPALIVE = 15  # Seconds between keepalive comments on idle streams
+
+# Query diagnostics (the counter defaults to on in debug and testing mode)
+QUERY_COUNTER_ENABLED = os.environ.get('QUERY_COUNTER_ENABLED', '').lower() in ['true', 'on', '1'] or None
+QUERY_COUNTER_REPEAT_THRESHOLD = int(os.environ.get('QUERY_COUNTER_REPEAT_THRESHOLD', 3))  # Repeats of one statement shape per request before warning
+
 # Authentication settings
 AUTH_TOKEN_EXPIRY = 86400  # 24 hours in seconds
 
+# Buffered last_login / last_action writes
+TOUCH_FLUSH_INTERVAL = float(os.environ.get('TOUCH_FLUSH_INTERVAL', 10))  # Seconds between batched timestamp updates
+TOUCH_MAX_PENDING = int(os.environ.get('TOUCH_MAX_PENDING', 500))  # Buffered rows that trigger an early flush
+
+# Password hashing (werkzeug method string; hashes made with another method are upgraded at login).
+# Pick the cost with scripts/benchmark_password_hash.py so one verification takes ~250 ms.
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 4))  # Hashes computed concurrently
+PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 32))  # Logins allowed to wait for a free worker
+PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 5))  # Seconds to wait before turning a login away
+
+# Reverse proxy: number of proxies in front of the app whose X-Forwarded-For/-Proto headers are trusted
+# (0 when clients connect directly). Rate limits key on the client IP, so set this behind nginx or a load balancer.
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+
+# Login and password reset throttling: (attempts, window in seconds) per client IP and per email
+# (login limits count only failed attempts against the email)
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')  # 'memory' (single process), 'sqlite' (multiple workers) or 'module:Class'
+RATE_LIMIT_SQLITE_PATH = os.environ.get('RATE_LIMIT_SQLITE_PATH', os.path.join(BASE_DIR, 'rate_limit.sqlite3'))
+RATE_LIMITS = {
+    'login_ip': (30, 300),
+    'login_email': (10, 900),
+    'admin_login_ip': (10, 300),
+    'admin_login_email': (5, 900),
+    'password_reset_ip': (10, 3600),
+    'password_reset_email': (3, 3600),
+}
+
 # OAuth Configuration
 GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID', '')
 GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET', '')
@@ -31,6 +89,30 @@ GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET', '')
 MICROSOFT_CLIENT_ID = os.environ.get('MICROSOFT_CLIENT_ID', '')
 MICROSOFT_CLIENT_SECRET = os.environ.get('MICROSOFT_CLIENT_SECRET', '')
 
+# OAuth provider endpoints (override to sign in against a local mock provider)
+GOOGLE_AUTHORIZE_URL = os.environ.get('GOOGLE_AUTHORIZE_URL', 'https://accounts.google.com/o/oauth2/v2/auth')
+GOOGLE_TOKEN_URL = os.environ.get('GOOGLE_TOKEN_URL', 'https://oauth2.googleapis.com/token')
+GOOGLE_JWKS_URL = os.environ.get('GOOGLE_JWKS_URL', 'https://www.googleapis.com/oauth2/v3/certs')
+GOOGLE_USERINFO_URL = os.environ.get('GOOGLE_USERINFO_URL', 'https://openidconnect.googleapis.com/v1/userinfo')
+GOOGLE_ISSUER = os.environ.get('GOOGLE_ISSUER', 'https://accounts.google.com,accounts.google.com').split(',')
+
+MICROSOFT_AUTHORIZE_URL = os.environ.get('MICROSOFT_AUTHORIZE_URL', 'https://login.microsoftonline.com/common/oauth2/v2.0/authorize')
+MICROSOFT_TOKEN_URL = os.environ.get('MICROSOFT_TOKEN_URL', 'https://login.microsoftonline.com/common/oauth2/v2.0/token')
+MICROSOFT_JWKS_URL = os.environ.get('MICROSOFT_JWKS_URL', 'https://login.microsoftonline.com/common/discovery/v2.0/keys')
+MICROSOFT_USERINFO_URL = os.environ.get('MICROSOFT_USERINFO_URL', 'https://graph.microsoft.com/v1.0/me')
+MICROSOFT_ISSUER = os.environ.get('MICROSOFT_ISSUER', 'https://login.microsoftonline.com/{tenantid}/v2.0')  # {tenantid} is taken from the token
+# Tenant IDs allowed to sign in with Microsoft (empty allows any tenant). Microsoft emails are set by each
+# tenant and only trusted to match existing accounts from these tenants; other users are matched by their linked ID.
+MICROSOFT_ALLOWED_TENANTS = [tenant.strip() for tenant in os.environ.get('MICROSOFT_ALLOWED_TENANTS', '').split(',') if tenant.strip()]
+
+OAUTH_JWKS_TTL = 3600  # Seconds provider signing keys are cached
+
+# Outbound HTTP client (OAuth providers)
+HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 3.05))  # Seconds to establish a connection
+HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', 10))  # Seconds to wait for response data
+HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', 2))  # Retries per call (POSTs only retry failed connections)
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', 10))  # Keep-alive connections per host
+
 # Email Configuration for Password Reset
 MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
 MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
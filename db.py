@@ -1,12 +1,60 @@
 """
 Database initialization and configuration for TutorConnect.
 """
+from contextlib import contextmanager
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.exc import SQLAlchemyError
 
 # Create SQLAlchemy db instance
 db = SQLAlchemy()
 
+@contextmanager
+def unit_of_work():
+    """
+    Commit everything staged inside the block once, or roll it all back.
+    
+    Model methods only add and flush their changes; requests are committed
+    by the handlers from init_unit_of_work. Scripts and background jobs
+    wrap their work in this context manager instead.
+    
+    Yields:
+        Session: The database session
+    """
+    try:
+        yield db.session
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+def init_unit_of_work(app):
+    """
+    Commit each request's changes in a single transaction when it ends.
+    
+    Successful responses (below 400) are committed before they are sent,
+    so a failing commit still turns into an error response. Error
+    responses and unhandled exceptions roll everything back.
+    
+    Args:
+        app (Flask): The Flask application
+    """
+    @app.after_request
+    def commit_unit_of_work(response):
+        if response.status_code >= 400:
+            db.session.rollback()
+        else:
+            try:
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+        return response
+    
+    @app.teardown_request
+    def rollback_unit_of_work(exception):
+        if exception is not None:
+            db.session.rollback()
+
 def init_db(app):
     """Initialize the database with the Flask application."""
     db.init_app(app)
@@ -15,12 +63,17 @@ def init_db(app):
         try:
             # Import models to ensure they are registered with SQLAlchemy
             from models.user import User
+            from models.subject import Subject
             from models.student import Student
             from models.tutor import Tutor
             from models.message import Message
+            from models.conversation import Conversation
             from models.admin import Admin
-            from models.availability import TutorAvailability
-            from models.booking import Booking
+            from models.user_directory import UserDirectory
+            from models.oauth_identity import OAuthIdentity
+            from models.availability import (TutorAvailability, TutorAvailabilityBitmap, TutorAvailabilityOccurrence,
+                                             TutorAvailabilityException)
+            from models.booking import Booking, BookingSeries, TutorBookingDay
             
             # Create all tables if they don't exist
             db.create_all()
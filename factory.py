@@ -5,6 +5,7 @@ import os
 import datetime
 from flask import Flask, session
 from flask_moment import Moment
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 def create_app(config_filename=None):
     """
@@ -32,6 +33,11 @@ def create_app(config_filename=None):
     # Set secret key from config
     app.secret_key = app.config.get('SECRET_KEY', 'default_key')
     
+    # Take the client IP and scheme from trusted reverse proxy headers
+    proxy_hops = app.config.get('TRUSTED_PROXY_HOPS', 0)
+    if proxy_hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops)
+    
     # Configure session to expire after a specified time
     app.permanent_session_lifetime = datetime.timedelta(seconds=app.config.get('AUTH_TOKEN_EXPIRY', 86400))
     
@@ -42,20 +48,66 @@ def create_app(config_filename=None):
     # Initialize the database
     init_database(app)
     
+    # Build in-memory search indexes and caches
+    init_search(app)
+    
+    # Configure the live update event bus
+    from utils.events import init_events
+    init_events(app)
+    
+    # Run password hashing on a bounded worker pool
+    from utils.password_hashing import init_password_hashing
+    init_password_hashing(app)
+    
+    # Batch last_login / last_action writes in the background
+    from utils.touch_buffer import init_touch_buffer
+    init_touch_buffer(app)
+    
+    # Share a pooled, timeout-bounded HTTP client for OAuth calls
+    from utils.http_client import init_http_client
+    init_http_client(app)
+    
+    # Throttle login and password reset attempts
+    from utils.rate_limit import init_rate_limit
+    init_rate_limit(app)
+    
+    # Resolve the logged in user once per request
+    from auth import load_current_user
+    app.before_request(load_current_user)
+    
     # Register blueprints
     register_blueprints(app)
     
+    # Flag repeated query shapes (N+1 patterns) in development and tests
+    from utils.query_counter import init_query_counter
+    init_query_counter(app)
+    
     return app
 
 def init_database(app):
     """
-    Initialize the database for the application.
+    Initialize the database and the per-request unit of work.
     
     Args:
         app (Flask): The Flask application
     """
-    from db import init_db
+    from db import init_db, init_unit_of_work
     init_db(app)
+    init_unit_of_work(app)
+
+def init_search(app):
+    """
+    Build the in-memory tutor search indexes and subject vocabulary cache.
+    
+    Args:
+        app (Flask): The Flask application
+    """
+    from utils.search_index import init_search_index
+    from utils.subject_vocabulary import init_subject_vocabulary
+    from utils.availability_index import init_availability_index
+    init_search_index(app)
+    init_subject_vocabulary(app)
+    init_availability_index(app)
 
 def register_blueprints(app):
     """
@@ -70,10 +122,12 @@ def register_blueprints(app):
     from views.tutor import tutor_bp
     from views.auth import auth_bp
     from views.admin import admin_bp
+    from views.events import events_bp
     
     # Register blueprints
     app.register_blueprint(main_bp)
     app.register_blueprint(student_bp, url_prefix='/student')
     app.register_blueprint(tutor_bp, url_prefix='/tutor')
     app.register_blueprint(auth_bp, url_prefix='/auth')
-    app.register_blueprint(admin_bp, url_prefix='/admin')
\ No newline at end of file
+    app.register_blueprint(admin_bp, url_prefix='/admin')
+    app.register_blueprint(events_bp, url_prefix='/events')
\ No newline at end of file
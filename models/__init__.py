@@ -4,6 +4,12 @@ Models package initialization for database models.
 from .user import User, UserRole
 from .student import Student
 from .tutor import Tutor
+from .admin import Admin
+from .user_directory import UserDirectory
+from .oauth_identity import OAuthIdentity
+from .subject import Subject
 from .message import Message
-from .availability import TutorAvailability, DayOfWeek
-from .booking import Booking, BookingStatus
\ No newline at end of file
+from .conversation import Conversation
+from .availability import (TutorAvailability, TutorAvailabilityBitmap, TutorAvailabilityOccurrence,
+                           TutorAvailabilityException, AvailabilityExceptionType, DayOfWeek)
+from .booking import Booking, BookingSeries, BookingStatus, TutorBookingDay
\ No newline at end of file
@@ -3,8 +3,10 @@ Admin model for TutorConnect application.
 """
 import datetime
 from flask import url_for, current_app
+from sqlalchemy.orm.attributes import set_committed_value
 from db import db
 from models.user import User, UserRole
+from utils.touch_buffer import touch_buffer
 
 class Admin(User):
     """Admin user model extending the base User model."""
@@ -57,14 +59,15 @@ class Admin(User):
         admin.password = password  # This will hash the password
         
         db.session.add(admin)
-        db.session.commit()
+        db.session.flush()
         
         return admin
     
     def update_last_action(self):
-        """Update the last action timestamp for the admin."""
-        self.last_action = datetime.datetime.utcnow()
-        db.session.commit()
+        """Update the last action timestamp for the admin (buffered like last_login)."""
+        now = datetime.datetime.utcnow()
+        set_committed_value(self, 'last_action', now)
+        touch_buffer.touch(Admin, 'last_action', self.id, now)
     
     def to_dict(self):
         """Convert the admin object to a dictionary."""
@@ -2,10 +2,13 @@
 Tutor availability model for TutorConnect application.
 """
 from enum import Enum
-from datetime import time, datetime
+from datetime import date, datetime, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import delete, insert, update
 from db import db
 from models.tutor import Tutor
-import pytz
+from utils.intervals import merge_intervals
+from utils.timezones import local_datetime_to_utc, local_to_utc, shift_times, utc_to_local, utc_offset_minutes
 
 class DayOfWeek(Enum):
     """Enum for days of the week."""
@@ -17,6 +20,50 @@ class DayOfWeek(Enum):
     SATURDAY = 5
     SUNDAY = 6
 
+class AvailabilityExceptionType(Enum):
+    """Enum for date-ranged availability exceptions."""
+    BLOCKED = 'blocked'  # Not available, e.g. holidays
+    EXTRA = 'extra'      # Available in addition to the weekly slots
+
+# Weekly availability bitmaps use 15-minute buckets over 7 days in UTC,
+# with bucket 0 starting at Monday 00:00 UTC
+BUCKET_MINUTES = 15
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+BUCKETS_PER_WEEK = MINUTES_PER_WEEK // BUCKET_MINUTES
+BITMAP_BYTES = BUCKETS_PER_WEEK // 8
+
+
+def week_bucket_mask(start_minute, end_minute, cover=False):
+    """
+    Build a bitmask of the weekly buckets for a span of minutes.
+    
+    Args:
+        start_minute (int): Start as minutes since Monday 00:00 UTC
+        end_minute (int): End as minutes since Monday 00:00 UTC; may exceed
+            the week length for spans that wrap around to Monday
+        cover (bool): If True, include every bucket the span touches (used for
+            queries); otherwise only buckets the span fully covers (used for
+            availability), so a query mask never matches partial availability
+            
+    Returns:
+        int: Bitmask with one bit per 15-minute bucket of the week
+    """
+    if end_minute <= start_minute:
+        return 0
+    if cover:
+        first = start_minute // BUCKET_MINUTES
+        last = -(-end_minute // BUCKET_MINUTES)
+    else:
+        first = -(-start_minute // BUCKET_MINUTES)
+        last = end_minute // BUCKET_MINUTES
+    
+    mask = 0
+    for bucket in range(first, last):
+        mask |= 1 << (bucket % BUCKETS_PER_WEEK)
+    return mask
+
+
 class TutorAvailability(db.Model):
     """Model to store tutor availability for each day of the week."""
     __tablename__ = 'tutor_availability'
@@ -26,6 +73,7 @@ class TutorAvailability(db.Model):
     day_of_week = db.Column(db.Enum(DayOfWeek), nullable=False)
     start_time = db.Column(db.Time, nullable=False)  # Time in GMT
     end_time = db.Column(db.Time, nullable=False)    # Time in GMT
+    utc_offset = db.Column(db.SmallInteger, nullable=True)  # Tutor's UTC offset in minutes when saved
     is_available = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -33,13 +81,14 @@ class TutorAvailability(db.Model):
     # Relationship to tutor
     tutor = db.relationship('Tutor', backref=db.backref('availability_slots', lazy=True))
     
-    def __init__(self, tutor_id, day_of_week, start_time, end_time, is_available=True):
+    def __init__(self, tutor_id, day_of_week, start_time, end_time, is_available=True, utc_offset=None):
         """Initialize availability slot."""
         self.tutor_id = tutor_id
         self.day_of_week = day_of_week
         self.start_time = start_time
         self.end_time = end_time
         self.is_available = is_available
+        self.utc_offset = utc_offset
     
     @classmethod
     def create_availability_slot(cls, tutor_id, day_of_week, start_time_str, end_time_str, 
@@ -58,67 +107,62 @@ class TutorAvailability(db.Model):
         Returns:
             TutorAvailability: The created availability slot
         """
-        # Parse time strings
-        start_hour, start_min = map(int, start_time_str.split(':'))
-        end_hour, end_min = map(int, end_time_str.split(':'))
-        
-        # Create time objects in tutor's timezone
-        tutor_tz = pytz.timezone(tutor_timezone)
-        
-        # Create a dummy date to work with timezone conversion
-        dummy_date = datetime.now().replace(hour=start_hour, minute=start_min, 
-                                          second=0, microsecond=0)
-        
-        # Localize to tutor's timezone and convert to GMT
-        localized_start = tutor_tz.localize(dummy_date)
-        gmt_start = localized_start.astimezone(pytz.UTC)
-        
-        dummy_date_end = datetime.now().replace(hour=end_hour, minute=end_min, 
-                                              second=0, microsecond=0)
-        localized_end = tutor_tz.localize(dummy_date_end)
-        gmt_end = localized_end.astimezone(pytz.UTC)
-        
-        # Extract time components
-        start_time_gmt = time(gmt_start.hour, gmt_start.minute)
-        end_time_gmt = time(gmt_end.hour, gmt_end.minute)
+        start_time_gmt, end_time_gmt = local_to_utc([(start_time_str, end_time_str)], tutor_timezone)[0]
         
         availability = cls(
             tutor_id=tutor_id,
             day_of_week=day_of_week,
             start_time=start_time_gmt,
             end_time=end_time_gmt,
-            is_available=is_available
+            is_available=is_available,
+            utc_offset=utc_offset_minutes(tutor_timezone, date.today())
         )
         
         db.session.add(availability)
-        db.session.commit()
+        db.session.flush()
         return availability
     
     def get_local_times(self, tutor_timezone):
         """
         Convert GMT times back to tutor's local timezone.
         
+        The slot is shifted by the offset it was saved with, so its
+        wall-clock times stay the same across DST transitions. Slots saved
+        before the offset was recorded fall back to today's offset.
+        
         Args:
             tutor_timezone (str): Tutor's timezone
             
         Returns:
             tuple: (local_start_time, local_end_time) as time objects
         """
-        tutor_tz = pytz.timezone(tutor_timezone)
-        
-        # Create datetime objects in GMT
-        dummy_date = datetime.now().replace(hour=self.start_time.hour, 
-                                          minute=self.start_time.minute)
-        gmt_start = pytz.UTC.localize(dummy_date)
-        local_start = gmt_start.astimezone(tutor_tz)
+        if self.utc_offset is None:
+            return utc_to_local([(self.start_time, self.end_time)], tutor_timezone)[0]
+        return shift_times([(self.start_time, self.end_time)], self.utc_offset)[0]
+    
+    @classmethod
+    def get_local_availability(cls, tutor_id, tutor_timezone):
+        """
+        Get a tutor's availability in their timezone, grouped by day name.
         
-        dummy_date_end = datetime.now().replace(hour=self.end_time.hour, 
-                                              minute=self.end_time.minute)
-        gmt_end = pytz.UTC.localize(dummy_date_end)
-        local_end = gmt_end.astimezone(tutor_tz)
+        Args:
+            tutor_id (int): The tutor's ID
+            tutor_timezone (str): Tutor's timezone
+            
+        Returns:
+            dict: Day name to a list of slot dictionaries with local times
+        """
+        slots = cls.query.filter_by(tutor_id=tutor_id).all()
         
-        return (time(local_start.hour, local_start.minute), 
-                time(local_end.hour, local_end.minute))
+        availability = {}
+        for slot in slots:
+            local_start, local_end = slot.get_local_times(tutor_timezone)
+            availability.setdefault(slot.day_of_week.name.lower(), []).append({
+                'start_time_local': local_start.strftime('%H:%M'),
+                'end_time_local': local_end.strftime('%H:%M'),
+                'is_available': slot.is_available
+            })
+        return availability
     
     @classmethod
     def get_tutor_availability(cls, tutor_id):
@@ -140,34 +184,111 @@ class TutorAvailability(db.Model):
         """
         Update all availability slots for a tutor.
         
+        The submitted slots are diffed against the stored ones by local
+        wall-clock time: unchanged slots are left alone, changed slots reuse
+        existing rows, and only the remainder is inserted or deleted. Each
+        kind of change is sent as one bulk statement within the current
+        transaction. Written slots record today's UTC offset.
+        
         Args:
             tutor_id (int): The tutor's ID
             availability_data (dict): Dictionary with day as key and list of time slots
             tutor_timezone (str): Tutor's timezone
         """
-        # Delete existing availability
-        cls.query.filter_by(tutor_id=tutor_id).delete()
-        
-        # Create new availability slots
+        # Collect the requested slots and convert them to GMT together
+        offset = utc_offset_minutes(tutor_timezone, date.today())
+        days = []
+        time_ranges = []
         for day_name, slots in availability_data.items():
-            if not slots:  # Skip if no slots for this day
-                continue
-                
-            # Convert day name to enum
             day_enum = DayOfWeek[day_name.upper()]
-            
-            for slot in slots:
+            for slot in slots or []:
                 if slot.get('is_available', False):
-                    cls.create_availability_slot(
-                        tutor_id=tutor_id,
-                        day_of_week=day_enum,
-                        start_time_str=slot['start_time'],
-                        end_time_str=slot['end_time'],
-                        tutor_timezone=tutor_timezone,
-                        is_available=True
-                    )
+                    days.append(day_enum)
+                    time_ranges.append((slot['start_time'], slot['end_time']))
+        
+        gmt_ranges = local_to_utc(time_ranges, tutor_timezone)
+        
+        # Local (day, start, end) -> GMT (start, end)
+        wanted = {}
+        for day_enum, local_range, gmt_range in zip(days, shift_times(gmt_ranges, offset), gmt_ranges):
+            wanted.setdefault((day_enum, *local_range), gmt_range)
+        
+        # Keep rows that already match; the rest can be reused or deleted
+        unused = []
+        for row in cls.query.filter_by(tutor_id=tutor_id).all():
+            key = (row.day_of_week, *row.get_local_times(tutor_timezone))
+            if key in wanted and row.is_available and row.utc_offset is not None:
+                del wanted[key]
+            else:
+                unused.append(row)
+        
+        missing = [(day_enum, start_time, end_time)
+                   for (day_enum, _, _), (start_time, end_time) in wanted.items()]
+        updates = [
+            {'id': row.id, 'day_of_week': day_enum, 'start_time': start_time,
+             'end_time': end_time, 'utc_offset': offset, 'is_available': True}
+            for row, (day_enum, start_time, end_time) in zip(unused, missing)
+        ]
+        inserts = [
+            {'tutor_id': tutor_id, 'day_of_week': day_enum, 'start_time': start_time,
+             'end_time': end_time, 'utc_offset': offset, 'is_available': True}
+            for day_enum, start_time, end_time in missing[len(updates):]
+        ]
+        deletes = [row.id for row in unused[len(updates):]]
+        
+        if updates:
+            db.session.execute(update(cls), updates)
+        if inserts:
+            db.session.execute(insert(cls), inserts)
+        if deletes:
+            db.session.execute(delete(cls).where(cls.id.in_(deletes)),
+                               execution_options={'synchronize_session': False})
+        # Drop the stale in-session copies of changed and deleted rows
+        for row in unused[:len(updates)]:
+            db.session.expire(row)
+        for row in unused[len(updates):]:
+            db.session.expunge(row)
+        
+        cls.refresh_derived(tutor_id, tutor_timezone)
+        db.session.flush()
+    
+    @classmethod
+    def refresh_derived(cls, tutor_id, tutor_timezone):
+        """
+        Rebuild the weekly bitmap and upcoming occurrences from a tutor's
+        slots, e.g. after the slots or the tutor's timezone changed.
         
-        db.session.commit()
+        Args:
+            tutor_id (int): The tutor's ID
+            tutor_timezone (str): Tutor's timezone
+        """
+        TutorAvailabilityBitmap.rebuild_for_tutor(tutor_id, tutor_timezone)
+        TutorAvailabilityOccurrence.regenerate_for_tutor(tutor_id, tutor_timezone)
+    
+    def utc_week_minutes(self, tutor_timezone):
+        """
+        Get this slot as a span of minutes since Monday 00:00 UTC.
+        
+        The slot's day of week is in the tutor's timezone, so the span is
+        derived from the local times and shifted by today's UTC offset;
+        bitmaps are rebuilt daily so they follow DST changes. The end may
+        exceed the week length when the span wraps around.
+        
+        Args:
+            tutor_timezone (str): Tutor's timezone
+            
+        Returns:
+            tuple: (start_minute, end_minute)
+        """
+        local_start, local_end = self.get_local_times(tutor_timezone)
+        offset_minutes = utc_offset_minutes(tutor_timezone, date.today())
+        
+        start_minute = (self.day_of_week.value * MINUTES_PER_DAY
+                        + local_start.hour * 60 + local_start.minute
+                        - offset_minutes) % MINUTES_PER_WEEK
+        duration = ((local_end.hour * 60 + local_end.minute)
+                    - (local_start.hour * 60 + local_start.minute)) % MINUTES_PER_DAY
+        return start_minute, start_minute + duration
     
     def to_dict(self, tutor_timezone=None):
         """Convert availability slot to dictionary."""
@@ -187,4 +308,300 @@ class TutorAvailability(db.Model):
         return result
     
     def __repr__(self):
-        return f'<TutorAvailability {self.day_of_week.name} {self.start_time}-{self.end_time}>'
\ No newline at end of file
+        return f'<TutorAvailability {self.day_of_week.name} {self.start_time}-{self.end_time}>'
+
+
+class TutorAvailabilityBitmap(db.Model):
+    """Compact weekly availability bitmap per tutor for fast time-window filtering."""
+    __tablename__ = 'tutor_availability_bitmaps'
+    
+    tutor_id = db.Column(db.Integer, db.ForeignKey('tutors.id', ondelete='CASCADE'), primary_key=True)
+    bitmap = db.Column(db.LargeBinary(BITMAP_BYTES), nullable=False)  # One bit per 15-minute UTC bucket
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @property
+    def mask(self):
+        """The bitmap as an integer bitmask."""
+        return int.from_bytes(self.bitmap, 'little')
+    
+    @classmethod
+    def rebuild_for_tutor(cls, tutor_id, tutor_timezone):
+        """
+        Recompute a tutor's bitmap from their availability slots.
+        
+        The slots are merged before bucketing, so adjacent slots that split
+        a 15-minute bucket between them still mark it available.
+        
+        Args:
+            tutor_id (int): The tutor's ID
+            tutor_timezone (str): Tutor's timezone
+            
+        Returns:
+            TutorAvailabilityBitmap: The updated bitmap record
+        """
+        spans = []
+        for slot in TutorAvailability.query.filter_by(tutor_id=tutor_id, is_available=True).all():
+            start_minute, end_minute = slot.utc_week_minutes(tutor_timezone)
+            # Split spans that wrap around to Monday so they merge with their neighbours
+            spans.append((start_minute, min(end_minute, MINUTES_PER_WEEK)))
+            if end_minute > MINUTES_PER_WEEK:
+                spans.append((0, end_minute - MINUTES_PER_WEEK))
+        
+        mask = 0
+        for start_minute, end_minute in merge_intervals(spans):
+            mask |= week_bucket_mask(start_minute, end_minute)
+        
+        record = cls.query.get(tutor_id)
+        if record is None:
+            record = cls(tutor_id=tutor_id)
+            db.session.add(record)
+        record.bitmap = mask.to_bytes(BITMAP_BYTES, 'little')
+        return record
+    
+    def __repr__(self):
+        return f'<TutorAvailabilityBitmap tutor={self.tutor_id}>'
+
+
+def expand_weekly_slots(slots, tutor_timezone, start_date, end_date):
+    """
+    Expand weekly availability slots into concrete UTC intervals.
+    
+    Each slot's wall-clock times are placed on every matching local date
+    and converted with that date's UTC offset, so occurrences stay at the same wall-clock time
+    across DST transitions. Slots whose local end is at or before their
+    start run past midnight into the next day.
+    
+    Args:
+        slots (list): TutorAvailability rows
+        tutor_timezone (str): Tutor's timezone
+        start_date (date): First local date to expand
+        end_date (date): Local date to stop before
+        
+    Returns:
+        list: (start_utc, end_utc) pairs of naive UTC datetimes, merged
+            within each local date and in start order
+    """
+    rules = {weekday: [] for weekday in range(7)}
+    for slot in slots:
+        local_start, local_end = slot.get_local_times(tutor_timezone)
+        start = local_start.hour * 60 + local_start.minute
+        end = local_end.hour * 60 + local_end.minute
+        if end <= start:
+            end += MINUTES_PER_DAY
+        rules[slot.day_of_week.value].append((start, end))
+    
+    intervals = []
+    current_date = start_date
+    while current_date < end_date:
+        for start, end in merge_intervals(rules[current_date.weekday()]):
+            intervals.append((
+                local_datetime_to_utc(current_date, start, tutor_timezone).replace(tzinfo=None),
+                local_datetime_to_utc(current_date, end, tutor_timezone).replace(tzinfo=None)
+            ))
+        current_date += timedelta(days=1)
+    return intervals
+
+
+class TutorAvailabilityOccurrence(db.Model):
+    """Weekly availability expanded into concrete UTC intervals for the coming weeks."""
+    __tablename__ = 'tutor_availability_occurrences'
+    __table_args__ = (
+        # Support per-tutor range lookups by start instant
+        db.Index('ix_availability_occurrences_tutor_start', 'tutor_id', 'start_utc'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    tutor_id = db.Column(db.Integer, db.ForeignKey('tutors.id', ondelete='CASCADE'), nullable=False)
+    start_utc = db.Column(db.DateTime, nullable=False)
+    end_utc = db.Column(db.DateTime, nullable=False)
+    
+    @classmethod
+    def regenerate_for_tutor(cls, tutor_id, tutor_timezone, start_date=None, weeks=None):
+        """
+        Replace a tutor's occurrences from a date onwards with a fresh
+        expansion of their weekly slots.
+        
+        Args:
+            tutor_id (int): The tutor's ID
+            tutor_timezone (str): Tutor's timezone
+            start_date (date, optional): First local date; defaults to today
+            weeks (int, optional): Weeks to expand; defaults to
+                AVAILABILITY_OCCURRENCE_WEEKS
+            
+        Returns:
+            int: Number of occurrences written
+        """
+        start_date = start_date or date.today()
+        if weeks is None:
+            weeks = current_app.config.get('AVAILABILITY_OCCURRENCE_WEEKS', 10) if has_app_context() else 10
+        
+        slots = TutorAvailability.query.filter_by(tutor_id=tutor_id, is_available=True).all()
+        intervals = expand_weekly_slots(slots, tutor_timezone, start_date, start_date + timedelta(weeks=weeks))
+        
+        window_start = local_datetime_to_utc(start_date, 0, tutor_timezone).replace(tzinfo=None)
+        db.session.execute(
+            delete(cls).where(cls.tutor_id == tutor_id, cls.start_utc >= window_start),
+            execution_options={'synchronize_session': False}
+        )
+        if intervals:
+            db.session.execute(insert(cls), [
+                {'tutor_id': tutor_id, 'start_utc': start, 'end_utc': end} for start, end in intervals
+            ])
+        return len(intervals)
+    
+    @classmethod
+    def get_range(cls, tutor_id, start_utc, end_utc):
+        """
+        Get a tutor's occurrences overlapping a UTC range.
+        
+        Args:
+            tutor_id (int): The tutor's ID
+            start_utc (datetime): Range start (naive UTC)
+            end_utc (datetime): Range end (naive UTC)
+            
+        Returns:
+            list: (start_utc, end_utc) pairs in start order
+        """
+        # Occurrences start on one local date and last at most a day, which bounds the index scan
+        rows = db.session.query(cls.start_utc, cls.end_utc).filter(
+            cls.tutor_id == tutor_id,
+            cls.start_utc > start_utc - timedelta(days=2),
+            cls.start_utc < end_utc,
+            cls.end_utc > start_utc
+        ).order_by(cls.start_utc).all()
+        return [(start, end) for start, end in rows]
+    
+    @classmethod
+    def last_start(cls, tutor_id):
+        """
+        Get the start of a tutor's last materialized occurrence.
+        
+        Args:
+            tutor_id (int): The tutor's ID
+            
+        Returns:
+            datetime: Naive UTC start, or None if the tutor has no occurrences
+        """
+        return db.session.query(db.func.max(cls.start_utc)).filter(cls.tutor_id == tutor_id).scalar()
+    
+    @classmethod
+    def prune_before(cls, cutoff):
+        """
+        Delete occurrences that ended before a UTC instant.
+        
+        Args:
+            cutoff (datetime): Naive UTC datetime
+            
+        Returns:
+            int: Number of rows deleted
+        """
+        return db.session.execute(
+            delete(cls).where(cls.end_utc < cutoff),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+    
+    def __repr__(self):
+        return f'<TutorAvailabilityOccurrence tutor={self.tutor_id} {self.start_utc}-{self.end_utc}>'
+
+
+class TutorAvailabilityException(db.Model):
+    """Date-ranged override of a tutor's weekly availability, in the tutor's local time."""
+    __tablename__ = 'tutor_availability_exceptions'
+    __table_args__ = (
+        # Support per-tutor lookups of exceptions overlapping a date range
+        db.Index('ix_availability_exceptions_tutor_end', 'tutor_id', 'end_date'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    tutor_id = db.Column(db.Integer, db.ForeignKey('tutors.id', ondelete='CASCADE'), nullable=False)
+    exception_type = db.Column(db.Enum(AvailabilityExceptionType), nullable=False)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)  # Inclusive
+    start_time = db.Column(db.Time, nullable=True)  # Local time; empty for the whole day
+    end_time = db.Column(db.Time, nullable=True)    # Local time; empty for the whole day
+    note = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @classmethod
+    def create_exception(cls, tutor_id, exception_type, start_date, end_date=None,
+                         start_time_str=None, end_time_str=None, note=None):
+        """
+        Create an exception with validation.
+        
+        Args:
+            tutor_id (int): The tutor's ID
+            exception_type (AvailabilityExceptionType): Blocked or extra time
+            start_date (date): First date of the exception
+            end_date (date, optional): Last date (inclusive); defaults to start_date
+            start_time_str (str, optional): Daily start time in 'HH:MM' format
+            end_time_str (str, optional): Daily end time in 'HH:MM' format;
+                without both times the exception covers whole days
+            note (str, optional): Reason shown to the tutor
+            
+        Returns:
+            tuple: (exception, error_message) - exception is None if validation fails
+        """
+        end_date = end_date or start_date
+        if end_date < start_date:
+            return None, "The end date must not be before the start date."
+        
+        start_time = end_time = None
+        if start_time_str or end_time_str:
+            try:
+                start_time, end_time = (datetime.strptime(value, '%H:%M').time()
+                                        for value in (start_time_str, end_time_str))
+            except (TypeError, ValueError):
+                return None, "Please enter both a start and an end time, or neither."
+            if start_time >= end_time:
+                return None, "End time must be after start time."
+        
+        exception = cls(
+            tutor_id=tutor_id,
+            exception_type=exception_type,
+            start_date=start_date,
+            end_date=end_date,
+            start_time=start_time,
+            end_time=end_time,
+            note=note
+        )
+        db.session.add(exception)
+        db.session.flush()
+        return exception, None
+    
+    @classmethod
+    def get_for_range(cls, tutor_id, start_date, end_date):
+        """Get a tutor's exceptions overlapping a date range."""
+        return cls.query.filter(
+            cls.tutor_id == tutor_id,
+            cls.end_date >= start_date,
+            cls.start_date <= end_date
+        ).all()
+    
+    @classmethod
+    def get_upcoming(cls, tutor_id):
+        """Get a tutor's exceptions that have not ended yet, soonest first."""
+        return cls.query.filter(cls.tutor_id == tutor_id, cls.end_date >= date.today())\
+                        .order_by(cls.start_date, cls.start_time).all()
+    
+    @property
+    def minute_range(self):
+        """The daily time range as minutes since local midnight."""
+        if self.start_time is None:
+            return 0, MINUTES_PER_DAY
+        return (self.start_time.hour * 60 + self.start_time.minute,
+                self.end_time.hour * 60 + self.end_time.minute)
+    
+    def to_dict(self):
+        """Convert exception to dictionary."""
+        return {
+            'id': self.id,
+            'exception_type': self.exception_type.value,
+            'start_date': self.start_date.strftime('%Y-%m-%d'),
+            'end_date': self.end_date.strftime('%Y-%m-%d'),
+            'start_time': self.start_time.strftime('%H:%M') if self.start_time else None,
+            'end_time': self.end_time.strftime('%H:%M') if self.end_time else None,
+            'note': self.note
+        }
+    
+    def __repr__(self):
+        return f'<TutorAvailabilityException {self.exception_type.value} {self.start_date}-{self.end_date}>'
\ No newline at end of file
@@ -2,10 +2,16 @@
 Booking model for TutorConnect application.
 Handles appointment bookings between students and tutors.
 """
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from enum import Enum
 from db import db
-from sqlalchemy import and_
+from flask import current_app
+from sqlalchemy import and_, func, insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import joinedload
+from utils.events import publish_after_commit, user_channel
+from utils.intervals import IntervalIndex
+from utils.timezones import utc_to_local
 
 
 class BookingStatus(Enum):
@@ -16,9 +22,72 @@ class BookingStatus(Enum):
     COMPLETED = 'completed'
 
 
+class TutorBookingDay(db.Model):
+    """
+    Per-tutor, per-date claim row used to serialize booking writes.
+
+    Bookings for the same tutor and date take a row lock on this record
+    before checking for overlaps, so concurrent requests cannot both pass
+    the check. Requests for other tutors or dates are not blocked.
+    """
+    __tablename__ = 'tutor_booking_days'
+
+    tutor_id = db.Column(db.Integer, db.ForeignKey('tutors.id'), primary_key=True)
+    booking_date = db.Column(db.Date, primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)  # Bumped on every claim
+
+    @classmethod
+    def claim(cls, tutor_id, booking_date):
+        """
+        Lock the claim row for a tutor and date until the transaction ends.
+
+        Args:
+            tutor_id (int): Tutor's ID
+            booking_date (date): Date being booked
+        """
+        cls.claim_dates(tutor_id, [booking_date])
+
+    @classmethod
+    def claim_dates(cls, tutor_id, booking_dates):
+        """
+        Lock the claim rows for several dates of one tutor.
+
+        All rows are created or have their version bumped by a single
+        atomic upsert, which takes the row locks on MySQL and the write lock
+        on SQLite. A separate UPDATE and INSERT would let two first-time
+        claims on MySQL both take gap locks and then deadlock on the INSERT.
+        Rows are written in date order, so two requests claiming overlapping
+        sets of dates cannot deadlock either.
+
+        Args:
+            tutor_id (int): Tutor's ID
+            booking_dates (iterable): Dates being booked
+        """
+        rows = [{'tutor_id': tutor_id, 'booking_date': booking_date, 'version': 0}
+                for booking_date in sorted(set(booking_dates))]
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'mysql':
+            upsert = mysql.insert(cls).values(rows).on_duplicate_key_update(version=cls.version + 1)
+        else:
+            # SQLite and PostgreSQL share the ON CONFLICT syntax
+            insert_for_dialect = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            upsert = insert_for_dialect(cls).values(rows).on_conflict_do_update(
+                index_elements=[cls.tutor_id, cls.booking_date],
+                set_={'version': cls.version + 1}
+            )
+        db.session.execute(upsert)
+
+
 class Booking(db.Model):
     """Model to store appointment bookings between students and tutors."""
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # Support per-tutor status counts and per-tutor date range lookups
+        db.Index('ix_bookings_tutor_status', 'tutor_id', 'status'),
+        db.Index('ix_bookings_tutor_date', 'tutor_id', 'booking_date'),
+        db.Index('ix_bookings_series', 'series_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
@@ -29,6 +98,7 @@ class Booking(db.Model):
     status = db.Column(db.Enum(BookingStatus), default=BookingStatus.PENDING, nullable=False)
     subject = db.Column(db.String(100), nullable=True)  # Subject for the session
     notes = db.Column(db.Text, nullable=True)           # Additional notes from student
+    series_id = db.Column(db.Integer, db.ForeignKey('booking_series.id'), nullable=True)  # Recurring series, if any
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -66,7 +136,57 @@ class Booking(db.Model):
         Returns:
             tuple: (booking, error_message) - booking is None if validation fails
         """
-        from datetime import time, date
+        start_time, end_time, error_message = cls.validate_request(booking_date, start_time_str, end_time_str)
+        if error_message:
+            return None, error_message
+
+        if not cls.is_within_availability(tutor_id, booking_date, start_time, end_time):
+            return None, "The tutor is not available at this time."
+
+        try:
+            # Serialize bookings for this tutor and date (no double booking)
+            TutorBookingDay.claim(tutor_id, booking_date)
+
+            if cls.find_conflict(tutor_id, booking_date, start_time, end_time):
+                db.session.rollback()
+                return None, "This time slot is already booked."
+
+            # Create the booking
+            booking = cls(
+                student_id=student_id,
+                tutor_id=tutor_id,
+                booking_date=booking_date,
+                start_time=start_time,
+                end_time=end_time,
+                subject=subject,
+                notes=notes
+            )
+
+            db.session.add(booking)
+            db.session.flush()
+            booking.publish_change('booking.created')
+            return booking, None
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Error creating booking: {str(e)}"
+
+    @staticmethod
+    def validate_request(booking_date, start_time_str, end_time_str, latest_date=None):
+        """
+        Check a requested date against the booking window and parse its times.
+
+        Args:
+            booking_date (date): Date of appointment
+            start_time_str (str): Start time in 'HH:MM' format
+            end_time_str (str): End time in 'HH:MM' format
+            latest_date (date, optional): Latest allowed date, e.g. when
+                rescheduling a series session; defaults to 14 days ahead
+
+        Returns:
+            tuple: (start_time, end_time, error_message) - error_message is
+                None if the request is valid
+        """
+        from datetime import time
 
         # Validate booking date
         today = date.today()
@@ -74,10 +194,13 @@ class Booking(db.Model):
         max_booking_date = today + timedelta(days=14)  # Maximum 14 days in advance
 
         if booking_date < min_booking_date:
-            return None, "Cannot book appointments within 24 hours. Please select a future date."
+            return None, None, "Cannot book appointments within 24 hours. Please select a future date."
 
-        if booking_date > max_booking_date:
-            return None, "Cannot book appointments more than 14 days in advance."
+        if latest_date is not None:
+            if booking_date > latest_date:
+                return None, None, f"Cannot book appointments after {latest_date.strftime('%b %d')}."
+        elif booking_date > max_booking_date:
+            return None, None, "Cannot book appointments more than 14 days in advance."
 
         # Parse time strings
         try:
@@ -86,50 +209,88 @@ class Booking(db.Model):
             start_time = time(start_hour, start_min)
             end_time = time(end_hour, end_min)
         except ValueError:
-            return None, "Invalid time format."
+            return None, None, "Invalid time format."
 
         if start_time >= end_time:
-            return None, "End time must be after start time."
+            return None, None, "End time must be after start time."
 
-        # Check for existing bookings (no double booking)
-        existing_booking = cls.query.filter(
-            and_(
-                cls.tutor_id == tutor_id,
-                cls.booking_date == booking_date,
-                cls.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
-                # Check for time overlap
-                and_(
-                    cls.start_time < end_time,
-                    cls.end_time > start_time
-                )
-            )
-        ).first()
-
-        if existing_booking:
-            return None, "This time slot is already booked."
-
-        # Create the booking
-        booking = cls(
-            student_id=student_id,
-            tutor_id=tutor_id,
-            booking_date=booking_date,
-            start_time=start_time,
-            end_time=end_time,
-            subject=subject,
-            notes=notes
-        )
+        return start_time, end_time, None
 
-        try:
-            db.session.add(booking)
-            db.session.commit()
-            return booking, None
-        except Exception as e:
-            db.session.rollback()
-            return None, f"Error creating booking: {str(e)}"
+    @classmethod
+    def is_within_availability(cls, tutor_id, booking_date, start_time, end_time):
+        """
+        Check a tutor-local time range against the tutor's availability,
+        including date exceptions.
+
+        Args:
+            tutor_id (int): Tutor's ID
+            booking_date (date): Date of appointment
+            start_time (time): Start time in the tutor's timezone
+            end_time (time): End time in the tutor's timezone
+
+        Returns:
+            bool: True if the tutor is available for the whole range
+        """
+        return not cls.unavailable_dates(tutor_id, [booking_date], start_time, end_time)
+
+    @staticmethod
+    def unavailable_dates(tutor_id, booking_dates, start_time, end_time):
+        """
+        Find the dates on which a tutor is not available for a time range.
+
+        Availability for all dates is computed in one pass.
+
+        Args:
+            tutor_id (int): Tutor's ID
+            booking_dates (list): Dates of the appointments
+            start_time (time): Start time in the tutor's timezone
+            end_time (time): End time in the tutor's timezone
+
+        Returns:
+            list: The dates the range does not fit into the tutor's availability
+        """
+        from models.tutor import Tutor
+        from models.slots import get_available_intervals
+
+        tutor = db.session.get(Tutor, tutor_id)
+        if tutor is None:
+            return list(booking_dates)
+        start = start_time.hour * 60 + start_time.minute
+        end = end_time.hour * 60 + end_time.minute
+        available = get_available_intervals(tutor, min(booking_dates), max(booking_dates))
+        return [
+            booking_date for booking_date in booking_dates
+            if not any(free_start <= start and end <= free_end
+                       for free_start, free_end in available.get(booking_date, []))
+        ]
 
     @classmethod
-    def get_tutor_bookings_for_date_range(cls, tutor_id, start_date, end_date):
-        """Get all bookings for a tutor within a date range."""
+    def find_conflict(cls, tutor_id, booking_date, start_time, end_time, exclude_id=None):
+        """
+        Find an active booking overlapping a time range.
+
+        Uses a locking read so that, after TutorBookingDay.claim, it sees
+        bookings committed by other transactions. To check several ranges,
+        load a BookingConflictChecker once instead.
+
+        Args:
+            tutor_id (int): Tutor's ID
+            booking_date (date): Date of appointment
+            start_time (time): Start time
+            end_time (time): End time
+            exclude_id (int, optional): Booking to ignore (e.g. when rescheduling)
+
+        Returns:
+            Booking or None: The first conflicting booking
+        """
+        checker = BookingConflictChecker(tutor_id, booking_date, booking_date,
+                                         exclude_ids=[exclude_id] if exclude_id is not None else (),
+                                         for_update=True)
+        return checker.find_conflict(booking_date, start_time, end_time)
+
+    @classmethod
+    def active_in_range(cls, tutor_id, start_date, end_date):
+        """Query a tutor's pending and confirmed bookings within a date range."""
         return cls.query.filter(
             and_(
                 cls.tutor_id == tutor_id,
@@ -137,18 +298,64 @@ class Booking(db.Model):
                 cls.booking_date <= end_date,
                 cls.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED])
             )
-        ).all()
+        )
+
+    @classmethod
+    def get_tutor_bookings_for_date_range(cls, tutor_id, start_date, end_date):
+        """Get all bookings for a tutor within a date range."""
+        return cls.active_in_range(tutor_id, start_date, end_date).all()
+
+    @classmethod
+    def get_status_counts(cls, tutor_id, start_date=None, end_date=None):
+        """
+        Count a tutor's bookings per status with a single GROUP BY query.
+
+        Args:
+            tutor_id (int): Tutor's ID
+            start_date (date, optional): Only count bookings on or after this date
+            end_date (date, optional): Only count bookings on or before this date
+
+        Returns:
+            dict: Count for every BookingStatus (zero if the tutor has none)
+        """
+        query = db.session.query(cls.status, func.count(cls.id))\
+                          .filter(cls.tutor_id == tutor_id)
+        if start_date is not None:
+            query = query.filter(cls.booking_date >= start_date)
+        if end_date is not None:
+            query = query.filter(cls.booking_date <= end_date)
+
+        counts = {status: 0 for status in BookingStatus}
+        counts.update(query.group_by(cls.status).all())
+        return counts
 
     @classmethod
     def get_student_bookings(cls, student_id):
         """Get all bookings for a student."""
         return cls.query.filter_by(student_id=student_id)\
+                        .options(joinedload(cls.tutor))\
                         .order_by(cls.booking_date.desc(), cls.start_time.desc())\
                         .all()
 
+    def latest_reschedule_date(self):
+        """
+        Get the latest date this booking can be moved to.
+
+        Series sessions may move anywhere up to the end of the series' last
+        week, even beyond the usual 14-day booking window.
+
+        Returns:
+            date: The latest allowed date
+        """
+        latest = date.today() + timedelta(days=14)
+        if self.series is not None:
+            latest = max(latest, self.series.dates[-1] + timedelta(days=6))
+        return latest
+
     def get_local_times(self, timezone_str):
         """
-        Convert GMT times to local timezone.
+        Convert GMT times to local timezone, using the offset in effect on
+        the booking date.
 
         Args:
             timezone_str (str): Timezone string
@@ -156,36 +363,39 @@ class Booking(db.Model):
         Returns:
             tuple: (local_start_time, local_end_time)
         """
-        import pytz
-        from datetime import datetime, time
+        return utc_to_local([(self.start_time, self.end_time)], timezone_str, self.booking_date)[0]
 
-        tz = pytz.timezone(timezone_str)
-
-        # Create datetime objects in GMT
-        dummy_date = datetime.now().replace(hour=self.start_time.hour,
-                                          minute=self.start_time.minute)
-        gmt_start = pytz.UTC.localize(dummy_date)
-        local_start = gmt_start.astimezone(tz)
-
-        dummy_date_end = datetime.now().replace(hour=self.end_time.hour,
-                                              minute=self.end_time.minute)
-        gmt_end = pytz.UTC.localize(dummy_date_end)
-        local_end = gmt_end.astimezone(tz)
+    def publish_change(self, event_type):
+        """
+        Notify the student's and tutor's live update streams about this
+        booking once the current transaction commits.
 
-        return (time(local_start.hour, local_start.minute),
-                time(local_end.hour, local_end.minute))
+        Args:
+            event_type (str): 'booking.created' or 'booking.updated'
+        """
+        data = {
+            'booking_id': self.id,
+            'booking_date': self.booking_date.strftime('%Y-%m-%d'),
+            'start_time': self.start_time.strftime('%H:%M'),
+            'end_time': self.end_time.strftime('%H:%M'),
+            'status': self.status.value if self.status else BookingStatus.PENDING.value
+        }
+        publish_after_commit(user_channel('tutor', self.tutor_id), event_type, data)
+        publish_after_commit(user_channel('student', self.student_id), event_type, data)
 
     def cancel(self):
         """Cancel this booking."""
         self.status = BookingStatus.CANCELLED
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        self.publish_change('booking.updated')
+        db.session.flush()
 
     def confirm(self):
         """Confirm this booking."""
         self.status = BookingStatus.CONFIRMED
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        self.publish_change('booking.updated')
+        db.session.flush()
 
     def to_dict(self, include_timezone=None):
         """Convert booking to dictionary."""
@@ -211,4 +421,198 @@ class Booking(db.Model):
         return result
 
     def __repr__(self):
-        return f'<Booking {self.id} - {self.booking_date} {self.start_time}-{self.end_time}>'
\ No newline at end of file
+        return f'<Booking {self.id} - {self.booking_date} {self.start_time}-{self.end_time}>'
+
+
+class BookingConflictChecker:
+    """
+    A tutor's active bookings over a date range, loaded with one query and
+    indexed for checking many proposed times at once.
+
+    Hold the TutorBookingDay claims for the dates (and load with
+    for_update=True) when the result decides whether to write bookings.
+    """
+
+    def __init__(self, tutor_id, start_date, end_date, exclude_ids=(), for_update=False):
+        """
+        Load the bookings.
+
+        Args:
+            tutor_id (int): Tutor's ID
+            start_date (date): First date of the range
+            end_date (date): Last date of the range (inclusive)
+            exclude_ids (iterable, optional): Bookings to ignore (e.g. the
+                ones being rescheduled)
+            for_update (bool): Lock the loaded rows until the transaction ends
+        """
+        query = Booking.active_in_range(tutor_id, start_date, end_date)
+        if for_update:
+            query = query.with_for_update()
+        excluded = set(exclude_ids)
+        self.index = IntervalIndex(
+            (datetime.combine(booking.booking_date, booking.start_time),
+             datetime.combine(booking.booking_date, booking.end_time),
+             booking)
+            for booking in query.all() if booking.id not in excluded
+        )
+
+    def find_conflict(self, booking_date, start_time, end_time):
+        """
+        Find a loaded booking overlapping a time range.
+
+        Returns:
+            Booking or None: A conflicting booking
+        """
+        return self.index.find_overlap(datetime.combine(booking_date, start_time),
+                                       datetime.combine(booking_date, end_time))
+
+    def find_conflicts(self, candidates):
+        """
+        Check many proposed time ranges against the loaded bookings and
+        each other.
+
+        Args:
+            candidates (list): (booking_date, start_time, end_time) tuples
+
+        Returns:
+            list: For each candidate, the Booking or earlier candidate tuple
+                it overlaps, or None if it is free
+        """
+        return self.index.find_conflicts(
+            (datetime.combine(booking_date, start_time), datetime.combine(booking_date, end_time),
+             (booking_date, start_time, end_time))
+            for booking_date, start_time, end_time in candidates
+        )
+
+
+class BookingSeries(db.Model):
+    """
+    A weekly recurring booking: the same time slot for a number of
+    consecutive weeks. Each session is stored as a regular Booking row
+    linked back to the series.
+    """
+    __tablename__ = 'booking_series'
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
+    tutor_id = db.Column(db.Integer, db.ForeignKey('tutors.id'), nullable=False)
+    first_date = db.Column(db.Date, nullable=False)   # Date of the first session
+    weeks = db.Column(db.Integer, nullable=False)      # Number of weekly sessions
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
+    subject = db.Column(db.String(100), nullable=True)
+    notes = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    bookings = db.relationship('Booking', backref='series', lazy=True, order_by='Booking.booking_date')
+
+    @property
+    def dates(self):
+        """Dates of all sessions in the series."""
+        return [self.first_date + timedelta(weeks=week) for week in range(self.weeks)]
+
+    @classmethod
+    def create_series(cls, student_id, tutor_id, first_date, start_time_str, end_time_str,
+                      weeks, subject=None, notes=None):
+        """
+        Create a weekly booking series with validation.
+
+        Every session is checked against the tutor's availability and
+        existing bookings in one pass, and either all sessions are booked or
+        none are.
+
+        Args:
+            student_id (int): Student's ID
+            tutor_id (int): Tutor's ID
+            first_date (date): Date of the first session
+            start_time_str (str): Start time in 'HH:MM' format
+            end_time_str (str): End time in 'HH:MM' format
+            weeks (int): Number of weekly sessions
+            subject (str): Subject for the sessions
+            notes (str): Additional notes
+
+        Returns:
+            tuple: (series, error_message) - series is None if validation fails
+        """
+        start_time, end_time, error_message = Booking.validate_request(first_date, start_time_str, end_time_str)
+        if error_message:
+            return None, error_message
+
+        max_weeks = current_app.config.get('BOOKING_SERIES_MAX_WEEKS', 8)
+        if weeks < 2 or weeks > max_weeks:
+            return None, f"A weekly booking must have between 2 and {max_weeks} sessions."
+
+        dates = [first_date + timedelta(weeks=week) for week in range(weeks)]
+
+        unavailable = Booking.unavailable_dates(tutor_id, dates, start_time, end_time)
+        if unavailable:
+            return None, f"The tutor is not available at this time on {cls._format_dates(unavailable)}."
+
+        try:
+            # Serialize bookings for this tutor and these dates (no double booking)
+            TutorBookingDay.claim_dates(tutor_id, dates)
+
+            checker = BookingConflictChecker(tutor_id, dates[0], dates[-1], for_update=True)
+            conflicts = checker.find_conflicts([(booking_date, start_time, end_time) for booking_date in dates])
+            booked = [booking_date for booking_date, conflict in zip(dates, conflicts) if conflict is not None]
+            if booked:
+                db.session.rollback()
+                return None, f"This time slot is already booked on {cls._format_dates(booked)}."
+
+            series = cls(
+                student_id=student_id,
+                tutor_id=tutor_id,
+                first_date=first_date,
+                weeks=weeks,
+                start_time=start_time,
+                end_time=end_time,
+                subject=subject,
+                notes=notes
+            )
+            db.session.add(series)
+            db.session.flush()
+
+            # Insert all sessions with one statement
+            db.session.execute(insert(Booking), [
+                {
+                    'student_id': student_id,
+                    'tutor_id': tutor_id,
+                    'booking_date': booking_date,
+                    'start_time': start_time,
+                    'end_time': end_time,
+                    'subject': subject,
+                    'notes': notes,
+                    'series_id': series.id
+                }
+                for booking_date in dates
+            ])
+
+            for booking in Booking.query.filter_by(series_id=series.id).order_by(Booking.booking_date):
+                booking.publish_change('booking.created')
+            return series, None
+        except Exception as e:
+            db.session.rollback()
+            return None, f"Error creating booking: {str(e)}"
+
+    @staticmethod
+    def _format_dates(dates):
+        return ', '.join(booking_date.strftime('%b %d') for booking_date in dates)
+
+    def to_dict(self):
+        """Convert booking series to dictionary."""
+        return {
+            'id': self.id,
+            'student_id': self.student_id,
+            'tutor_id': self.tutor_id,
+            'first_date': self.first_date.strftime('%Y-%m-%d'),
+            'weeks': self.weeks,
+            'start_time': self.start_time.strftime('%H:%M'),
+            'end_time': self.end_time.strftime('%H:%M'),
+            'subject': self.subject,
+            'notes': self.notes,
+            'booking_ids': [booking.id for booking in self.bookings]
+        }
+
+    def __repr__(self):
+        return f'<BookingSeries {self.id} - {self.first_date} x{self.weeks}>'
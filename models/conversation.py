@@ -0,0 +1,116 @@
+"""
+Conversation model for TutorConnect application.
+Keeps one summary row per student/tutor pair so inboxes and unread badges
+do not have to group over the full message history.
+"""
+import datetime
+from sqlalchemy.exc import IntegrityError
+from db import db
+
+
+class Conversation(db.Model):
+    """Summary of the messages exchanged between one student and one tutor."""
+    __tablename__ = 'conversations'
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'tutor_id', name='uq_conversations_student_tutor'),
+        # Support keyset pagination of each side's conversation list
+        db.Index('ix_conversations_tutor_last_message', 'tutor_id', 'last_message_at', 'id'),
+        db.Index('ix_conversations_student_last_message', 'student_id', 'last_message_at', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id', ondelete='CASCADE'), nullable=False)
+    tutor_id = db.Column(db.Integer, db.ForeignKey('tutors.id', ondelete='CASCADE'), nullable=False)
+
+    # Pointer to the most recent message and running counters
+    last_message_id = db.Column(db.Integer, db.ForeignKey('messages.id', ondelete='SET NULL'), nullable=True)
+    last_message_at = db.Column(db.DateTime, nullable=True)
+    message_count = db.Column(db.Integer, default=0, nullable=False)
+    tutor_unread_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    # Relationships
+    student = db.relationship('Student', backref=db.backref('conversations', lazy='dynamic'))
+    tutor = db.relationship('Tutor', backref=db.backref('conversations', lazy='dynamic'))
+    last_message = db.relationship('Message', foreign_keys=[last_message_id])
+
+    @classmethod
+    def _ensure(cls, student_id, tutor_id):
+        """Create the conversation row for a pair if it does not exist yet."""
+        exists = db.session.query(cls.id).filter_by(student_id=student_id, tutor_id=tutor_id).first()
+        if exists:
+            return
+        try:
+            with db.session.begin_nested():
+                db.session.execute(cls.__table__.insert().values(
+                    student_id=student_id, tutor_id=tutor_id, message_count=0, tutor_unread_count=0,
+                    created_at=datetime.datetime.utcnow()
+                ))
+        except IntegrityError:
+            # Created concurrently by another request
+            pass
+
+    @classmethod
+    def record_message(cls, message):
+        """
+        Update the conversation for a newly flushed message.
+
+        Counters are incremented in SQL so concurrent messages in the same
+        conversation do not overwrite each other. The caller commits.
+
+        Args:
+            message (Message): The new message (must have an ID)
+        """
+        cls._ensure(message.sender_id, message.receiver_id)
+
+        # Messages are sent by students, so they are unread on the tutor's side
+        db.session.execute(
+            cls.__table__.update()
+                .where(cls.student_id == message.sender_id, cls.tutor_id == message.receiver_id)
+                .values(last_message_id=message.id,
+                        last_message_at=message.created_at,
+                        message_count=cls.message_count + 1,
+                        tutor_unread_count=cls.tutor_unread_count + 1,
+                        updated_at=datetime.datetime.utcnow())
+        )
+
+    @classmethod
+    def record_read(cls, message):
+        """
+        Update the conversation after a message has been marked as read.
+        The caller commits.
+
+        Args:
+            message (Message): The message that was read
+        """
+        db.session.execute(
+            cls.__table__.update()
+                .where(cls.student_id == message.sender_id,
+                       cls.tutor_id == message.receiver_id,
+                       cls.tutor_unread_count > 0)
+                .values(tutor_unread_count=cls.tutor_unread_count - 1,
+                        updated_at=datetime.datetime.utcnow())
+        )
+
+    @classmethod
+    def get_for_pair(cls, student_id, tutor_id):
+        """Get the conversation between a student and a tutor, if any."""
+        return cls.query.filter_by(student_id=student_id, tutor_id=tutor_id).first()
+
+    def to_dict(self):
+        """Convert the conversation object to a dictionary."""
+        return {
+            'id': self.id,
+            'student_id': self.student_id,
+            'tutor_id': self.tutor_id,
+            'last_message_id': self.last_message_id,
+            'last_message_at': self.last_message_at.isoformat() if self.last_message_at else None,
+            'message_count': self.message_count,
+            'tutor_unread_count': self.tutor_unread_count
+        }
+
+    def __repr__(self):
+        return f'<Conversation student={self.student_id} tutor={self.tutor_id}>'
@@ -3,11 +3,19 @@ Message model for TutorConnect application.
 Handles messaging between students and tutors.
 """
 import datetime
+from sqlalchemy import func
+from sqlalchemy.orm.attributes import set_committed_value
 from db import db
+from models.conversation import Conversation
+from utils.events import publish_after_commit, user_channel
 
 class Message(db.Model):
     """Message model for communication between students and tutors."""
     __tablename__ = 'messages'
+    __table_args__ = (
+        # Supports keyset pagination of a tutor's inbox
+        db.Index('ix_messages_receiver_created_id', 'receiver_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -30,6 +38,12 @@ class Message(db.Model):
     sender = db.relationship('Student', backref='sent_messages', foreign_keys=[sender_id])
     receiver = db.relationship('Tutor', backref='received_messages', foreign_keys=[receiver_id])
     
+    # Optional SQL-computed excerpt of the message body, populated by inbox queries
+    preview = db.query_expression()
+    
+    # Characters of the message body shown in inbox previews
+    PREVIEW_LENGTH = 100
+    
     @classmethod
     def create(cls, sender_id, receiver_id, subject, message):
         """
@@ -52,15 +66,57 @@ class Message(db.Model):
         )
         
         db.session.add(new_message)
-        db.session.commit()
+        db.session.flush()
+        
+        # Keep the conversation summary in the same transaction
+        Conversation.record_message(new_message)
+        
+        # Notify the tutor's live update stream once the message is committed
+        publish_after_commit(user_channel('tutor', receiver_id), 'message.created', {
+            'message_id': new_message.id,
+            'sender_id': sender_id,
+            'sender_name': new_message.sender.fullname if new_message.sender else None,
+            'subject': subject
+        })
         
         return new_message
     
+    @classmethod
+    def get_inbox_stats(cls, receiver_id):
+        """
+        Get message totals for a tutor's inbox with a single aggregate query
+        over their conversation summaries.
+        
+        Args:
+            receiver_id (int): ID of the tutor
+            
+        Returns:
+            dict: 'total', 'unread' and 'senders' (distinct students) counts
+        """
+        total, unread, senders = db.session.query(
+            func.coalesce(func.sum(Conversation.message_count), 0),
+            func.coalesce(func.sum(Conversation.tutor_unread_count), 0),
+            func.count(Conversation.id)
+        ).filter(Conversation.tutor_id == receiver_id).one()
+        
+        return {'total': int(total), 'unread': int(unread), 'senders': senders}
+    
     def mark_as_read(self):
         """Mark the message as read and set read timestamp."""
-        self.is_read = True
-        self.read_at = datetime.datetime.utcnow()
-        db.session.commit()
+        read_at = datetime.datetime.utcnow()
+        
+        # Only the request that flips the flag updates the conversation's unread count
+        marked = db.session.execute(
+            Message.__table__.update()
+                .where(Message.id == self.id, Message.is_read == False)
+                .values(is_read=True, read_at=read_at)
+        ).rowcount
+        if marked:
+            Conversation.record_read(self)
+        
+        set_committed_value(self, 'is_read', True)
+        if marked:
+            set_committed_value(self, 'read_at', read_at)
     
     def to_dict(self):
         """Convert the message object to a dictionary."""
@@ -0,0 +1,67 @@
+"""
+OAuth identity model for TutorConnect application.
+Links a sign-in provider's stable subject identifier to a user account, so
+returning OAuth users are matched on the provider's own ID instead of on an
+email address the provider may not have verified.
+"""
+import datetime
+from sqlalchemy.exc import IntegrityError
+from db import db
+from models.user import UserRole
+from models.user_directory import MODEL_BY_ROLE
+
+
+class OAuthIdentity(db.Model):
+    """One row per (provider, subject) linked to an account."""
+    __tablename__ = 'oauth_identities'
+    __table_args__ = (
+        db.UniqueConstraint('provider', 'subject', name='uq_oauth_identities_provider_subject'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    provider = db.Column(db.String(20), nullable=False)   # 'google' or 'microsoft'
+    subject = db.Column(db.String(255), nullable=False)   # Provider's stable user ID
+    role = db.Column(db.Enum(UserRole), nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, nullable=False)
+
+    @classmethod
+    def find_user(cls, provider, subject, roles=None):
+        """
+        Get the account linked to a provider identity.
+
+        Args:
+            provider (str): Provider name
+            subject (str): The provider's user ID
+            roles (list, optional): UserRole values to accept
+
+        Returns:
+            Student, Tutor, Admin or None: The linked user
+        """
+        identity = cls.query.filter_by(provider=provider, subject=subject).first()
+        if identity is None or (roles is not None and identity.role not in roles):
+            return None
+        return db.session.get(MODEL_BY_ROLE[identity.role], identity.user_id)
+
+    @classmethod
+    def link(cls, provider, subject, user):
+        """
+        Link a provider identity to an account. The caller commits.
+
+        Args:
+            provider (str): Provider name
+            subject (str): The provider's user ID
+            user (User): The account to link
+        """
+        try:
+            with db.session.begin_nested():
+                db.session.execute(cls.__table__.insert().values(
+                    provider=provider, subject=subject, role=user.role, user_id=user.id,
+                    created_at=datetime.datetime.utcnow()
+                ))
+        except IntegrityError:
+            # Linked concurrently by another request
+            pass
+
+    def __repr__(self):
+        return f'<OAuthIdentity {self.provider}:{self.subject} {self.role.value}:{self.user_id}>'
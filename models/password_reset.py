@@ -45,7 +45,7 @@ class PasswordReset(db.Model):
         cls.query.filter_by(email=email.lower(), used=False).delete()
         
         db.session.add(reset)
-        db.session.commit()
+        db.session.flush()
         
         return reset, plain_token
     
@@ -79,7 +79,7 @@ class PasswordReset(db.Model):
     def mark_as_used(self):
         """Mark this reset token as used."""
         self.used = True
-        db.session.commit()
+        db.session.flush()
     
     @classmethod
     def cleanup_expired_tokens(cls):
@@ -91,7 +91,7 @@ class PasswordReset(db.Model):
         for token in expired_tokens:
             db.session.delete(token)
         
-        db.session.commit()
+        db.session.flush()
         return len(expired_tokens)
     
     def __repr__(self):
@@ -0,0 +1,214 @@
+"""
+Free-slot engine for TutorConnect application.
+Combines tutor availability rules and date exceptions with existing
+bookings to produce the bookable free intervals for each date.
+"""
+from datetime import date, datetime, time, timedelta
+from flask import current_app
+from models.availability import (TutorAvailability, TutorAvailabilityOccurrence, TutorAvailabilityException,
+                                 AvailabilityExceptionType, MINUTES_PER_DAY, expand_weekly_slots)
+from models.booking import Booking
+from utils.intervals import merge_intervals, subtract_intervals
+from utils.timezones import local_datetime_to_utc, utc_datetime_to_local
+
+
+def _minutes(value):
+    """Convert a time to minutes since midnight."""
+    return value.hour * 60 + value.minute
+
+
+class Slot:
+    """A half-open interval on a single date in the tutor's local time."""
+
+    def __init__(self, slot_date, start_minute, end_minute, timezone_str):
+        self.date = slot_date
+        self.start_minute = start_minute
+        self.end_minute = end_minute
+        self.timezone = timezone_str
+
+    @property
+    def start_time(self):
+        return time(self.start_minute // 60, self.start_minute % 60)
+
+    @property
+    def end_time(self):
+        # The booking form works with same-day times, so midnight is shown as 23:59
+        if self.end_minute >= MINUTES_PER_DAY:
+            return time(23, 59)
+        return time(self.end_minute // 60, self.end_minute % 60)
+
+    def _to_utc(self, minute):
+        return local_datetime_to_utc(self.date, minute, self.timezone)
+
+    @property
+    def start_utc(self):
+        return self._to_utc(self.start_minute)
+
+    @property
+    def end_utc(self):
+        return self._to_utc(self.end_minute)
+
+    def to_dict(self):
+        """Convert slot to dictionary."""
+        return {
+            'date': self.date.strftime('%Y-%m-%d'),
+            'start_time': self.start_time.strftime('%H:%M'),
+            'end_time': self.end_time.strftime('%H:%M'),
+            'start_utc': self.start_utc.isoformat(),
+            'end_utc': self.end_utc.isoformat(),
+            'duration_minutes': self.end_minute - self.start_minute
+        }
+
+    def __repr__(self):
+        return f'<Slot {self.date} {self.start_time}-{self.end_time}>'
+
+
+class DaySchedule:
+    """Free and booked intervals for one date of a tutor's calendar."""
+
+    def __init__(self, schedule_date, free, booked):
+        self.date = schedule_date
+        self.free = free
+        self.booked = booked
+
+    def to_dict(self):
+        """Convert day schedule to dictionary."""
+        return {
+            'date': self.date.strftime('%Y-%m-%d'),
+            'day_name': self.date.strftime('%A').lower(),
+            'free': [slot.to_dict() for slot in self.free],
+            'booked': [slot.to_dict() for slot in self.booked]
+        }
+
+
+def _occurrences(tutor_id, timezone_str, start_date, end_date):
+    """
+    Get a tutor's availability occurrences overlapping a local date range.
+
+    Dates up to the last materialized occurrence are read from the
+    occurrence table. Later dates, or all dates for a tutor who has no
+    occurrences yet, are expanded from the weekly slots on the fly, so
+    bookings do not depend on the refresh job having run.
+    """
+    range_start = local_datetime_to_utc(start_date, 0, timezone_str).replace(tzinfo=None)
+    range_end = local_datetime_to_utc(end_date + timedelta(days=1), 0, timezone_str).replace(tzinfo=None)
+    occurrences = TutorAvailabilityOccurrence.get_range(tutor_id, range_start, range_end)
+
+    last_start = TutorAvailabilityOccurrence.last_start(tutor_id)
+    # Start a day early so slots running past midnight into the range are included
+    expand_from = start_date - timedelta(days=1)
+    if last_start is not None:
+        expand_from = max(expand_from, utc_datetime_to_local(last_start, timezone_str).date() + timedelta(days=1))
+    if expand_from > end_date:
+        return occurrences
+
+    slots = TutorAvailability.query.filter_by(tutor_id=tutor_id, is_available=True).all()
+    weeks = current_app.config.get('AVAILABILITY_OCCURRENCE_WEEKS', 10)
+    if slots and expand_from <= date.today() + timedelta(weeks=weeks - 1):
+        current_app.logger.warning(
+            f"No availability occurrences for tutor {tutor_id} from {expand_from}; expanding weekly slots "
+            f"on the fly (is scripts/refresh_availability_occurrences.py running?)"
+        )
+    expanded = expand_weekly_slots(slots, timezone_str, expand_from, end_date + timedelta(days=1))
+    return occurrences + [(start, end) for start, end in expanded if end > range_start]
+
+
+def _available_by_date(tutor_id, timezone_str, start_date, end_date):
+    """
+    Get a tutor's availability occurrences as local minute intervals keyed
+    by date.
+
+    Occurrences are concrete UTC instants, so each date gets the offset in
+    effect on it. Occurrences that run past local midnight are split
+    between the dates they touch.
+    """
+    available = {}
+    for start_utc, end_utc in _occurrences(tutor_id, timezone_str, start_date, end_date):
+        local_start = utc_datetime_to_local(start_utc, timezone_str)
+        local_end = utc_datetime_to_local(end_utc, timezone_str)
+        current_date = local_start.date()
+        while current_date <= local_end.date() and current_date <= end_date:
+            midnight = datetime.combine(current_date, time())
+            start = max(local_start, midnight) - midnight
+            end = min(local_end, midnight + timedelta(days=1)) - midnight
+            if current_date >= start_date and end > start:
+                available.setdefault(current_date, []).append(
+                    (int(start.total_seconds() // 60), int(end.total_seconds() // 60))
+                )
+            current_date += timedelta(days=1)
+    return available
+
+
+def get_available_intervals(tutor, start_date, end_date):
+    """
+    Get the local time intervals a tutor is available on each date.
+
+    Extra-time exceptions are added to the weekly availability and blocked
+    exceptions are then subtracted, so a block always wins.
+
+    Args:
+        tutor (Tutor): The tutor
+        start_date (date): First date of the range
+        end_date (date): Last date of the range (inclusive)
+
+    Returns:
+        dict: Date to sorted, non-overlapping (start_minute, end_minute)
+            tuples; dates without availability are omitted
+    """
+    available = _available_by_date(tutor.id, tutor.timezone or 'UTC', start_date, end_date)
+
+    blocked = {}
+    for exception in TutorAvailabilityException.get_for_range(tutor.id, start_date, end_date):
+        target = available if exception.exception_type == AvailabilityExceptionType.EXTRA else blocked
+        current_date = max(exception.start_date, start_date)
+        while current_date <= min(exception.end_date, end_date):
+            target.setdefault(current_date, []).append(exception.minute_range)
+            current_date += timedelta(days=1)
+
+    result = {}
+    for day, intervals in available.items():
+        free = subtract_intervals(intervals, blocked.get(day, []))
+        if free:
+            result[day] = free
+    return result
+
+
+def get_tutor_schedule(tutor, start_date, end_date):
+    """
+    Compute the bookable free intervals for a tutor over a date range.
+
+    The tutor's availability occurrences and date exceptions are combined
+    for the range in local time and the active bookings of each date are subtracted from them with
+    a sorted interval sweep. Booking times are the tutor-local wall-clock
+    times submitted by the booking form.
+
+    Args:
+        tutor (Tutor): The tutor
+        start_date (date): First date of the range
+        end_date (date): Last date of the range (inclusive)
+
+    Returns:
+        list: One DaySchedule per date, in date order
+    """
+    timezone_str = tutor.timezone or 'UTC'
+    available = get_available_intervals(tutor, start_date, end_date)
+
+    booked_by_date = {}
+    for booking in Booking.get_tutor_bookings_for_date_range(tutor.id, start_date, end_date):
+        booked_by_date.setdefault(booking.booking_date, []).append(
+            (_minutes(booking.start_time), _minutes(booking.end_time))
+        )
+
+    schedule = []
+    current_date = start_date
+    while current_date <= end_date:
+        booked = merge_intervals(booked_by_date.get(current_date, []))
+        free = subtract_intervals(available.get(current_date, []), booked)
+        schedule.append(DaySchedule(
+            current_date,
+            free=[Slot(current_date, start, end, timezone_str) for start, end in free],
+            booked=[Slot(current_date, start, end, timezone_str) for start, end in booked]
+        ))
+        current_date += timedelta(days=1)
+
+    return schedule
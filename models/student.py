@@ -5,6 +5,7 @@ import datetime
 from flask import url_for, current_app
 from db import db
 from models.user import User, UserRole
+from models.subject import Subject, student_subjects
 
 class Student(User):
     """Student user model extending the base User model."""
@@ -20,6 +21,10 @@ class Student(User):
     learning_goals = db.Column(db.Text, nullable=True)
     profile_pic = db.Column(db.String(255), nullable=True)  # Path to profile picture
     
+    # Normalized subjects (subjects_interested is kept as a denormalized display copy)
+    subjects = db.relationship('Subject', secondary=student_subjects, order_by='Subject.name',
+                               backref=db.backref('students', lazy='dynamic'))
+    
     @property
     def profile_picture_url(self):
         """Generate the full URL for the profile picture using config directory."""
@@ -28,6 +33,24 @@ class Student(User):
             return url_for('static', filename=f'{upload_folder.replace("static/", "")}/{self.profile_pic}')
         return None
     
+    @property
+    def subject_names(self):
+        """List of subject names the student is interested in."""
+        if self.subjects:
+            return [subject.name for subject in self.subjects]
+        # Fall back to the CSV column for rows not yet backfilled
+        return Subject.parse_list(self.subjects_interested)
+    
+    def set_subjects(self, subjects):
+        """
+        Replace the subjects the student is interested in.
+        
+        Args:
+            subjects (list or str): List of subject names or a comma-separated string
+        """
+        self.subjects = Subject.get_or_create_many(subjects)
+        self.subjects_interested = ','.join(subject.name for subject in self.subjects) or None
+    
     @classmethod
     def create(cls, email, fullname, password, timezone, dob, 
               phone=None, study_level=None, subjects_interested=None, learning_goals=None):
@@ -55,13 +78,13 @@ class Student(User):
             phone=phone,
             dob=datetime.datetime.strptime(dob, '%Y-%m-%d').date() if isinstance(dob, str) else dob,
             study_level=study_level,
-            subjects_interested=','.join(subjects_interested) if subjects_interested else None,
             learning_goals=learning_goals
         )
         student.password = password  # This will hash the password
+        student.set_subjects(subjects_interested)
         
         db.session.add(student)
-        db.session.commit()
+        db.session.flush()
         
         return student
     
@@ -71,7 +94,7 @@ class Student(User):
         student_dict = {
             'dob': self.dob.isoformat() if self.dob else None,
             'study_level': self.study_level,
-            'subjects_interested': self.subjects_interested.split(',') if self.subjects_interested else [],
+            'subjects_interested': self.subject_names,
             'learning_goals': self.learning_goals
         }
         return {**base_dict, **student_dict}
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Subject taxonomy model for TutorConnect application.
+Normalizes the subjects taught by tutors and studied by students.
+"""
+import datetime
+from db import db
+
+# Association between tutors and the subjects they teach
+tutor_subjects = db.Table(
+    'tutor_subjects',
+    db.Column('tutor_id', db.Integer, db.ForeignKey('tutors.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('subject_id', db.Integer, db.ForeignKey('subjects.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_tutor_subjects_subject_tutor', 'subject_id', 'tutor_id')
+)
+
+# Association between students and the subjects they are interested in
+student_subjects = db.Table(
+    'student_subjects',
+    db.Column('student_id', db.Integer, db.ForeignKey('students.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('subject_id', db.Integer, db.ForeignKey('subjects.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_student_subjects_subject_student', 'subject_id', 'student_id')
+)
+
+
+class Subject(db.Model):
+    """Subject that tutors can teach and students can be interested in."""
+    __tablename__ = 'subjects'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)  # Display name
+    slug = db.Column(db.String(100), nullable=False, unique=True, index=True)  # Normalized lookup key
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+    @staticmethod
+    def normalize(name):
+        """Normalize a subject name into its lookup key."""
+        return ' '.join(name.split()).lower()
+
+    @classmethod
+    def parse_list(cls, subjects):
+        """
+        Clean a list of subject names, dropping blanks and duplicates.
+
+        Args:
+            subjects (list or str): List of subject names or a comma-separated string
+
+        Returns:
+            list: Subject display names in their original order
+        """
+        if not subjects:
+            return []
+        if isinstance(subjects, str):
+            subjects = subjects.split(',')
+
+        names = []
+        seen = set()
+        for subject in subjects:
+            name = ' '.join(subject.split())
+            slug = name.lower()
+            if name and slug not in seen:
+                seen.add(slug)
+                names.append(name)
+        return names
+
+    @classmethod
+    def get_by_name(cls, name):
+        """Get a subject by name, ignoring case and surrounding whitespace."""
+        return cls.query.filter_by(slug=cls.normalize(name)).first()
+
+    @classmethod
+    def get_or_create_many(cls, names):
+        """
+        Get subjects by name, adding any that do not exist yet to the session.
+
+        Args:
+            names (list): Subject display names
+
+        Returns:
+            list: Subject objects in the same order as names
+        """
+        names = cls.parse_list(names)
+        if not names:
+            return []
+
+        slugs = [cls.normalize(name) for name in names]
+        existing = {subject.slug: subject for subject in cls.query.filter(cls.slug.in_(slugs)).all()}
+
+        subjects = []
+        for name, slug in zip(names, slugs):
+            subject = existing.get(slug)
+            if subject is None:
+                subject = cls(name=name, slug=slug)
+                db.session.add(subject)
+                existing[slug] = subject
+            subjects.append(subject)
+        return subjects
+
+    def to_dict(self):
+        """Convert the subject object to a dictionary."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'slug': self.slug
+        }
+
+    def __repr__(self):
+        return f'<Subject {self.name}>'
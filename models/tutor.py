@@ -6,6 +6,7 @@ from enum import Enum
 from flask import url_for, current_app
 from db import db
 from models.user import User, UserRole
+from models.subject import Subject, tutor_subjects
 
 class TutorStatus(Enum):
     """Enum for tutor verification status."""
@@ -17,6 +18,10 @@ class TutorStatus(Enum):
 class Tutor(User):
     """Tutor user model extending the base User model."""
     __tablename__ = 'tutors'
+    __table_args__ = (
+        # Supports keyset pagination of search results
+        db.Index('ix_tutors_rating_created_id', 'rating', 'created_at', 'id'),
+    )
     
     # Override role to set it as TUTOR
     role = db.Column(db.Enum(UserRole), nullable=False, default=UserRole.TUTOR)
@@ -33,6 +38,10 @@ class Tutor(User):
     profile_pic = db.Column(db.String(255), nullable=True)  # Path to profile picture
     rating = db.Column(db.Float, nullable=True, default=0.0)  # Average rating (0.0 to 5.0)
     
+    # Normalized subjects (subjects_taught is kept as a denormalized display copy)
+    subjects = db.relationship('Subject', secondary=tutor_subjects, order_by='Subject.name',
+                               backref=db.backref('tutors', lazy='dynamic'))
+    
     @property
     def profile_picture_url(self):
         """Generate the full URL for the profile picture using config directory."""
@@ -41,6 +50,24 @@ class Tutor(User):
             return url_for('static', filename=f'{upload_folder.replace("static/", "")}/{self.profile_pic}')
         return None
     
+    @property
+    def subject_names(self):
+        """List of subject names taught by the tutor."""
+        if self.subjects:
+            return [subject.name for subject in self.subjects]
+        # Fall back to the CSV column for rows not yet backfilled
+        return Subject.parse_list(self.subjects_taught)
+    
+    def set_subjects(self, subjects):
+        """
+        Replace the subjects taught by the tutor.
+        
+        Args:
+            subjects (list or str): List of subject names or a comma-separated string
+        """
+        self.subjects = Subject.get_or_create_many(subjects)
+        self.subjects_taught = ','.join(subject.name for subject in self.subjects)
+    
     @classmethod
     def create(cls, email, fullname, password, timezone, qualification, experience, subjects_taught, bio,
                phone=None, hourly_rate=None, profile_pic=None, rating=0.0):
@@ -71,16 +98,16 @@ class Tutor(User):
             phone=phone,
             qualification=qualification,
             experience=float(experience),
-            subjects_taught=','.join(subjects_taught) if isinstance(subjects_taught, list) else subjects_taught,
             bio=bio,
             hourly_rate=decimal.Decimal(str(hourly_rate)) if hourly_rate else None,
             profile_pic=profile_pic,
             rating=float(rating) if rating is not None else 0.0
         )
         tutor.password = password  # This will hash the password
+        tutor.set_subjects(subjects_taught)
         
         db.session.add(tutor)
-        db.session.commit()
+        db.session.flush()
         
         return tutor
     
@@ -91,7 +118,7 @@ class Tutor(User):
             'status': self.status.value,
             'qualification': self.qualification,
             'experience': self.experience,
-            'subjects_taught': self.subjects_taught.split(',') if self.subjects_taught else [],
+            'subjects_taught': self.subject_names,
             'bio': self.bio,
             'hourly_rate': float(self.hourly_rate) if self.hourly_rate else None,
             'profile_pic': self.profile_pic,
@@ -105,7 +132,7 @@ class Tutor(User):
             new_status = TutorStatus(new_status)
         self.status = new_status
         # TODO: Add audit logging with admin_id
-        db.session.commit()
+        db.session.flush()
     
     def is_verified(self):
         """Check if tutor is verified and can access the system."""
@@ -3,10 +3,12 @@ Base User model for TutorConnect application.
 """
 import datetime
 from enum import Enum
-from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm.attributes import set_committed_value
 
 from db import db
+from utils.password_hashing import hash_password, check_password, needs_rehash
+from utils.touch_buffer import touch_buffer
 
 class UserRole(Enum):
     """Enum for user roles in the system."""
@@ -43,16 +45,31 @@ class User(db.Model):
     @password.setter
     def password(self, password):
         """Password setter - securely hashes the password."""
-        self._password_hash = generate_password_hash(password)
+        self._password_hash = hash_password(password)
         
     def verify_password(self, password):
-        """Verify that the provided password matches the stored hash."""
-        return check_password_hash(self._password_hash, password)
+        """
+        Verify that the provided password matches the stored hash.
+        
+        A hash made with an outdated method or cost is replaced with one
+        using the configured method, saved with the request's commit.
+        """
+        if not check_password(self._password_hash, password):
+            return False
+        if needs_rehash(self._password_hash):
+            self.password = password
+        return True
     
     def update_last_login(self):
-        """Update the last login timestamp for the user."""
-        self.last_login = datetime.datetime.utcnow()
-        db.session.commit()
+        """
+        Update the last login timestamp for the user.
+        
+        The write is buffered and batched with other activity timestamps
+        (see utils.touch_buffer); the loaded object shows it right away.
+        """
+        now = datetime.datetime.utcnow()
+        set_committed_value(self, 'last_login', now)
+        touch_buffer.touch(type(self), 'last_login', self.id, now)
         
     def to_dict(self):
         """Convert the user object to a dictionary."""
@@ -0,0 +1,139 @@
+"""
+User directory model for TutorConnect application.
+Maps every account's normalized email to its role and ID so a user can be
+resolved with one indexed lookup instead of probing the student, tutor and
+admin tables in turn. It also keeps emails unique across roles.
+"""
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+from db import db
+from models.user import UserRole
+from models.student import Student
+from models.tutor import Tutor
+from models.admin import Admin
+
+# User model for each role
+MODEL_BY_ROLE = {
+    UserRole.STUDENT: Student,
+    UserRole.TUTOR: Tutor,
+    UserRole.ADMIN: Admin,
+}
+ROLE_BY_MODEL = {model: role for role, model in MODEL_BY_ROLE.items()}
+
+
+def normalize_email(email):
+    """
+    Normalize an email address for directory lookups.
+
+    Args:
+        email (str): Email address as entered
+
+    Returns:
+        str: The trimmed, lowercased email
+    """
+    return (email or '').strip().lower()
+
+
+class UserDirectory(db.Model):
+    """One row per account, keyed by normalized email."""
+    __tablename__ = 'user_directory'
+    __table_args__ = (
+        db.UniqueConstraint('role', 'user_id', name='uq_user_directory_role_user'),
+    )
+
+    email = db.Column(db.String(120), primary_key=True)
+    role = db.Column(db.Enum(UserRole), nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+
+    @classmethod
+    def get_entry(cls, email):
+        """Get the directory entry for an email, if any."""
+        email = normalize_email(email)
+        if not email:
+            return None
+        return db.session.get(cls, email)
+
+    @classmethod
+    def find_user(cls, email, roles=None):
+        """
+        Resolve an email to its user account.
+
+        Accounts without a directory entry (created before the directory
+        was backfilled by migrate_add_user_directory.py) are looked up in
+        the role tables and given an entry.
+
+        Args:
+            email (str): Email address (any case)
+            roles (list, optional): UserRole values to accept; others are
+                treated as not found
+
+        Returns:
+            Student, Tutor, Admin or None: The matching user
+        """
+        entry = cls.get_entry(email)
+        if entry is None:
+            return cls._find_and_backfill(email, roles)
+        if roles is not None and entry.role not in roles:
+            return None
+        return db.session.get(MODEL_BY_ROLE[entry.role], entry.user_id)
+
+    @classmethod
+    def _find_and_backfill(cls, email, roles):
+        """Probe the role tables for an account missing from the directory."""
+        key = normalize_email(email)
+        if not key:
+            return None
+        for role, model in MODEL_BY_ROLE.items():
+            if roles is not None and role not in roles:
+                continue
+            user = model.query.filter(model.email.in_({email.strip(), key})).first()
+            if user is None:
+                continue
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(cls.__table__.insert().values(email=key, role=role, user_id=user.id))
+            except IntegrityError:
+                # Added concurrently, or the email is claimed by another account
+                pass
+            return user
+        return None
+
+    def __repr__(self):
+        return f'<UserDirectory {self.email} {self.role.value}:{self.user_id}>'
+
+
+def _role_of(target):
+    return ROLE_BY_MODEL[type(target)]
+
+
+def _insert_entry(mapper, connection, target):
+    """Add the directory entry for a new user in the same flush."""
+    connection.execute(UserDirectory.__table__.insert().values(
+        email=normalize_email(target.email), role=_role_of(target), user_id=target.id
+    ))
+
+
+def _update_entry(mapper, connection, target):
+    """Follow email changes made through the ORM."""
+    if not inspect(target).attrs.email.history.has_changes():
+        return
+    table = UserDirectory.__table__
+    connection.execute(
+        table.update()
+            .where(table.c.role == _role_of(target), table.c.user_id == target.id)
+            .values(email=normalize_email(target.email))
+    )
+
+
+def _delete_entry(mapper, connection, target):
+    """Remove the directory entry of a deleted user."""
+    table = UserDirectory.__table__
+    connection.execute(
+        table.delete().where(table.c.role == _role_of(target), table.c.user_id == target.id)
+    )
+
+
+for _model in MODEL_BY_ROLE.values():
+    event.listen(_model, 'after_insert', _insert_entry)
+    event.listen(_model, 'after_update', _update_entry)
+    event.listen(_model, 'after_delete', _delete_entry)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Password hashing cost
+
+This script times one password verification for a range of scrypt and
+PBKDF2 costs on the current machine and suggests the PASSWORD_HASH_METHOD
+whose verification time is closest to a target. Run it on the production
+hardware; existing hashes are upgraded to the new method as users log in.
+
+Usage:
+    python scripts/benchmark_password_hash.py [--target-ms 250] [--rounds 3]
+"""
+
+import sys
+import argparse
+import time
+
+try:
+    from werkzeug.security import generate_password_hash, check_password_hash
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    sys.exit(1)
+
+# Candidate methods, cheapest first within each family
+CANDIDATES = [
+    'scrypt:16384:8:1',
+    'scrypt:32768:8:1',
+    'scrypt:65536:8:1',
+    'scrypt:131072:8:1',
+    'pbkdf2:sha256:260000',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:1000000',
+]
+
+
+def time_verification(method, rounds):
+    """Get the best-of-rounds verification time for a method in milliseconds."""
+    pwhash = generate_password_hash('benchmark-password', method)
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        check_password_hash(pwhash, 'benchmark-password')
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(description='Password hashing cost benchmark')
+    parser.add_argument('--target-ms', type=float, default=250, help='Target verification time in milliseconds')
+    parser.add_argument('--rounds', type=int, default=3, help='Timed verifications per method')
+    args = parser.parse_args()
+
+    print("🚀 TutorConnect Password Hash Benchmark")
+    print(f"   Target verification time: {args.target_ms:.0f} ms")
+    print("=" * 60)
+
+    results = []
+    for method in CANDIDATES:
+        try:
+            elapsed = time_verification(method, args.rounds)
+        except ValueError as e:
+            # e.g. scrypt memory limits on small machines
+            print(f"⚠️  {method:<24} skipped: {e}")
+            continue
+        results.append((method, elapsed))
+        print(f"⏱️  {method:<24} {elapsed:8.1f} ms")
+
+    if not results:
+        print("❌ No method could be benchmarked.")
+        return False
+
+    method, elapsed = min(results, key=lambda result: abs(result[1] - args.target_ms))
+    print("=" * 60)
+    print(f"✅ Suggested: PASSWORD_HASH_METHOD='{method}' ({elapsed:.1f} ms per verification)")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
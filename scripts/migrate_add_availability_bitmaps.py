@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: Weekly availability bitmaps
+
+This script creates the 'tutor_availability_bitmaps' table and backfills one
+bitmap per tutor from the existing 'tutor_availability' slots.
+
+Usage:
+    python scripts/migrate_add_availability_bitmaps.py
+
+Requirements:
+    - Run this script from the project root directory
+    - Ensure the application database is accessible
+    - Backup your database before running migrations
+"""
+
+import sys
+import os
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from db import db
+    from factory import create_app
+    from models.availability import TutorAvailability, TutorAvailabilityBitmap
+    from models.tutor import Tutor
+    from sqlalchemy import inspect
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+# Number of tutors backfilled per transaction
+BATCH_SIZE = 200
+
+
+def main():
+    """Main migration function."""
+    print("🚀 TutorConnect Database Migration")
+    print("   Adding weekly availability bitmaps")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            if 'utc_offset' not in {column['name'] for column in inspect(db.engine).get_columns('tutor_availability')}:
+                print("❌ tutor_availability.utc_offset is missing.")
+                print("   Run scripts/migrate_add_availability_offsets.py first.")
+                return False
+
+            print("🔧 Creating availability bitmap table (if missing)...")
+            TutorAvailabilityBitmap.__table__.create(db.engine, checkfirst=True)
+            print("✅ Availability bitmap table is in place.")
+
+            print("🔄 Backfilling bitmaps from 'tutor_availability'...")
+            tutor_ids = [row[0] for row in db.session.query(TutorAvailability.tutor_id).distinct().all()]
+            updated = 0
+            for tutor in Tutor.query.filter(Tutor.id.in_(tutor_ids)).all():
+                TutorAvailabilityBitmap.rebuild_for_tutor(tutor.id, tutor.timezone or 'UTC')
+                updated += 1
+                if updated % BATCH_SIZE == 0:
+                    db.session.commit()
+
+            db.session.commit()
+            print(f"✅ Backfilled availability bitmaps for {updated} tutors.")
+            print("🎉 Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            print("🔄 Rolling back any changes...")
+            db.session.rollback()
+            return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: Availability exceptions
+
+This script creates the 'tutor_availability_exceptions' table, which holds
+tutors' blocked dates (e.g. holidays) and extra availability on specific
+dates. No backfill is needed.
+
+Usage:
+    python scripts/migrate_add_availability_exceptions.py
+
+Requirements:
+    - Run this script from the project root directory
+    - Ensure the application database is accessible
+    - Backup your database before running migrations
+"""
+
+import sys
+import os
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from db import db
+    from factory import create_app
+    from models.availability import TutorAvailabilityException
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+
+def main():
+    """Main migration function."""
+    print("🚀 TutorConnect Database Migration")
+    print("   Adding availability exceptions")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            print("🔧 Creating availability exceptions table (if missing)...")
+            TutorAvailabilityException.__table__.create(db.engine, checkfirst=True)
+            print("✅ Availability exceptions table is in place.")
+            print("🎉 Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: Availability slot UTC offsets
+
+This script adds the nullable 'utc_offset' column to 'tutor_availability'
+and backfills it with the tutor's UTC offset on the date each slot was last
+saved, which is the offset its GMT times were converted with. Slots then
+keep their wall-clock times across DST transitions. The bitmaps and
+occurrences of the affected tutors are rebuilt afterwards.
+
+Usage:
+    python scripts/migrate_add_availability_offsets.py
+
+Requirements:
+    - Run this script from the project root directory
+    - Ensure the application database is accessible
+    - Backup your database before running migrations
+"""
+
+import sys
+import os
+from datetime import date
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from db import db, unit_of_work
+    from factory import create_app
+    from models.availability import TutorAvailability
+    from models.tutor import Tutor
+    from utils.timezones import utc_offset_minutes
+    from sqlalchemy import inspect, text, update
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+# Number of tutors backfilled per transaction
+BATCH_SIZE = 200
+
+
+def main():
+    """Main migration function."""
+    print("🚀 TutorConnect Database Migration")
+    print("   Adding UTC offsets to availability slots")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            columns = {column['name'] for column in inspect(db.engine).get_columns('tutor_availability')}
+            if 'utc_offset' in columns:
+                print("✅ tutor_availability.utc_offset already exists.")
+            else:
+                print("🔧 Adding utc_offset column to tutor_availability...")
+                with db.engine.begin() as conn:
+                    conn.execute(text("ALTER TABLE tutor_availability ADD COLUMN utc_offset SMALLINT NULL"))
+                print("✅ Added tutor_availability.utc_offset.")
+
+            print("🔄 Backfilling offsets from each slot's save date...")
+            tutor_ids = [row[0] for row in db.session.query(TutorAvailability.tutor_id)
+                         .filter(TutorAvailability.utc_offset.is_(None)).distinct().all()]
+            tutors = Tutor.query.filter(Tutor.id.in_(tutor_ids)).all()
+            backfilled = 0
+            for start in range(0, len(tutors), BATCH_SIZE):
+                with unit_of_work():
+                    for tutor in tutors[start:start + BATCH_SIZE]:
+                        timezone_str = tutor.timezone or 'UTC'
+                        slots = TutorAvailability.query.filter_by(tutor_id=tutor.id, utc_offset=None).all()
+                        offsets = []
+                        for slot in slots:
+                            saved_at = slot.updated_at or slot.created_at
+                            saved_on = saved_at.date() if saved_at else date.today()
+                            # Keep updated_at so the save date stays on record
+                            offsets.append({'id': slot.id, 'utc_offset': utc_offset_minutes(timezone_str, saved_on),
+                                            'updated_at': slot.updated_at})
+                        db.session.execute(update(TutorAvailability), offsets)
+                        db.session.expire_all()
+                        TutorAvailability.refresh_derived(tutor.id, timezone_str)
+                        backfilled += len(slots)
+            print(f"✅ Backfilled {backfilled} slots for {len(tutors)} tutors.")
+            print("🎉 Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: Weekly booking series
+
+This script creates the 'booking_series' table and adds the nullable
+'series_id' column (with its index) to the bookings table, so a weekly
+recurring booking can link its sessions together. Existing bookings keep a
+NULL series_id; no backfill is needed.
+
+Usage:
+    python scripts/migrate_add_booking_series.py
+
+Requirements:
+    - Run this script from the project root directory
+    - Ensure the application database is accessible
+    - Backup your database before running migrations
+"""
+
+import sys
+import os
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from db import db
+    from factory import create_app
+    from models.booking import Booking, BookingSeries
+    from sqlalchemy import inspect, text
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+
+def main():
+    """Main migration function."""
+    print("🚀 TutorConnect Database Migration")
+    print("   Adding weekly booking series")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            print("🔧 Creating booking series table (if missing)...")
+            BookingSeries.__table__.create(db.engine, checkfirst=True)
+            print("✅ Booking series table is in place.")
+
+            inspector = inspect(db.engine)
+            columns = {column['name'] for column in inspector.get_columns('bookings')}
+            if 'series_id' in columns:
+                print("✅ bookings.series_id already exists.")
+            else:
+                print("🔧 Adding series_id column to bookings...")
+                with db.engine.begin() as conn:
+                    if db.engine.dialect.name == 'mysql':
+                        conn.execute(text("""
+                            ALTER TABLE bookings
+                            ADD COLUMN series_id INT NULL,
+                            ADD CONSTRAINT fk_bookings_series FOREIGN KEY (series_id) REFERENCES booking_series(id)
+                        """))
+                    else:
+                        conn.execute(text("ALTER TABLE bookings ADD COLUMN series_id INTEGER REFERENCES booking_series(id)"))
+                print("✅ Added bookings.series_id.")
+
+            existing_indexes = {index['name'] for index in inspect(db.engine).get_indexes('bookings')}
+            for index in Booking.__table__.indexes:
+                if index.name == 'ix_bookings_series' and index.name not in existing_indexes:
+                    print(f"🔧 Creating index {index.name}...")
+                    index.create(db.engine)
+            print("✅ Series index is in place.")
+            print("🎉 Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
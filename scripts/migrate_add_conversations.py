@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: Conversation summaries
+
+This script creates the 'conversations' table and backfills one row per
+student/tutor pair from the existing 'messages' table, including the last
+message pointer, message count and unread count.
+
+Usage:
+    python scripts/migrate_add_conversations.py
+
+Requirements:
+    - Run this script from the project root directory
+    - Ensure the application database is accessible
+    - Backup your database before running migrations
+"""
+
+import sys
+import os
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from sqlalchemy import func, case, inspect, text
+    from db import db
+    from factory import create_app
+    from models.conversation import Conversation
+    from models.message import Message
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+# Number of conversations backfilled per transaction
+BATCH_SIZE = 500
+
+
+def main():
+    """Main migration function."""
+    print("🚀 TutorConnect Database Migration")
+    print("   Adding conversation summaries")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            print("🔧 Creating conversations table (if missing)...")
+            Conversation.__table__.create(db.engine, checkfirst=True)
+            print("✅ Conversations table is in place.")
+
+            # Tables created by an earlier version of this script carry an
+            # unused student_unread_count column (students never receive messages)
+            columns = {column['name'] for column in inspect(db.engine).get_columns('conversations')}
+            if 'student_unread_count' in columns:
+                print("🔧 Dropping unused student_unread_count column...")
+                with db.engine.begin() as conn:
+                    conn.execute(text("ALTER TABLE conversations DROP COLUMN student_unread_count"))
+
+            print("🔄 Aggregating messages per student/tutor pair...")
+            pairs = db.session.query(
+                Message.sender_id,
+                Message.receiver_id,
+                func.count(Message.id),
+                func.coalesce(func.sum(case((Message.is_read == False, 1), else_=0)), 0),
+                func.max(Message.id)
+            ).group_by(Message.sender_id, Message.receiver_id).all()
+
+            created = updated = 0
+            for student_id, tutor_id, message_count, unread_count, last_message_id in pairs:
+                last_message = db.session.get(Message, last_message_id)
+                conversation = Conversation.get_for_pair(student_id, tutor_id)
+                if conversation is None:
+                    conversation = Conversation(student_id=student_id, tutor_id=tutor_id)
+                    db.session.add(conversation)
+                    created += 1
+                else:
+                    updated += 1
+                conversation.last_message_id = last_message_id
+                conversation.last_message_at = last_message.created_at
+                conversation.message_count = message_count
+                conversation.tutor_unread_count = int(unread_count)
+                if (created + updated) % BATCH_SIZE == 0:
+                    db.session.commit()
+
+            db.session.commit()
+            print(f"✅ Created {created} and refreshed {updated} conversations.")
+            print("🎉 Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            print("🔄 Rolling back any changes...")
+            db.session.rollback()
+            return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
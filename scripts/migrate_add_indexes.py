@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: Create missing model indexes
+
+db.create_all() only creates indexes together with new tables. This script
+creates any index declared on the models that is missing from an existing
+table (for example the tutor search pagination index on 'tutors').
+Indexes on columns that a later migration has not added yet (for example
+'bookings.series_id') are skipped and reported; run this script again after
+that migration.
+
+Usage:
+    python scripts/migrate_add_indexes.py
+
+Requirements:
+    - Run this script from the project root directory
+    - Ensure the application database is accessible
+    - Backup your database before running migrations
+"""
+
+import sys
+import os
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from db import db
+    from factory import create_app
+    from sqlalchemy import inspect
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+
+def main():
+    """Main migration function."""
+    print("🚀 TutorConnect Database Migration")
+    print("   Creating missing model indexes")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            inspector = inspect(db.engine)
+            existing_tables = set(inspector.get_table_names())
+            created = 0
+            skipped = 0
+
+            for table in db.metadata.sorted_tables:
+                if table.name not in existing_tables:
+                    continue
+                existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+                existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+                for index in table.indexes:
+                    if index.name in existing_indexes:
+                        continue
+                    missing_columns = [column.name for column in index.columns if column.name not in existing_columns]
+                    if missing_columns:
+                        print(f"⚠️  Skipping index {index.name} on {table.name}: "
+                              f"missing column(s) {', '.join(missing_columns)}")
+                        skipped += 1
+                        continue
+                    print(f"🔧 Creating index {index.name} on {table.name}...")
+                    index.create(db.engine)
+                    created += 1
+
+            if created:
+                print(f"✅ Created {created} missing index(es).")
+            else:
+                print("✅ All model indexes already exist - no changes needed!")
+            if skipped:
+                print(f"⚠️  Skipped {skipped} index(es); run the migrations that add their columns, "
+                      f"then run this script again.")
+            print("🎉 Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: OAuth identities
+
+This script creates the 'oauth_identities' table, which links Google and
+Microsoft sign-ins to accounts by the provider's user ID. Links are added
+the next time each user signs in with a verified email, so no backfill is
+needed.
+
+Usage:
+    python scripts/migrate_add_oauth_identities.py
+
+Requirements:
+    - Run this script from the project root directory
+    - Ensure the application database is accessible
+    - Backup your database before running migrations
+"""
+
+import sys
+import os
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from db import db
+    from factory import create_app
+    from models.oauth_identity import OAuthIdentity
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+
+def main():
+    """Main migration function."""
+    print("🚀 TutorConnect Database Migration")
+    print("   Adding OAuth identities")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            print("🔧 Creating OAuth identities table (if missing)...")
+            OAuthIdentity.__table__.create(db.engine, checkfirst=True)
+            print("✅ OAuth identities table is in place.")
+            print("🎉 Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
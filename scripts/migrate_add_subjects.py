@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: Normalized subject taxonomy
+
+This script creates the 'subjects', 'tutor_subjects' and 'student_subjects'
+tables and backfills them from the comma-separated 'tutors.subjects_taught'
+and 'students.subjects_interested' columns.
+
+Usage:
+    python scripts/migrate_add_subjects.py
+
+Requirements:
+    - Run this script from the project root directory
+    - Ensure the application database is accessible
+    - Backup your database before running migrations
+"""
+
+import sys
+import os
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from db import db
+    from factory import create_app
+    from models.subject import Subject, tutor_subjects, student_subjects
+    from models.tutor import Tutor
+    from models.student import Student
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+# Number of users backfilled per transaction
+BATCH_SIZE = 200
+
+
+def backfill(model, csv_column, label):
+    """Backfill subject associations for users that have none yet."""
+    print(f"🔄 Backfilling {label} subjects from '{csv_column.key}'...")
+
+    users = model.query.filter(csv_column.isnot(None), csv_column != '').all()
+    updated = 0
+    for user in users:
+        if user.subjects:
+            continue
+        user.set_subjects(getattr(user, csv_column.key))
+        updated += 1
+        if updated % BATCH_SIZE == 0:
+            db.session.commit()
+
+    db.session.commit()
+    print(f"✅ Backfilled subjects for {updated} of {len(users)} {label}.")
+    return updated
+
+
+def main():
+    """Main migration function."""
+    print("🚀 TutorConnect Database Migration")
+    print("   Adding normalized subject taxonomy")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            print("🔧 Creating subject tables (if missing)...")
+            Subject.__table__.create(db.engine, checkfirst=True)
+            tutor_subjects.create(db.engine, checkfirst=True)
+            student_subjects.create(db.engine, checkfirst=True)
+            print("✅ Subject tables are in place.")
+
+            backfill(Tutor, Tutor.subjects_taught, 'tutors')
+            backfill(Student, Student.subjects_interested, 'students')
+
+            print(f"\n📊 Subjects in taxonomy: {Subject.query.count()}")
+            print("🎉 Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            print("🔄 Rolling back any changes...")
+            db.session.rollback()
+            return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: User directory
+
+This script creates the 'user_directory' table and backfills one entry per
+student, tutor and admin account, keyed by the lowercased email. Emails
+shared by more than one account (in any role, ignoring case) cannot be
+added and are reported so they can be resolved by hand.
+
+Usage:
+    python scripts/migrate_add_user_directory.py
+
+Requirements:
+    - Run this script from the project root directory
+    - Ensure the application database is accessible
+    - Backup your database before running migrations
+"""
+
+import sys
+import os
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from db import db
+    from factory import create_app
+    from models.user_directory import UserDirectory, MODEL_BY_ROLE, normalize_email
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+
+def main():
+    """Main migration function."""
+    print("🚀 TutorConnect Database Migration")
+    print("   Adding the user directory")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            print("🔧 Creating user_directory table (if missing)...")
+            UserDirectory.__table__.create(db.engine, checkfirst=True)
+            print("✅ User directory table is in place.")
+
+            print("🔄 Collecting account emails...")
+            existing = {entry.email: (entry.role, entry.user_id) for entry in UserDirectory.query.all()}
+            claimed = dict(existing)
+            conflicts = []
+            added = 0
+
+            for role, model in MODEL_BY_ROLE.items():
+                for user_id, email in db.session.query(model.id, model.email).order_by(model.id):
+                    key = normalize_email(email)
+                    owner = claimed.get(key)
+                    if owner == (role, user_id):
+                        continue
+                    if owner is not None:
+                        conflicts.append((key, owner, (role, user_id)))
+                        continue
+                    db.session.add(UserDirectory(email=key, role=role, user_id=user_id))
+                    claimed[key] = (role, user_id)
+                    added += 1
+
+            db.session.commit()
+            print(f"✅ Added {added} directory entries ({len(existing)} already present).")
+
+            if conflicts:
+                print(f"⚠️  {len(conflicts)} accounts share an email with another account and were skipped:")
+                for email, (kept_role, kept_id), (role, user_id) in conflicts:
+                    print(f"   {email}: {role.value} #{user_id} (kept {kept_role.value} #{kept_id})")
+                print("   Change the email of the skipped accounts, then run this script again.")
+
+            print("🎉 Migration completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during migration: {e}")
+            print("🔄 Rolling back any changes...")
+            db.session.rollback()
+            return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Development Tool: Mock OpenID Connect provider
+
+This script runs a local stand-in for the Google/Microsoft sign-in
+endpoints so the OAuth login flow can be exercised end to end without
+real provider credentials. The authorize page signs in as the email given
+in its form and issues RS256 ID tokens signed with a key generated at
+start-up; the app validates them against this server's JWKS endpoint.
+
+Usage:
+    python scripts/mock_oauth_provider.py [--port 5055]
+
+    Then start the app with the provider endpoints pointed at it, e.g.:
+    GOOGLE_CLIENT_ID=mock-client GOOGLE_CLIENT_SECRET=mock-secret \\
+    GOOGLE_AUTHORIZE_URL=http://127.0.0.1:5055/authorize \\
+    GOOGLE_TOKEN_URL=http://127.0.0.1:5055/token \\
+    GOOGLE_JWKS_URL=http://127.0.0.1:5055/jwks \\
+    GOOGLE_USERINFO_URL=http://127.0.0.1:5055/userinfo \\
+    GOOGLE_ISSUER=http://127.0.0.1:5055 \\
+    python app.py
+"""
+
+import sys
+import argparse
+import html
+import json
+import secrets
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode, urlparse, parse_qs
+
+try:
+    import jwt
+    from cryptography.hazmat.primitives.asymmetric import rsa
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Install the project requirements (PyJWT and cryptography).")
+    sys.exit(1)
+
+KEY_ID = 'mock-key'
+
+
+class MockProvider:
+    """Signing key and issued codes of the mock provider."""
+
+    def __init__(self, issuer):
+        self.issuer = issuer
+        self.key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.codes = {}  # code -> (client_id, email, name, nonce)
+
+    def jwks(self):
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self.key.public_key()))
+        jwk.update(kid=KEY_ID, alg='RS256', use='sig')
+        return {'keys': [jwk]}
+
+    def issue_code(self, client_id, email, name, nonce):
+        code = secrets.token_urlsafe(16)
+        self.codes[code] = (client_id, email, name, nonce)
+        return code
+
+    def redeem(self, code):
+        client_id, email, name, nonce = self.codes.pop(code)
+        now = int(time.time())
+        claims = {
+            'iss': self.issuer, 'aud': client_id, 'sub': email, 'iat': now, 'exp': now + 600,
+            'nonce': nonce, 'email': email, 'email_verified': True, 'name': name
+        }
+        id_token = jwt.encode(claims, self.key, algorithm='RS256', headers={'kid': KEY_ID})
+        return {'access_token': secrets.token_urlsafe(16), 'token_type': 'Bearer', 'id_token': id_token}
+
+
+def make_handler(provider):
+    """Build the request handler class bound to a provider."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _json(self, payload, status=200):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            if url.path == '/jwks':
+                self._json(provider.jwks())
+            elif url.path == '/userinfo':
+                self._json({'email': 'mock.user@example.com', 'name': 'Mock User'})
+            elif url.path == '/authorize' and 'email' in query:
+                code = provider.issue_code(query['client_id'], query['email'],
+                                           query.get('name') or 'Mock User', query.get('nonce'))
+                location = f"{query['redirect_uri']}?{urlencode({'code': code, 'state': query['state']})}"
+                self.send_response(302)
+                self.send_header('Location', location)
+                self.end_headers()
+            elif url.path == '/authorize':
+                hidden = ''.join(f'<input type="hidden" name="{html.escape(key)}" value="{html.escape(value)}">'
+                                 for key, value in query.items())
+                page = (f'<form method="get">{hidden}<p>Sign in to the mock provider as:</p>'
+                        f'<input name="email" placeholder="email"> <input name="name" placeholder="name"> '
+                        f'<button>Continue</button></form>').encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html')
+                self.send_header('Content-Length', str(len(page)))
+                self.end_headers()
+                self.wfile.write(page)
+            else:
+                self._json({'error': 'not_found'}, 404)
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/token':
+                return self._json({'error': 'not_found'}, 404)
+            form = parse_qs(self.rfile.read(int(self.headers.get('Content-Length', 0))).decode())
+            code = form.get('code', [''])[0]
+            if code not in provider.codes:
+                return self._json({'error': 'invalid_grant'}, 400)
+            self._json(provider.redeem(code))
+
+        def log_message(self, format, *args):
+            print(f"   {self.command} {self.path.split('?')[0]}")
+
+    return Handler
+
+
+def main():
+    """Run the mock provider until interrupted."""
+    parser = argparse.ArgumentParser(description='Mock OpenID Connect provider')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    issuer = f'http://{args.host}:{args.port}'
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(MockProvider(issuer)))
+
+    print("🚀 TutorConnect Mock OAuth Provider")
+    print(f"   Issuer: {issuer}")
+    print("=" * 60)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Stopped.")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Maintenance Script: Availability occurrences
+
+This script creates the 'tutor_availability_occurrences' table if it is
+missing, re-expands every tutor's weekly availability into UTC occurrences
+for the next AVAILABILITY_OCCURRENCE_WEEKS weeks, rebuilds the weekly
+search bitmaps with the current UTC offsets (so they follow DST changes)
+and deletes occurrences that have ended. Run it once after deploying and then daily (e.g. from
+cron) so the materialized window keeps moving forward; changes to a tutor's
+availability or timezone are applied immediately by the application.
+
+Usage:
+    python scripts/refresh_availability_occurrences.py [--config path/to/config.py]
+
+Requirements:
+    - Run this script from the project root directory
+    - Ensure the application database is accessible
+"""
+
+import sys
+import os
+import argparse
+from datetime import datetime, timedelta
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from db import db, unit_of_work
+    from factory import create_app
+    from models.availability import TutorAvailability, TutorAvailabilityBitmap, TutorAvailabilityOccurrence
+    from models.tutor import Tutor
+    from sqlalchemy import inspect
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+# Number of tutors refreshed per transaction
+BATCH_SIZE = 200
+
+# Ended occurrences are kept this long before being deleted
+RETENTION = timedelta(days=1)
+
+
+def main():
+    """Main refresh function."""
+    parser = argparse.ArgumentParser(description='Refresh materialized availability occurrences')
+    parser.add_argument('--config', help='Path to a config file to load on top of config.py')
+    args = parser.parse_args()
+
+    print("🚀 TutorConnect Availability Occurrences")
+    print("   Expanding weekly availability into UTC occurrences")
+    print("=" * 60)
+
+    app = create_app(args.config)
+
+    with app.app_context():
+        try:
+            if 'utc_offset' not in {column['name'] for column in inspect(db.engine).get_columns('tutor_availability')}:
+                print("❌ tutor_availability.utc_offset is missing.")
+                print("   Run scripts/migrate_add_availability_offsets.py first.")
+                return False
+
+            print("🔧 Creating occurrence table (if missing)...")
+            TutorAvailabilityOccurrence.__table__.create(db.engine, checkfirst=True)
+            print("✅ Occurrence table is in place.")
+
+            print(f"🔄 Expanding {app.config.get('AVAILABILITY_OCCURRENCE_WEEKS', 10)} weeks of availability...")
+            tutor_ids = [row[0] for row in db.session.query(TutorAvailability.tutor_id).distinct().all()]
+            tutors = Tutor.query.filter(Tutor.id.in_(tutor_ids)).all()
+            written = 0
+            for start in range(0, len(tutors), BATCH_SIZE):
+                with unit_of_work():
+                    for tutor in tutors[start:start + BATCH_SIZE]:
+                        TutorAvailabilityBitmap.rebuild_for_tutor(tutor.id, tutor.timezone or 'UTC')
+                        written += TutorAvailabilityOccurrence.regenerate_for_tutor(tutor.id, tutor.timezone or 'UTC')
+            print(f"✅ Wrote {written} occurrences and rebuilt bitmaps for {len(tutors)} tutors.")
+
+            print("🧹 Deleting ended occurrences...")
+            with unit_of_work():
+                deleted = TutorAvailabilityOccurrence.prune_before(datetime.utcnow() - RETENTION)
+            print(f"✅ Deleted {deleted} ended occurrences.")
+            print("🎉 Refresh completed successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error during refresh: {e}")
+            return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Concurrency Stress Test: Booking creation
+
+This script hammers Booking.create_booking from many threads at once for a
+single tutor and date with overlapping time ranges, then verifies that no
+two active bookings overlap, that no attempt failed with an error (such as
+a lock timeout or deadlock) and that at least one booking succeeded. It
+exits non-zero otherwise. It creates its own fixture tutor and students
+and removes them (with their bookings) when it finishes.
+
+Usage:
+    python scripts/stress_test_bookings.py [--config path/to/config.py]
+                                           [--threads 16] [--attempts 50]
+
+Requirements:
+    - Run this script from the project root directory
+    - Use a development database; the test writes and deletes rows
+"""
+
+import sys
+import os
+import argparse
+import random
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+
+# Add the project root to Python path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from sqlalchemy import and_
+    from sqlalchemy.orm import aliased
+    from db import db, unit_of_work
+    from factory import create_app
+    from models.availability import TutorAvailability, TutorAvailabilityBitmap, TutorAvailabilityOccurrence
+    from models.booking import Booking, BookingStatus, TutorBookingDay
+    from models.student import Student
+    from models.tutor import Tutor
+except ImportError as e:
+    print(f"Error importing required modules: {e}")
+    print("Make sure you're running this script from the project root directory.")
+    sys.exit(1)
+
+
+def create_fixtures(students):
+    """Create a throwaway tutor and students for the test."""
+    run_id = uuid.uuid4().hex[:8]
+    with unit_of_work():
+        tutor = Tutor.create(email=f'stress-tutor-{run_id}@example.com', fullname='Stress Test Tutor',
+                             password=run_id, timezone='UTC', qualification='N/A', experience=0,
+                             subjects_taught=[], bio='')
+        # Bookings are only accepted inside the tutor's availability
+        days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+        TutorAvailability.update_tutor_availability(
+            tutor.id,
+            {day: [{'start_time': '08:00', 'end_time': '20:00', 'is_available': True}] for day in days},
+            'UTC'
+        )
+        student_ids = []
+        for index in range(students):
+            student = Student.create(email=f'stress-student-{run_id}-{index}@example.com',
+                                     fullname=f'Stress Test Student {index}', password=run_id,
+                                     timezone='UTC', dob='2000-01-01', subjects_interested=[])
+            student_ids.append(student.id)
+    return tutor.id, student_ids
+
+
+def worker(app, tutor_id, student_ids, booking_date, attempts, results, lock):
+    """Repeatedly try to book random overlapping half-hour aligned ranges."""
+    counts = {'booked': 0, 'rejected': 0, 'errors': 0}
+    first_error = None
+    rng = random.Random()
+
+    with app.app_context():
+        for _ in range(attempts):
+            start = rng.randrange(8 * 60, 18 * 60, 30)
+            end = start + rng.choice([30, 60, 90])
+            with unit_of_work():
+                booking, error_message = Booking.create_booking(
+                    student_id=rng.choice(student_ids),
+                    tutor_id=tutor_id,
+                    booking_date=booking_date,
+                    start_time_str=f'{start // 60:02d}:{start % 60:02d}',
+                    end_time_str=f'{end // 60:02d}:{end % 60:02d}'
+                )
+            if booking:
+                counts['booked'] += 1
+            elif error_message == "This time slot is already booked.":
+                counts['rejected'] += 1
+            else:
+                counts['errors'] += 1
+                first_error = first_error or error_message
+        db.session.remove()
+
+    with lock:
+        for key, value in counts.items():
+            results[key] += value
+        if first_error and not results['first_error']:
+            results['first_error'] = first_error
+
+
+def count_overlaps(tutor_id, booking_date):
+    """Count pairs of active bookings that overlap."""
+    other = aliased(Booking)
+    active = [BookingStatus.PENDING, BookingStatus.CONFIRMED]
+    return db.session.query(Booking.id, other.id).filter(
+        and_(
+            Booking.tutor_id == tutor_id,
+            other.tutor_id == tutor_id,
+            Booking.booking_date == booking_date,
+            other.booking_date == booking_date,
+            Booking.id < other.id,
+            Booking.status.in_(active),
+            other.status.in_(active),
+            Booking.start_time < other.end_time,
+            Booking.end_time > other.start_time
+        )
+    ).count()
+
+
+def cleanup(tutor_id, student_ids):
+    """Remove the fixture rows created by the test."""
+    Booking.query.filter_by(tutor_id=tutor_id).delete()
+    TutorBookingDay.query.filter_by(tutor_id=tutor_id).delete()
+    TutorAvailabilityOccurrence.query.filter_by(tutor_id=tutor_id).delete()
+    TutorAvailabilityBitmap.query.filter_by(tutor_id=tutor_id).delete()
+    TutorAvailability.query.filter_by(tutor_id=tutor_id).delete()
+    for student in Student.query.filter(Student.id.in_(student_ids)).all():
+        db.session.delete(student)
+    db.session.delete(Tutor.query.get(tutor_id))
+    db.session.commit()
+
+
+def main():
+    """Main stress test function."""
+    parser = argparse.ArgumentParser(description='Concurrent booking stress test')
+    parser.add_argument('--config', help='Path to a config file to load on top of config.py')
+    parser.add_argument('--threads', type=int, default=16, help='Number of concurrent workers')
+    parser.add_argument('--attempts', type=int, default=50, help='Booking attempts per worker')
+    parser.add_argument('--students', type=int, default=8, help='Number of fixture students')
+    args = parser.parse_args()
+
+    print("🚀 TutorConnect Booking Stress Test")
+    print(f"   {args.threads} threads x {args.attempts} attempts on one tutor and date")
+    print("=" * 60)
+
+    app = create_app(args.config)
+    booking_date = date.today() + timedelta(days=2)
+
+    with app.app_context():
+        print("🔧 Creating fixture tutor and students...")
+        tutor_id, student_ids = create_fixtures(args.students)
+
+    results = {'booked': 0, 'rejected': 0, 'errors': 0, 'first_error': None}
+    lock = threading.Lock()
+    threads = [threading.Thread(target=worker,
+                                args=(app, tutor_id, student_ids, booking_date, args.attempts, results, lock))
+               for _ in range(args.threads)]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = args.threads * args.attempts
+    print(f"📊 Attempts: {total} in {elapsed:.2f}s ({total / elapsed:.0f}/s)")
+    print(f"   Booked: {results['booked']}  Rejected: {results['rejected']}  Errors: {results['errors']}")
+
+    with app.app_context():
+        overlaps = count_overlaps(tutor_id, booking_date)
+        print("🧹 Removing fixture rows...")
+        cleanup(tutor_id, student_ids)
+
+    if overlaps:
+        print(f"❌ Found {overlaps} overlapping booking pairs!")
+        return False
+
+    if results['errors']:
+        # Lock timeouts and deadlocks surface here rather than as rejections
+        print(f"❌ {results['errors']} attempts failed with errors, e.g.: {results['first_error']}")
+        return False
+
+    if not results['booked']:
+        print("❌ No attempt succeeded in booking.")
+        return False
+
+    print("✅ No double bookings and no errors found.")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,62 @@
+// Live updates for logged-in students and tutors over Server-Sent Events.
+// Updates unread badges in place and shows a short notification instead of
+// requiring the user to reload the page.
+document.addEventListener('DOMContentLoaded', function() {
+    const script = document.querySelector('script[data-stream-url]');
+    if (!script || !window.EventSource) {
+        return;
+    }
+
+    const source = new EventSource(script.dataset.streamUrl);
+
+    function showNotification(text, href) {
+        const note = document.createElement(href ? 'a' : 'div');
+        if (href) {
+            note.href = href;
+        }
+        note.className = 'fixed bottom-6 right-6 z-50 bg-slate-800 text-white border border-cyan-500 rounded-lg shadow-lg px-4 py-3 text-sm';
+        note.textContent = text;
+        document.body.appendChild(note);
+        setTimeout(() => note.remove(), 6000);
+    }
+
+    function bumpCounters(name) {
+        document.querySelectorAll(`[data-live="${name}"]`).forEach(function(counter) {
+            const value = (parseInt(counter.dataset.count || counter.textContent, 10) || 0) + 1;
+            counter.dataset.count = value;
+            counter.textContent = counter.dataset.suffix ? `${value} ${counter.dataset.suffix}` : value;
+            counter.classList.remove('hidden');
+        });
+    }
+
+    function dispatch(type, data) {
+        document.dispatchEvent(new CustomEvent('live-update', { detail: { type: type, data: data } }));
+    }
+
+    source.addEventListener('message.created', function(event) {
+        const data = JSON.parse(event.data);
+        bumpCounters('unread-messages');
+        showNotification(`New message${data.sender_name ? ' from ' + data.sender_name : ''}: ${data.subject}`,
+                         script.dataset.messagesUrl);
+        dispatch('message.created', data);
+    });
+
+    source.addEventListener('booking.created', function(event) {
+        const data = JSON.parse(event.data);
+        bumpCounters('pending-bookings');
+        showNotification(`New booking request for ${data.booking_date} ${data.start_time}-${data.end_time}`,
+                         script.dataset.bookingsUrl);
+        dispatch('booking.created', data);
+    });
+
+    source.addEventListener('booking.updated', function(event) {
+        const data = JSON.parse(event.data);
+        showNotification(`Booking on ${data.booking_date} ${data.start_time}-${data.end_time} is now ${data.status}`,
+                         script.dataset.bookingsUrl);
+        dispatch('booking.updated', data);
+    });
+
+    window.addEventListener('beforeunload', function() {
+        source.close();
+    });
+});
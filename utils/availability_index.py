@@ -0,0 +1,215 @@
+"""
+In-memory weekly availability index for tutor search.
+
+Tutor availability bitmaps are stored transposed: one integer per 15-minute
+bucket of the week, with one bit per tutor. Finding the tutors free for a
+whole time window is then a bitwise AND of the window's bucket integers,
+without a per-tutor loop or an extra database round trip. Bitmaps written
+by other processes (e.g. the daily rebuild that follows DST changes) are
+picked up by reloading the index once it is AVAILABILITY_INDEX_MAX_AGE
+seconds old.
+"""
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+from models.availability import BUCKETS_PER_WEEK, MINUTES_PER_DAY, week_bucket_mask
+
+# Key used to stage bitmap changes on the SQLAlchemy session until commit
+_PENDING_KEY = 'availability_index_pending'
+
+# Held while a request reloads a stale index, so only one request does it
+_reload_lock = threading.Lock()
+
+_listeners_registered = False
+
+
+class AvailabilityBitmapIndex:
+    """Thread-safe transposed index of weekly tutor availability bitmaps."""
+
+    def __init__(self):
+        self._buckets = [0] * BUCKETS_PER_WEEK  # bucket -> bitset of tutor positions
+        self._positions = {}                    # tutor ID -> bit position
+        self._tutor_ids = []                    # bit position -> tutor ID
+        self._lock = threading.Lock()
+        self.loaded_at = None                   # Monotonic time of the last build
+
+    def build(self, rows):
+        """
+        Rebuild the whole index.
+
+        Each bucket's bits are collected in a byte array and converted to an
+        integer once, so the build is linear in the number of tutors. The new
+        index is built without holding the lock and swapped in at the end.
+
+        Args:
+            rows (iterable): Tuples of (tutor_id, bitmap_mask)
+        """
+        rows = list(rows)
+        positions = {}
+        tutor_ids = []
+        columns = [bytearray((len(rows) + 7) // 8) for _ in range(BUCKETS_PER_WEEK)]
+        for tutor_id, mask in rows:
+            position = positions.setdefault(tutor_id, len(tutor_ids))
+            if position == len(tutor_ids):
+                tutor_ids.append(tutor_id)
+            byte, bit = divmod(position, 8)
+            while mask:
+                lowest = mask & -mask
+                columns[lowest.bit_length() - 1][byte] |= 1 << bit
+                mask ^= lowest
+        buckets = [int.from_bytes(column, 'little') for column in columns]
+
+        with self._lock:
+            self._buckets = buckets
+            self._positions = positions
+            self._tutor_ids = tutor_ids
+            self.loaded_at = time.monotonic()
+
+    def is_stale(self, max_age):
+        """Whether the index was built more than max_age seconds ago."""
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age
+
+    def update_tutor(self, tutor_id, mask):
+        """Replace the availability bitmap for a single tutor."""
+        with self._lock:
+            self._set(tutor_id, mask)
+
+    def _set(self, tutor_id, mask):
+        position = self._positions.get(tutor_id)
+        if position is None:
+            position = len(self._tutor_ids)
+            self._positions[tutor_id] = position
+            self._tutor_ids.append(tutor_id)
+
+        bit = 1 << position
+        buckets = self._buckets
+        for bucket in range(BUCKETS_PER_WEEK):
+            if mask >> bucket & 1:
+                buckets[bucket] |= bit
+            elif buckets[bucket] & bit:
+                buckets[bucket] ^= bit
+
+    def available_tutors(self, day_of_week, start_time, end_time):
+        """
+        Find tutors available for an entire weekly time window in UTC.
+
+        Args:
+            day_of_week (DayOfWeek): Day the window starts on
+            start_time (time): Window start time in UTC
+            end_time (time): Window end time in UTC; an end at or before the
+                start wraps past midnight into the next day
+
+        Returns:
+            set: IDs of tutors available for the whole window
+        """
+        start_minute = day_of_week.value * MINUTES_PER_DAY + start_time.hour * 60 + start_time.minute
+        end_minute = day_of_week.value * MINUTES_PER_DAY + end_time.hour * 60 + end_time.minute
+        if end_minute <= start_minute:
+            end_minute += MINUTES_PER_DAY
+
+        window = week_bucket_mask(start_minute, end_minute, cover=True)
+
+        with self._lock:
+            matches = -1  # All bits set
+            for bucket in range(BUCKETS_PER_WEEK):
+                if window >> bucket & 1:
+                    matches &= self._buckets[bucket]
+                    if not matches:
+                        return set()
+            if matches == -1:
+                return set()
+
+            tutor_ids = set()
+            while matches:
+                lowest = matches & -matches
+                tutor_ids.add(self._tutor_ids[lowest.bit_length() - 1])
+                matches ^= lowest
+            return tutor_ids
+
+
+# Process-wide index used by the views
+availability_index = AvailabilityBitmapIndex()
+
+
+def _stage_bitmap(mapper, connection, target):
+    """Stage a changed bitmap for indexing once the transaction commits."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, {})[target.tutor_id] = target.mask
+
+
+def _stage_bitmap_delete(mapper, connection, target):
+    """Stage a deleted bitmap for removal once the transaction commits."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, {})[target.tutor_id] = 0
+
+
+def _apply_pending(session):
+    """Apply staged bitmap changes after a successful commit."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for tutor_id, mask in pending.items():
+        availability_index.update_tutor(tutor_id, mask)
+
+
+def _discard_pending(session, *args):
+    """Drop staged bitmap changes when the transaction is rolled back."""
+    session.info.pop(_PENDING_KEY, None)
+
+
+def load_availability_index():
+    """Rebuild the index from the stored bitmaps. Needs an app context."""
+    from models.availability import TutorAvailabilityBitmap
+
+    records = TutorAvailabilityBitmap.query.all()
+    availability_index.build((record.tutor_id, record.mask) for record in records)
+    return len(records)
+
+
+def reload_if_stale():
+    """
+    Reload the index if it is older than AVAILABILITY_INDEX_MAX_AGE.
+
+    Only one request reloads at a time; the others keep using the current
+    index until the new one is swapped in.
+    """
+    from flask import current_app
+
+    max_age = current_app.config.get('AVAILABILITY_INDEX_MAX_AGE', 3600)
+    if not availability_index.is_stale(max_age) or not _reload_lock.acquire(blocking=False):
+        return
+    try:
+        if availability_index.is_stale(max_age):
+            load_availability_index()
+    finally:
+        _reload_lock.release()
+
+
+def init_availability_index(app):
+    """
+    Build the availability index and keep it current with bitmap changes.
+
+    Args:
+        app (Flask): The Flask application
+    """
+    global _listeners_registered
+    from db import db
+    from models.availability import TutorAvailabilityBitmap
+
+    with app.app_context():
+        count = load_availability_index()
+        db.session.remove()
+        app.logger.info(f"Availability index built with {count} tutors")
+
+    if not _listeners_registered:
+        event.listen(TutorAvailabilityBitmap, 'after_insert', _stage_bitmap)
+        event.listen(TutorAvailabilityBitmap, 'after_update', _stage_bitmap)
+        event.listen(TutorAvailabilityBitmap, 'after_delete', _stage_bitmap_delete)
+        event.listen(db.session, 'after_commit', _apply_pending)
+        event.listen(db.session, 'after_rollback', _discard_pending)
+        _listeners_registered = True
@@ -0,0 +1,264 @@
+"""
+In-process publish/subscribe for live updates pushed over Server-Sent Events.
+
+Models publish events to per-user channels (e.g. 'tutor:12') and the SSE
+endpoint subscribes the connected user to their channel. Events published
+inside a database transaction are delivered only after it commits.
+
+Delivery to other worker processes goes through a pluggable backend:
+'local' delivers within this process only, 'sqlite' relays events through
+a shared SQLite file that every worker polls. A custom backend can be
+configured as 'package.module:ClassName'.
+"""
+import importlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import event
+
+# Key used to stage events on the SQLAlchemy session until commit
+_PENDING_KEY = 'events_pending'
+
+_listeners_registered = False
+
+
+def user_channel(role, user_id):
+    """
+    Get the channel name for a user.
+
+    Args:
+        role (str): 'student' or 'tutor'
+        user_id (int): The user's ID
+
+    Returns:
+        str: The channel name
+    """
+    return f'{role}:{user_id}'
+
+
+class EventBroker:
+    """Thread-safe fan-out of events to subscriber queues in this process."""
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self._subscribers = {}  # channel -> set of queues
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        """
+        Subscribe to a channel.
+
+        Args:
+            channel (str): The channel name
+
+        Returns:
+            queue.Queue: Queue receiving (event_type, data) tuples
+        """
+        subscriber = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, channel, subscriber):
+        """Remove a queue returned by subscribe."""
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def deliver(self, channel, event_type, data):
+        """Hand an event to every local subscriber of a channel."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait((event_type, data))
+            except queue.Full:
+                # Slow client; drop the event rather than block the publisher
+                pass
+
+
+class LocalBackend:
+    """Delivers events to subscribers in the current process only."""
+
+    def __init__(self, app):
+        pass
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, channel, event_type, data):
+        self._deliver(channel, event_type, data)
+
+
+class SQLiteBackend:
+    """
+    Relays events between worker processes through a shared SQLite file.
+
+    Publishers append rows; each process runs one background thread that
+    polls for new rows and delivers them to its local subscribers.
+    """
+
+    def __init__(self, app):
+        self.path = app.config.get('EVENTS_SQLITE_PATH', 'events.sqlite3')
+        self.poll_interval = app.config.get('EVENTS_POLL_INTERVAL', 0.25)
+        self.retention = app.config.get('EVENTS_RETENTION', 300)
+        self._thread = None
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS events ('
+                         'id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, '
+                         'event_type TEXT NOT NULL, payload TEXT NOT NULL, created_at REAL NOT NULL)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, channel, event_type, data):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('INSERT INTO events (channel, event_type, payload, created_at) VALUES (?, ?, ?, ?)',
+                         (channel, event_type, json.dumps(data), now))
+            conn.execute('DELETE FROM events WHERE created_at < ?', (now - self.retention,))
+
+    def ensure_polling(self):
+        """Start the polling thread the first time this process has a subscriber."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll, name='events-sqlite-poller', daemon=True)
+                self._thread.start()
+
+    def _poll(self):
+        conn = self._connect()
+        last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0]
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                rows = conn.execute('SELECT id, channel, event_type, payload FROM events WHERE id > ? ORDER BY id',
+                                    (last_id,)).fetchall()
+            except sqlite3.Error:
+                continue
+            for row_id, channel, event_type, payload in rows:
+                last_id = row_id
+                self._deliver(channel, event_type, json.loads(payload))
+
+
+BACKENDS = {
+    'local': LocalBackend,
+    'sqlite': SQLiteBackend,
+}
+
+
+class EventBus:
+    """Publishes events through the configured backend to local subscribers."""
+
+    def __init__(self):
+        self.broker = EventBroker()
+        self.backend = None
+        self._stream_slots = None
+
+    def configure(self, backend, max_streams=None):
+        self.backend = backend
+        self._stream_slots = threading.BoundedSemaphore(max_streams) if max_streams else None
+        backend.start(self.broker.deliver)
+
+    def open_stream(self):
+        """
+        Reserve one of this process's stream slots.
+
+        Returns:
+            bool: False if max_streams streams are already open
+        """
+        if self._stream_slots is None:
+            return True
+        return self._stream_slots.acquire(blocking=False)
+
+    def close_stream(self):
+        """Release a slot reserved by open_stream."""
+        if self._stream_slots is not None:
+            self._stream_slots.release()
+
+    def publish(self, channel, event_type, data):
+        """Publish an event immediately."""
+        if self.backend is None:
+            return
+        self.backend.publish(channel, event_type, data)
+
+    def subscribe(self, channel):
+        """Subscribe to a channel; see EventBroker.subscribe."""
+        if hasattr(self.backend, 'ensure_polling'):
+            self.backend.ensure_polling()
+        return self.broker.subscribe(channel)
+
+    def unsubscribe(self, channel, subscriber):
+        self.broker.unsubscribe(channel, subscriber)
+
+
+# Process-wide event bus used by models and views
+event_bus = EventBus()
+
+
+def publish_after_commit(channel, event_type, data):
+    """
+    Publish an event once the current database transaction commits.
+
+    Args:
+        channel (str): The channel name (see user_channel)
+        event_type (str): Event name, e.g. 'message.created'
+        data (dict): JSON-serializable event payload
+    """
+    from db import db
+    db.session.info.setdefault(_PENDING_KEY, []).append((channel, event_type, data))
+
+
+def _publish_pending(session):
+    """Publish staged events after a successful commit."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for channel, event_type, data in pending:
+        try:
+            event_bus.publish(channel, event_type, data)
+        except Exception:
+            # Live updates are best effort and must never fail a request
+            pass
+
+
+def _discard_pending(session, *args):
+    """Drop staged events when the transaction is rolled back."""
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _load_backend(name):
+    if name in BACKENDS:
+        return BACKENDS[name]
+    module_name, _, class_name = name.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def init_events(app):
+    """
+    Configure the event bus backend and publish staged events on commit.
+
+    Args:
+        app (Flask): The Flask application
+    """
+    global _listeners_registered
+    from db import db
+
+    backend_class = _load_backend(app.config.get('EVENTS_BACKEND', 'local'))
+    event_bus.configure(backend_class(app), max_streams=app.config.get('EVENTS_MAX_STREAMS', 20))
+
+    if not _listeners_registered:
+        event.listen(db.session, 'after_commit', _publish_pending)
+        event.listen(db.session, 'after_rollback', _discard_pending)
+        _listeners_registered = True
@@ -0,0 +1,107 @@
+"""
+Shared outbound HTTP client for TutorConnect application.
+
+One requests Session is reused for calls to external services (OAuth
+providers) so connections are kept alive and pooled across requests. Every
+call gets a connect and read timeout, and failed connections are retried
+within a small budget so a slow or unreachable provider cannot hold a
+worker indefinitely.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request."""
+
+    def __init__(self, timeout, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def build_session(connect_timeout=3.05, read_timeout=10, retries=2, pool_size=10):
+    """
+    Build a pooled session with timeouts and a retry budget.
+
+    Connection failures are retried for every method since the request never
+    reached the server. Read errors and 502/503/504 responses are retried for
+    idempotent methods only, so a POST such as an authorization code exchange
+    is never sent twice.
+
+    Args:
+        connect_timeout (float): Seconds to wait for a connection
+        read_timeout (float): Seconds to wait between bytes of the response
+        retries (int): Retries allowed per request
+        pool_size (int): Connections kept alive per host
+
+    Returns:
+        requests.Session: The configured session
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False
+    )
+    adapter = TimeoutHTTPAdapter(
+        timeout=(connect_timeout, read_timeout),
+        max_retries=retry,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class HTTPClient:
+    """Holds the process-wide session once the app has configured it."""
+
+    def __init__(self):
+        self.session = None
+
+    def configure(self, session):
+        if self.session is not None:
+            self.session.close()
+        self.session = session
+
+    def get(self, url, **kwargs):
+        return self._session().get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._session().post(url, **kwargs)
+
+    def _session(self):
+        if self.session is None:
+            # Used outside the app (e.g. scripts); fall back to the defaults
+            self.session = build_session()
+        return self.session
+
+
+# Process-wide client used for calls to external services
+http_client = HTTPClient()
+
+
+def init_http_client(app):
+    """
+    Configure the shared HTTP client from the app config.
+
+    Args:
+        app (Flask): The Flask application
+    """
+    http_client.configure(build_session(
+        connect_timeout=app.config.get('HTTP_CONNECT_TIMEOUT', 3.05),
+        read_timeout=app.config.get('HTTP_READ_TIMEOUT', 10),
+        retries=app.config.get('HTTP_RETRIES', 2),
+        pool_size=app.config.get('HTTP_POOL_SIZE', 10)
+    ))
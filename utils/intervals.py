@@ -0,0 +1,150 @@
+"""
+Half-open interval helpers for the TutorConnect application.
+
+Intervals are (start, end) tuples of any comparable values (minutes, times
+or datetimes) and are treated as half-open, so [09:00, 10:00) and
+[10:00, 11:00) touch without overlapping.
+"""
+from bisect import bisect_left
+
+
+def merge_intervals(intervals):
+    """
+    Sort intervals and merge the ones that overlap or touch.
+
+    Args:
+        intervals (iterable): (start, end) tuples; empty intervals are dropped
+
+    Returns:
+        list: Sorted, non-overlapping (start, end) tuples
+    """
+    merged = []
+    for start, end in sorted(interval for interval in intervals if interval[0] < interval[1]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(intervals, removals):
+    """
+    Remove one set of intervals from another with a single sorted sweep.
+
+    Args:
+        intervals (iterable): (start, end) tuples to keep
+        removals (iterable): (start, end) tuples to cut out
+
+    Returns:
+        list: Sorted, non-overlapping (start, end) tuples of what remains
+    """
+    removals = merge_intervals(removals)
+    result = []
+    index = 0
+
+    for start, end in merge_intervals(intervals):
+        # Skip removals that end before this interval starts
+        while index < len(removals) and removals[index][1] <= start:
+            index += 1
+
+        cursor = start
+        position = index
+        while position < len(removals) and removals[position][0] < end:
+            removal_start, removal_end = removals[position]
+            if removal_start > cursor:
+                result.append((cursor, removal_start))
+            cursor = max(cursor, removal_end)
+            if cursor >= end:
+                break
+            position += 1
+
+        if cursor < end:
+            result.append((cursor, end))
+
+    return result
+
+
+class IntervalIndex:
+    """
+    Static index of labelled intervals for fast overlap checks.
+
+    Intervals are sorted by start with a running maximum of their ends and
+    the position of the interval that reaches it. The intervals starting
+    before a query ends are found with a binary search, and the interval
+    with the latest end among them overlaps the query if any of them does,
+    so each check is O(log n).
+    """
+
+    def __init__(self, intervals):
+        """
+        Build the index.
+
+        Args:
+            intervals (iterable): (start, end, value) tuples; value is
+                returned when the interval is found to overlap a query
+        """
+        self._items = sorted((item for item in intervals if item[0] < item[1]), key=lambda item: item[:2])
+        self._starts = [item[0] for item in self._items]
+        self._max_ends = []
+        self._max_positions = []
+        for position, item in enumerate(self._items):
+            if self._max_ends and self._max_ends[-1] >= item[1]:
+                self._max_ends.append(self._max_ends[-1])
+                self._max_positions.append(self._max_positions[-1])
+            else:
+                self._max_ends.append(item[1])
+                self._max_positions.append(position)
+
+    def __len__(self):
+        return len(self._items)
+
+    def find_overlap(self, start, end):
+        """
+        Find an interval overlapping a range.
+
+        Args:
+            start: Range start
+            end: Range end
+
+        Returns:
+            The value of an overlapping interval, or None
+        """
+        position = bisect_left(self._starts, end)
+        if position == 0 or self._max_ends[position - 1] <= start:
+            return None
+        # The interval with the latest end is still open at start
+        return self._items[self._max_positions[position - 1]][2]
+
+    def find_conflicts(self, candidates):
+        """
+        Check many proposed intervals against the index and each other.
+
+        Candidates are taken in order, and each one that is accepted blocks
+        the later candidates that overlap it.
+
+        Args:
+            candidates (iterable): (start, end, value) tuples
+
+        Returns:
+            list: For each candidate, the value of the indexed interval or
+                earlier accepted candidate it overlaps, or None if accepted
+        """
+        # Accepted candidates are kept sorted and never overlap each other,
+        # so a new candidate can only clash with its neighbours
+        accepted_starts = []
+        accepted = []
+        conflicts = []
+        for start, end, value in candidates:
+            conflict = self.find_overlap(start, end)
+            position = bisect_left(accepted_starts, start)
+            if conflict is None:
+                for neighbour in accepted[max(position - 1, 0):position + 1]:
+                    if neighbour[0] < end and neighbour[1] > start:
+                        conflict = neighbour[2]
+                        break
+            if conflict is None:
+                accepted_starts.insert(position, start)
+                accepted.insert(position, (start, end, value))
+            conflicts.append(conflict)
+        return conflicts
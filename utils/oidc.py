@@ -0,0 +1,274 @@
+"""
+OpenID Connect helpers for the Google and Microsoft sign-in flows.
+
+The authorization code is exchanged for tokens over the shared HTTP client
+and the ID token in the response is validated locally against the
+provider's signing keys (JWKS). The keys are cached, so the user's email
+and name usually come from the token without a separate userinfo request.
+Provider endpoints come from the app config and can point at a local mock
+provider in development.
+
+An email is only reported as verified when the provider says so in an
+email_verified claim. Microsoft never sends that claim and lets each
+tenant set its users' emails, so Microsoft emails are only trusted from
+tenants listed in MICROSOFT_ALLOWED_TENANTS.
+"""
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlencode
+
+import jwt
+from flask import current_app
+
+from utils.http_client import http_client
+
+# Config key prefix for each supported provider
+PROVIDERS = {
+    'google': 'GOOGLE',
+    'microsoft': 'MICROSOFT',
+}
+
+# Accepted ID token signing algorithms
+ALGORITHMS = ['RS256']
+
+# A signed-in user as reported by a provider. subject is the provider's
+# stable user ID; email_verified tells whether email can be used to find
+# an existing account.
+Identity = namedtuple('Identity', ['subject', 'email', 'email_verified', 'name'])
+
+
+class OIDCError(Exception):
+    """Raised when a provider response or ID token cannot be trusted."""
+
+
+class JWKSCache:
+    """Caches providers' JSON Web Key Sets by URL."""
+
+    # Seconds between refetches triggered by an unknown key ID
+    MIN_REFRESH_INTERVAL = 60
+
+    def __init__(self):
+        self._sets = {}  # url -> (PyJWKSet, fetched_at)
+        self._lock = threading.Lock()
+
+    def get_key(self, url, kid, ttl):
+        """
+        Get the signing key with the given key ID.
+
+        The set is refetched when it is older than ttl, or when the key ID is
+        unknown (the provider rotated its keys) and the set was not fetched
+        in the last MIN_REFRESH_INTERVAL seconds.
+
+        Args:
+            url (str): The provider's JWKS URL
+            kid (str): Key ID from the token header
+            ttl (float): Seconds a fetched key set stays fresh
+
+        Returns:
+            PyJWK: The signing key
+
+        Raises:
+            OIDCError: If no key with that ID is published
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._sets.get(url)
+        if cached is not None:
+            key_set, fetched_at = cached
+            key = self._find(key_set, kid)
+            if key is not None and now - fetched_at < ttl:
+                return key
+            if key is None and now - fetched_at < self.MIN_REFRESH_INTERVAL:
+                raise OIDCError(f'Unknown signing key {kid}')
+
+        key_set = self._fetch(url)
+        with self._lock:
+            self._sets[url] = (key_set, now)
+        key = self._find(key_set, kid)
+        if key is None:
+            raise OIDCError(f'Unknown signing key {kid}')
+        return key
+
+    def clear(self):
+        with self._lock:
+            self._sets.clear()
+
+    @staticmethod
+    def _fetch(url):
+        response = http_client.get(url)
+        response.raise_for_status()
+        return jwt.PyJWKSet.from_dict(response.json())
+
+    @staticmethod
+    def _find(key_set, kid):
+        for key in key_set.keys:
+            if key.key_id == kid:
+                return key
+        return None
+
+
+# Process-wide key cache shared by all providers
+jwks_cache = JWKSCache()
+
+
+class OIDCProvider:
+    """Endpoints and credentials of one OpenID Connect provider."""
+
+    def __init__(self, name, config):
+        prefix = PROVIDERS[name]
+        self.name = name
+        self.client_id = config.get(f'{prefix}_CLIENT_ID')
+        self.client_secret = config.get(f'{prefix}_CLIENT_SECRET')
+        self.authorize_url = config[f'{prefix}_AUTHORIZE_URL']
+        self.token_url = config[f'{prefix}_TOKEN_URL']
+        self.jwks_url = config[f'{prefix}_JWKS_URL']
+        self.issuer = config[f'{prefix}_ISSUER']
+        self.userinfo_url = config.get(f'{prefix}_USERINFO_URL')
+        self.allowed_tenants = [tenant for tenant in config.get(f'{prefix}_ALLOWED_TENANTS') or [] if tenant]
+        self.jwks_ttl = config.get('OAUTH_JWKS_TTL', 3600)
+
+    @property
+    def is_configured(self):
+        return bool(self.client_id)
+
+    def authorization_url(self, redirect_uri, state, nonce):
+        """Build the URL that starts the sign-in at the provider."""
+        params = {
+            'client_id': self.client_id,
+            'redirect_uri': redirect_uri,
+            'scope': 'openid email profile',
+            'response_type': 'code',
+            'state': state,
+            'nonce': nonce
+        }
+        return f"{self.authorize_url}?{urlencode(params)}"
+
+    def exchange_code(self, code, redirect_uri):
+        """
+        Exchange an authorization code for tokens.
+
+        Returns:
+            dict: The token response
+
+        Raises:
+            requests.RequestException: If the provider cannot be reached
+        """
+        response = http_client.post(self.token_url, data={
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'code': code,
+            'grant_type': 'authorization_code',
+            'redirect_uri': redirect_uri
+        })
+        response.raise_for_status()
+        return response.json()
+
+    def validate_id_token(self, id_token, nonce):
+        """
+        Validate an ID token's signature and claims.
+
+        Args:
+            id_token (str): The encoded ID token
+            nonce (str): The nonce sent with the authorization request
+
+        Returns:
+            dict: The token claims
+
+        Raises:
+            OIDCError: If the token is invalid
+        """
+        try:
+            header = jwt.get_unverified_header(id_token)
+            key = jwks_cache.get_key(self.jwks_url, header.get('kid'), self.jwks_ttl)
+            claims = jwt.decode(
+                id_token,
+                key,
+                algorithms=ALGORITHMS,
+                audience=self.client_id,
+                leeway=60,
+                options={'verify_iss': False, 'require': ['iss', 'aud', 'exp', 'iat', 'sub']}
+            )
+        except jwt.PyJWTError as e:
+            raise OIDCError(f'Invalid ID token: {e}')
+
+        # Multi-tenant issuers (Microsoft 'common') embed the tenant ID
+        issuers = [self.issuer] if isinstance(self.issuer, str) else self.issuer
+        if claims['iss'] not in [issuer.format(tenantid=claims.get('tid', '')) for issuer in issuers]:
+            raise OIDCError(f"Unexpected ID token issuer {claims['iss']}")
+        if claims.get('nonce') != nonce:
+            raise OIDCError('ID token nonce does not match')
+        if self.allowed_tenants and claims.get('tid') not in self.allowed_tenants:
+            raise OIDCError(f"ID token tenant {claims.get('tid')} is not allowed")
+        return claims
+
+    def _email_trusted(self, email_verified, claims):
+        """Whether an email can be trusted given its email_verified flag."""
+        if email_verified is True or email_verified == 'true':
+            return True
+        # Tenant-managed emails are trusted only from allow-listed tenants
+        return bool(self.allowed_tenants) and claims.get('tid') in self.allowed_tenants
+
+    @staticmethod
+    def _subject(claims):
+        """Get the stable user ID; 'sub' is unique within a tenant's issuer."""
+        if claims.get('tid'):
+            return f"{claims['tid']}:{claims['sub']}"
+        return claims['sub']
+
+    def fetch_userinfo(self, access_token):
+        """Get the user's profile from the provider's userinfo endpoint."""
+        response = http_client.get(self.userinfo_url, headers={'Authorization': f'Bearer {access_token}'})
+        response.raise_for_status()
+        return response.json()
+
+    def get_identity(self, code, redirect_uri, nonce):
+        """
+        Complete a sign-in and identify the user.
+
+        The identity comes from the validated ID token. The userinfo endpoint
+        is only called when the token carries no email.
+
+        Args:
+            code (str): The authorization code from the callback
+            redirect_uri (str): The redirect URI used to start the sign-in
+            nonce (str): The nonce sent with the authorization request
+
+        Returns:
+            Identity: The user; email is None if the provider sent none
+
+        Raises:
+            OIDCError: If the provider response cannot be trusted
+            requests.RequestException: If the provider cannot be reached
+        """
+        tokens = self.exchange_code(code, redirect_uri)
+        id_token = tokens.get('id_token')
+        if not id_token:
+            raise OIDCError('No ID token received')
+
+        claims = self.validate_id_token(id_token, nonce)
+        email = claims.get('email')
+        email_verified = self._email_trusted(claims.get('email_verified', False), claims)
+        name = claims.get('name')
+
+        if not email and self.userinfo_url and tokens.get('access_token'):
+            current_app.logger.info(f"{self.name} ID token has no email; calling userinfo")
+            userinfo = self.fetch_userinfo(tokens['access_token'])
+            email = userinfo.get('email') or userinfo.get('mail') or userinfo.get('userPrincipalName')
+            email_verified = self._email_trusted(userinfo.get('email_verified', False), claims)
+            name = name or userinfo.get('name') or userinfo.get('displayName')
+
+        return Identity(self._subject(claims), email, email_verified, name)
+
+
+def get_provider(name):
+    """
+    Get a provider configured from the current app.
+
+    Args:
+        name (str): 'google' or 'microsoft'
+
+    Returns:
+        OIDCProvider: The provider
+    """
+    return OIDCProvider(name, current_app.config)
@@ -0,0 +1,184 @@
+"""
+Keyset (cursor) pagination utilities for the TutorConnect application.
+
+Keyset pagination filters on the sort key of the last row shown instead of
+using OFFSET, so fetching a deep page costs the same as fetching the first.
+"""
+import base64
+import datetime
+import json
+
+from sqlalchemy import and_, or_, false
+
+
+def _serialize(value):
+    """Convert a sort key value into a JSON-compatible value."""
+    if isinstance(value, datetime.datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'d': value.isoformat()}
+    return value
+
+
+def _deserialize(value):
+    """Reverse _serialize for a single value."""
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return datetime.date.fromisoformat(value['d'])
+        raise ValueError('Unknown cursor value')
+    return value
+
+
+def encode_cursor(values):
+    """
+    Encode a row's sort key values into an opaque URL-safe cursor.
+
+    Args:
+        values (list): Sort key values of a row
+
+    Returns:
+        str: The encoded cursor
+    """
+    payload = json.dumps([_serialize(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor (str): The encoded cursor
+
+    Returns:
+        list or None: The sort key values, or None if the cursor is invalid
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(values, list):
+            return None
+        return [_deserialize(value) for value in values]
+    except (ValueError, TypeError):
+        return None
+
+
+def _before(column, value):
+    """Rows sorting after value in descending order (NULLs sort lowest, as in MySQL)."""
+    if value is None:
+        return false()
+    return or_(column < value, column.is_(None))
+
+
+def _after(column, value):
+    """Rows sorting before value in descending order (NULLs sort lowest, as in MySQL)."""
+    if value is None:
+        return column.isnot(None)
+    return column > value
+
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _keyset_predicate(columns, values, compare):
+    """Build (c1, c2, ...) <op> (v1, v2, ...) as an OR of column prefixes."""
+    clauses = []
+    for index, (column, value) in enumerate(zip(columns, values)):
+        prefix = [_equal(c, v) for c, v in zip(columns[:index], values[:index])]
+        clauses.append(and_(*prefix, compare(column, value)))
+    return or_(*clauses)
+
+
+class KeysetPage:
+    """A single page of keyset-paginated results."""
+
+    def __init__(self, items, next_cursor=None, prev_cursor=None, per_page=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.per_page = per_page
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def _scan(query, columns, order, compare, limit, keep, batch_size):
+    """
+    Fetch rows in sort order, batch by batch, until limit of them pass keep.
+    """
+    rows = []
+    batch_query = query
+    while len(rows) < limit:
+        batch = batch_query.order_by(*order).limit(batch_size).all()
+        rows.extend(row for row in batch if keep(row))
+        if len(batch) < batch_size:
+            break
+        last = [getattr(batch[-1], column.key) for column in columns]
+        batch_query = query.filter(_keyset_predicate(columns, last, compare))
+    return rows[:limit]
+
+
+def keyset_paginate(query, columns, per_page, after=None, before=None, keep=None, batch_size=200):
+    """
+    Fetch one page of a query ordered descending by the given columns.
+
+    The last column must be unique (usually the primary key) so that every
+    row has a distinct position.
+
+    Args:
+        query (Query): The filtered query to paginate
+        columns (list): Sort columns, all ordered descending
+        per_page (int): Maximum number of rows per page
+        after (str, optional): Cursor of the last row of the previous page
+        before (str, optional): Cursor of the first row of the next page
+        keep (callable, optional): Filter applied to rows in Python, for
+            conditions too large to send as SQL (e.g. a long ID list); rows
+            are then scanned in batches of batch_size until the page is full
+        batch_size (int): Rows fetched per batch when keep is given
+
+    Returns:
+        KeysetPage: The requested page
+    """
+    before_values = decode_cursor(before)
+    after_values = None if before_values else decode_cursor(after)
+    values = before_values or after_values
+    if values is not None and len(values) != len(columns):
+        values = before_values = after_values = None
+
+    reverse = before_values is not None
+    if values is not None:
+        query = query.filter(_keyset_predicate(columns, values, _after if reverse else _before))
+
+    order = [column.asc() if reverse else column.desc() for column in columns]
+    if keep is None:
+        rows = query.order_by(*order).limit(per_page + 1).all()
+    else:
+        rows = _scan(query, columns, order, _after if reverse else _before, per_page + 1, keep, batch_size)
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if reverse:
+        rows.reverse()
+
+    def cursor_for(row):
+        return encode_cursor([getattr(row, column.key) for column in columns])
+
+    has_next = True if reverse else has_more
+    has_prev = has_more if reverse else values is not None
+
+    return KeysetPage(
+        items=rows,
+        next_cursor=cursor_for(rows[-1]) if has_next and rows else None,
+        prev_cursor=cursor_for(rows[0]) if has_prev and rows else None,
+        per_page=per_page
+    )
@@ -0,0 +1,144 @@
+"""
+Password hashing for TutorConnect application.
+
+Passwords are hashed with the werkzeug method configured in
+PASSWORD_HASH_METHOD (e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:1000000').
+Stored hashes made with any other method or cost are reported by
+needs_rehash so they can be upgraded the next time the user logs in.
+
+Hashing and verification run on a small bounded thread pool, so a burst of
+logins occupies at most PASSWORD_HASH_WORKERS cores with key stretching.
+The request thread still blocks until its hash is done: the pool caps the
+CPU spent on hashing, and the queue limit and timeout cap how many request
+threads can be waiting on it, but it does not free those threads.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when no hashing worker became free within the timeout."""
+
+
+class PasswordHasher:
+    """Runs password hashing on a bounded pool of worker threads."""
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self.timeout = None
+
+    def configure(self, workers, queue_size, timeout):
+        """
+        Start the worker pool.
+
+        Args:
+            workers (int): Hashes computed concurrently
+            queue_size (int): Further requests allowed to wait for a worker
+            timeout (float): Seconds a request waits to be admitted
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self.timeout = timeout
+
+    def run(self, func, *args):
+        """
+        Run a hashing function on the pool and wait for its result.
+
+        The calling thread blocks until the hash is computed. Without a
+        configured pool (e.g. in scripts) the function runs inline.
+
+        Raises:
+            PasswordHashingBusy: If the pool and its queue stay full for the
+                whole timeout
+        """
+        if self._executor is None:
+            return func(*args)
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PasswordHashingBusy()
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+
+# Process-wide hasher used by the user models
+password_hasher = PasswordHasher()
+
+
+def _configured_method():
+    if has_app_context():
+        return current_app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+    return DEFAULT_METHOD
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method):
+    """Get the method string werkzeug writes in front of hashes for a method."""
+    return generate_password_hash('', method).split('$', 1)[0]
+
+
+def hash_password(password):
+    """
+    Hash a password with the configured method.
+
+    Args:
+        password (str): The plain text password
+
+    Returns:
+        str: The werkzeug formatted hash
+    """
+    return password_hasher.run(generate_password_hash, password, _configured_method())
+
+
+def check_password(pwhash, password):
+    """
+    Check a password against a stored hash.
+
+    Args:
+        pwhash (str): The stored hash
+        password (str): The plain text password
+
+    Returns:
+        bool: True if the password matches
+    """
+    return password_hasher.run(check_password_hash, pwhash, password)
+
+
+def needs_rehash(pwhash):
+    """
+    Check whether a stored hash was made with a different method or cost
+    than the one configured.
+
+    Args:
+        pwhash (str): The stored hash
+
+    Returns:
+        bool: True if the hash should be replaced
+    """
+    return pwhash.split('$', 1)[0] != _method_prefix(_configured_method())
+
+
+def init_password_hashing(app):
+    """
+    Start the password hashing worker pool.
+
+    Args:
+        app (Flask): The Flask application
+    """
+    password_hasher.configure(
+        workers=app.config.get('PASSWORD_HASH_WORKERS', 4),
+        queue_size=app.config.get('PASSWORD_HASH_QUEUE', 32),
+        timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 5)
+    )
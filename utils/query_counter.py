@@ -0,0 +1,104 @@
+"""
+Request-scoped SQL statement counter for spotting N+1 query patterns.
+
+When enabled, every statement executed while handling a request is counted
+by its shape (the SQL text with literals and IN-list lengths normalized).
+At the end of the request any shape executed more often than the configured
+threshold is logged as a warning, which usually points at a relationship
+being lazy loaded once per row of a list.
+"""
+import re
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+_registered_engines = set()
+
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))+\s*\)')
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_WHITESPACE = re.compile(r'\s+')
+
+
+def statement_shape(statement):
+    """
+    Normalize a SQL statement so that executions differing only in bound
+    values or IN-list lengths share the same shape.
+
+    Args:
+        statement (str): SQL statement as sent to the database
+
+    Returns:
+        str: The normalized statement
+    """
+    shape = _STRING.sub('?', statement)
+    shape = _NUMBER.sub('N', shape)
+    shape = _PLACEHOLDER_LIST.sub('(?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+def get_query_stats():
+    """
+    Get the statement counts for the current request.
+
+    Returns:
+        Counter or None: Executions per statement shape, or None when the
+            counter is disabled or there is no active request
+    """
+    if not has_request_context():
+        return None
+    return g.get('query_shapes')
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    """Count a statement against the current request."""
+    if not has_request_context():
+        return
+    shapes = g.get('query_shapes')
+    if shapes is not None:
+        shapes[statement_shape(statement)] += 1
+
+
+def init_query_counter(app):
+    """
+    Enable the request-scoped query counter if configured.
+
+    The counter is on when QUERY_COUNTER_ENABLED is set, and by default in
+    debug and testing mode.
+
+    Args:
+        app (Flask): The Flask application
+    """
+    from db import db
+
+    enabled = app.config.get('QUERY_COUNTER_ENABLED')
+    if enabled is None:
+        enabled = app.debug or app.testing
+    if not enabled:
+        return
+
+    threshold = app.config.get('QUERY_COUNTER_REPEAT_THRESHOLD', 3)
+
+    with app.app_context():
+        engine = db.engine
+    if id(engine) not in _registered_engines:
+        event.listen(engine, 'before_cursor_execute', _count_statement)
+        _registered_engines.add(id(engine))
+
+    @app.before_request
+    def start_query_counter():
+        g.query_shapes = Counter()
+
+    @app.after_request
+    def report_repeated_queries(response):
+        shapes = g.get('query_shapes')
+        if shapes:
+            for shape, count in shapes.most_common():
+                if count <= threshold:
+                    break
+                app.logger.warning(
+                    f"Possible N+1 query: {count} executions in {request.method} {request.path} "
+                    f"of: {shape[:300]}"
+                )
+        return response
@@ -0,0 +1,241 @@
+"""
+Sliding-window rate limiting for login and password reset requests.
+
+Each attempt is recorded under a key (the action plus the client IP or the
+email address) and rejected when the key already has the configured number
+of attempts inside the window. For logins only failed attempts count
+against the email key, so nobody can lock a user out by signing in as
+them. The client IP is request.remote_addr; behind a reverse proxy set
+TRUSTED_PROXY_HOPS so it is taken from X-Forwarded-For.
+
+Attempts are stored in a pluggable backend: 'memory' counts within this
+process only, 'sqlite' shares counts between worker processes through a
+local SQLite file. A custom store can be configured as
+'package.module:ClassName' and implements hit() and check().
+"""
+import importlib
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from flask import current_app, request
+
+
+def _longest_window(app):
+    """Get the longest configured window, after which attempts can be discarded."""
+    windows = [window for _, window in app.config.get('RATE_LIMITS', {}).values()]
+    return max(windows, default=3600)
+
+
+class MemoryStore:
+    """Keeps attempt timestamps per key in this process."""
+
+    # Hits between sweeps of keys whose attempts have all expired
+    SWEEP_INTERVAL = 1000
+
+    def __init__(self, app):
+        self.retention = _longest_window(app)
+        self._hits = {}  # key -> deque of timestamps, oldest first
+        self._lock = threading.Lock()
+        self._since_sweep = 0
+
+    def hit(self, key, limit, window, now):
+        with self._lock:
+            self._since_sweep += 1
+            if self._since_sweep >= self.SWEEP_INTERVAL:
+                self._sweep(now)
+
+            attempts = self._hits.setdefault(key, deque())
+            while attempts and attempts[0] <= now - window:
+                attempts.popleft()
+            if len(attempts) >= limit:
+                return attempts[0] + window - now
+            attempts.append(now)
+            return 0
+
+    def check(self, key, limit, window, now):
+        with self._lock:
+            attempts = [hit for hit in self._hits.get(key, ()) if hit > now - window]
+            if len(attempts) >= limit:
+                return attempts[0] + window - now
+            return 0
+
+    def _sweep(self, now):
+        self._since_sweep = 0
+        for key in [key for key, attempts in self._hits.items() if not attempts or attempts[-1] <= now - self.retention]:
+            del self._hits[key]
+
+
+class SQLiteStore:
+    """Shares attempt timestamps between worker processes through a SQLite file."""
+
+    def __init__(self, app):
+        self.path = app.config.get('RATE_LIMIT_SQLITE_PATH', 'rate_limit.sqlite3')
+        self.retention = _longest_window(app)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS rate_limit_hits (key TEXT NOT NULL, ts REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_rate_limit_hits_key_ts ON rate_limit_hits (key, ts)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode so each hit runs in its own explicit transaction
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, limit, window, now):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM rate_limit_hits WHERE ts < ?', (now - self.retention,))
+            count, oldest = conn.execute('SELECT COUNT(*), MIN(ts) FROM rate_limit_hits WHERE key = ? AND ts > ?',
+                                         (key, now - window)).fetchone()
+            if count >= limit:
+                retry_after = oldest + window - now
+            else:
+                conn.execute('INSERT INTO rate_limit_hits (key, ts) VALUES (?, ?)', (key, now))
+                retry_after = 0
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return retry_after
+
+    def check(self, key, limit, window, now):
+        count, oldest = self._connect().execute(
+            'SELECT COUNT(*), MIN(ts) FROM rate_limit_hits WHERE key = ? AND ts > ?', (key, now - window)
+        ).fetchone()
+        if count >= limit:
+            return oldest + window - now
+        return 0
+
+
+STORES = {
+    'memory': MemoryStore,
+    'sqlite': SQLiteStore,
+}
+
+
+class RateLimiter:
+    """Records attempts in the configured store and reports when to back off."""
+
+    def __init__(self):
+        self.store = None
+
+    def configure(self, store):
+        self.store = store
+
+    def hit(self, key, limit, window):
+        """
+        Record an attempt for a key unless it is over its limit.
+
+        Args:
+            key (str): What is being limited, e.g. 'login:ip:203.0.113.5'
+            limit (int): Attempts allowed per window
+            window (float): Window length in seconds
+
+        Returns:
+            float: Seconds until the next attempt is allowed, 0 if this one was
+        """
+        if self.store is None:
+            return 0
+        return self.store.hit(key, limit, window, time.time())
+
+    def check(self, key, limit, window):
+        """
+        Check whether a key is over its limit without recording an attempt.
+
+        Returns:
+            float: Seconds until the next attempt is allowed, 0 if allowed now
+        """
+        if self.store is None:
+            return 0
+        return self.store.check(key, limit, window, time.time())
+
+
+# Process-wide limiter used by the login and password reset views
+rate_limiter = RateLimiter()
+
+
+def _email_key(action, email):
+    return f'{action}:email:{email.strip().lower()}'
+
+
+def throttle(action, email=None, email_failures_only=False):
+    """
+    Record an attempt at an action for the client IP and email address.
+
+    The limits come from RATE_LIMITS['<action>_ip'] and
+    RATE_LIMITS['<action>_email'] as (attempts, window seconds) pairs.
+
+    Args:
+        action (str): 'login', 'admin_login' or 'password_reset'
+        email (str, optional): The email address the attempt is for
+        email_failures_only (bool): Only check the email's limit here; the
+            caller records failed attempts with record_failure
+
+    Returns:
+        float: Seconds the client must wait, or 0 if the attempt may proceed
+    """
+    limits = current_app.config.get('RATE_LIMITS', {})
+    keys = [(f'{action}_ip', f'{action}:ip:{request.remote_addr}', True)]
+    if email:
+        keys.append((f'{action}_email', _email_key(action, email), not email_failures_only))
+
+    for rule, key, record in keys:
+        if rule not in limits:
+            continue
+        limit, window = limits[rule]
+        if record:
+            retry_after = rate_limiter.hit(key, limit, window)
+        else:
+            retry_after = rate_limiter.check(key, limit, window)
+        if retry_after:
+            current_app.logger.warning(f"Rate limited {key}; retry in {retry_after:.0f}s")
+            return retry_after
+    return 0
+
+
+def record_failure(action, email):
+    """
+    Count a failed attempt against an email address's limit.
+
+    Args:
+        action (str): 'login' or 'admin_login'
+        email (str): The email address the attempt was for
+    """
+    limits = current_app.config.get('RATE_LIMITS', {})
+    rule = f'{action}_email'
+    if email and rule in limits:
+        limit, window = limits[rule]
+        rate_limiter.hit(_email_key(action, email), limit, window)
+
+
+def retry_message(retry_after):
+    """Format a wait time for a 'try again' flash message."""
+    minutes = max(1, math.ceil(retry_after / 60))
+    return f"{minutes} minute{'s' if minutes != 1 else ''}"
+
+
+def _load_store(name):
+    if name in STORES:
+        return STORES[name]
+    module_name, _, class_name = name.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def init_rate_limit(app):
+    """
+    Configure the rate limiter store.
+
+    Args:
+        app (Flask): The Flask application
+    """
+    store_class = _load_store(app.config.get('RATE_LIMIT_BACKEND', 'memory'))
+    rate_limiter.configure(store_class(app))
@@ -0,0 +1,257 @@
+"""
+In-memory inverted index for tutor search.
+
+The index maps lowercase word tokens from a tutor's name, subjects and bio
+to posting lists of tutor IDs, so free-text search can be resolved without
+running ``ILIKE '%term%'`` scans over the tutors table. Changes committed by
+other processes are picked up by rebuilding the index once it is
+TUTOR_SEARCH_INDEX_MAX_AGE seconds old.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Key used to stage index changes on the SQLAlchemy session until commit
+_PENDING_KEY = 'tutor_search_index_pending'
+
+# Held while a request rebuilds a stale index, so only one request does it
+_reload_lock = threading.Lock()
+
+_listeners_registered = False
+
+
+def tokenize(text):
+    """
+    Split text into lowercase alphanumeric tokens.
+
+    Args:
+        text (str): The text to tokenize
+
+    Returns:
+        list: List of tokens, empty if text is empty
+    """
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TutorSearchIndex:
+    """Thread-safe inverted index of tutor search tokens to tutor IDs."""
+
+    def __init__(self):
+        self._postings = {}      # token -> set of tutor IDs
+        self._documents = {}     # tutor ID -> set of tokens
+        self._vocabulary = []    # sorted tokens, used for prefix lookups
+        self._vocabulary_dirty = False
+        self._lock = threading.RLock()
+        self.loaded_at = None    # Monotonic time of the last build
+
+    @staticmethod
+    def _document_tokens(fullname, subjects_taught, bio):
+        """Collect the distinct tokens for a tutor's searchable fields."""
+        tokens = set(tokenize(fullname))
+        tokens.update(tokenize(subjects_taught))
+        tokens.update(tokenize(bio))
+        return tokens
+
+    def build(self, rows):
+        """
+        Rebuild the whole index.
+
+        The new index is built without holding the lock and swapped in at
+        the end, so searches keep using the old one in the meantime.
+
+        Args:
+            rows (iterable): Tuples of (id, fullname, subjects_taught, bio)
+        """
+        postings = {}
+        documents = {}
+        for tutor_id, fullname, subjects_taught, bio in rows:
+            tokens = self._document_tokens(fullname, subjects_taught, bio)
+            documents[tutor_id] = tokens
+            for token in tokens:
+                postings.setdefault(token, set()).add(tutor_id)
+        vocabulary = sorted(postings)
+
+        with self._lock:
+            self._postings = postings
+            self._documents = documents
+            self._vocabulary = vocabulary
+            self._vocabulary_dirty = False
+            self.loaded_at = time.monotonic()
+
+    def is_stale(self, max_age):
+        """Whether the index was built more than max_age seconds ago."""
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age
+
+    def index_tutor(self, tutor_id, fullname, subjects_taught, bio):
+        """Add or replace the index entry for a single tutor."""
+        tokens = self._document_tokens(fullname, subjects_taught, bio)
+        with self._lock:
+            if self._documents.get(tutor_id) == tokens:
+                return
+            self._remove(tutor_id)
+            self._add(tutor_id, tokens)
+
+    def remove_tutor(self, tutor_id):
+        """Remove a tutor from the index."""
+        with self._lock:
+            self._remove(tutor_id)
+
+    def _add(self, tutor_id, tokens):
+        self._documents[tutor_id] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {tutor_id}
+                self._vocabulary_dirty = True
+            else:
+                postings.add(tutor_id)
+
+    def _remove(self, tutor_id):
+        for token in self._documents.pop(tutor_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(tutor_id)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+
+    def _prefix_matches(self, prefix):
+        """Return the union of posting lists for all tokens starting with prefix."""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+
+        matches = set()
+        position = bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+            matches.update(self._postings[self._vocabulary[position]])
+            position += 1
+        return matches
+
+    def search(self, query):
+        """
+        Resolve a free-text query to the IDs of matching tutors.
+
+        Every token in the query must match (as a word prefix, so partially
+        typed words still find results) at least one token of the tutor's
+        name, subjects or bio.
+
+        Args:
+            query (str): The search text
+
+        Returns:
+            set: IDs of matching tutors
+        """
+        terms = tokenize(query)
+        if not terms:
+            return set()
+
+        with self._lock:
+            result = None
+            # Resolve the longest (most selective) terms first
+            for term in sorted(set(terms), key=len, reverse=True):
+                matches = self._prefix_matches(term)
+                result = matches if result is None else result & matches
+                if not result:
+                    return set()
+            return result
+
+
+# Process-wide index used by the views
+tutor_search_index = TutorSearchIndex()
+
+
+def _stage_tutor(mapper, connection, target):
+    """Stage an inserted or updated tutor for indexing once the transaction commits."""
+    session = object_session(target)
+    if session is None:
+        return
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    pending[target.id] = (target.fullname, target.subjects_taught, target.bio)
+
+
+def _stage_tutor_delete(mapper, connection, target):
+    """Stage a deleted tutor for removal once the transaction commits."""
+    session = object_session(target)
+    if session is None:
+        return
+    session.info.setdefault(_PENDING_KEY, {})[target.id] = None
+
+
+def _apply_pending(session):
+    """Apply staged index changes after a successful commit."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for tutor_id, fields in pending.items():
+        if fields is None:
+            tutor_search_index.remove_tutor(tutor_id)
+        else:
+            tutor_search_index.index_tutor(tutor_id, *fields)
+
+
+def _discard_pending(session, *args):
+    """Drop staged index changes when the transaction is rolled back."""
+    session.info.pop(_PENDING_KEY, None)
+
+
+def load_search_index():
+    """Rebuild the index from the tutors table. Needs an app context."""
+    from db import db
+    from models.tutor import Tutor
+
+    rows = db.session.query(Tutor.id, Tutor.fullname, Tutor.subjects_taught, Tutor.bio).all()
+    tutor_search_index.build(rows)
+    return len(rows)
+
+
+def reload_if_stale():
+    """
+    Rebuild the index if it is older than TUTOR_SEARCH_INDEX_MAX_AGE.
+
+    Only one request rebuilds at a time; the others keep searching the
+    current index until the new one is swapped in.
+    """
+    from flask import current_app
+
+    max_age = current_app.config.get('TUTOR_SEARCH_INDEX_MAX_AGE', 300)
+    if not tutor_search_index.is_stale(max_age) or not _reload_lock.acquire(blocking=False):
+        return
+    try:
+        if tutor_search_index.is_stale(max_age):
+            load_search_index()
+    finally:
+        _reload_lock.release()
+
+
+def init_search_index(app):
+    """
+    Build the tutor search index and keep it current with tutor changes.
+
+    Args:
+        app (Flask): The Flask application
+    """
+    global _listeners_registered
+    from db import db
+    from models.tutor import Tutor
+
+    with app.app_context():
+        count = load_search_index()
+        app.logger.info(f"Tutor search index built with {count} tutors")
+
+    if not _listeners_registered:
+        event.listen(Tutor, 'after_insert', _stage_tutor)
+        event.listen(Tutor, 'after_update', _stage_tutor)
+        event.listen(Tutor, 'after_delete', _stage_tutor_delete)
+        event.listen(db.session, 'after_commit', _apply_pending)
+        event.listen(db.session, 'after_rollback', _discard_pending)
+        _listeners_registered = True
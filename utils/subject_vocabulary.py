@@ -0,0 +1,121 @@
+"""
+Cached subject vocabulary for the tutor search dropdown.
+
+Keeps the list of selectable subjects together with the number of active
+tutors teaching each one, so the search page does not have to scan tutors
+to build its subject filter.
+"""
+import threading
+import time
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import object_session
+
+# Subjects always offered in the search dropdown
+PREDEFINED_SUBJECTS = [
+    'Mathematics', 'Physics', 'Chemistry', 'Biology', 'English',
+    'History', 'Geography', 'Computer Science', 'Economics',
+    'Psychology', 'Statistics', 'Calculus', 'Algebra', 'Geometry',
+    'French', 'Spanish', 'German', 'Art', 'Music', 'Philosophy'
+]
+
+# Key used to flag tutor changes on the SQLAlchemy session until commit
+_DIRTY_KEY = 'subject_vocabulary_dirty'
+
+_listeners_registered = False
+
+
+class SubjectVocabulary:
+    """Process-wide cache of subject names with active-tutor counts."""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._entries = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Compute the vocabulary with a single aggregate query."""
+        from db import db
+        from models.subject import Subject, tutor_subjects
+        from models.tutor import Tutor
+
+        rows = db.session.query(Subject.name, func.count(Tutor.id))\
+                         .join(tutor_subjects, tutor_subjects.c.subject_id == Subject.id)\
+                         .join(Tutor, Tutor.id == tutor_subjects.c.tutor_id)\
+                         .filter(Tutor.is_active == True)\
+                         .group_by(Subject.id, Subject.name)\
+                         .all()
+
+        counts = {name.lower(): (name, count) for name, count in rows}
+        for name in PREDEFINED_SUBJECTS:
+            counts.setdefault(name.lower(), (name, 0))
+
+        return [{'name': name, 'tutor_count': count}
+                for name, count in sorted(counts.values(), key=lambda entry: entry[0].lower())]
+
+    def get(self):
+        """
+        Get the subject vocabulary, loading it if the cache is empty or stale.
+
+        Returns:
+            list: Dictionaries with 'name' and 'tutor_count', sorted by name
+        """
+        entries = self._entries
+        if entries is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return entries
+
+        with self._lock:
+            if self._entries is None or time.monotonic() - self._loaded_at >= self.ttl:
+                self._entries = self._load()
+                self._loaded_at = time.monotonic()
+            return self._entries
+
+    def invalidate(self):
+        """Drop the cached vocabulary so the next read recomputes it."""
+        self._entries = None
+
+
+# Process-wide vocabulary used by the views
+subject_vocabulary = SubjectVocabulary()
+
+
+def _flag_tutor_change(mapper, connection, target):
+    """Flag the session so the vocabulary is refreshed once the transaction commits."""
+    session = object_session(target)
+    if session is not None:
+        session.info[_DIRTY_KEY] = True
+
+
+def _invalidate_on_commit(session):
+    """Invalidate the vocabulary after a commit that changed tutors."""
+    if session.info.pop(_DIRTY_KEY, False):
+        subject_vocabulary.invalidate()
+
+
+def _discard_on_rollback(session, *args):
+    """Forget pending tutor changes when the transaction is rolled back."""
+    session.info.pop(_DIRTY_KEY, None)
+
+
+def init_subject_vocabulary(app):
+    """
+    Configure the subject vocabulary cache and keep it current with tutor changes.
+
+    Args:
+        app (Flask): The Flask application
+    """
+    global _listeners_registered
+    from db import db
+    from models.tutor import Tutor
+
+    subject_vocabulary.ttl = app.config.get('SUBJECT_VOCABULARY_TTL', 300)
+    subject_vocabulary.invalidate()
+
+    if not _listeners_registered:
+        event.listen(Tutor, 'after_insert', _flag_tutor_change)
+        event.listen(Tutor, 'after_update', _flag_tutor_change)
+        event.listen(Tutor, 'after_delete', _flag_tutor_change)
+        event.listen(db.session, 'after_commit', _invalidate_on_commit)
+        event.listen(db.session, 'after_rollback', _discard_on_rollback)
+        _listeners_registered = True
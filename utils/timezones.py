@@ -0,0 +1,139 @@
+"""
+Cached timezone conversions for the TutorConnect application.
+
+Availability and booking times are stored as GMT times of day and shown in
+the user's timezone. Zones are loaded once through zoneinfo and the UTC
+offset of each (timezone, date) pair is memoized, so converting a list of
+slots costs one offset lookup instead of a localize call per slot. Offsets
+are taken at local noon of the date, which gives the right DST offset for
+every time of day except the hour of a transition itself.
+
+Weekly availability rules also keep the offset they were saved with, so
+their wall-clock times can be recovered on any date with shift_times().
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@lru_cache(maxsize=128)
+def get_zone(timezone_str):
+    """
+    Get a timezone by name.
+
+    Args:
+        timezone_str (str): IANA timezone name (e.g., 'US/Eastern')
+
+    Returns:
+        ZoneInfo: The timezone
+    """
+    return ZoneInfo(timezone_str)
+
+
+@lru_cache(maxsize=4096)
+def utc_offset_minutes(timezone_str, on_date):
+    """
+    Get a timezone's UTC offset on a date.
+
+    Args:
+        timezone_str (str): IANA timezone name
+        on_date (date): The date the offset applies to
+
+    Returns:
+        int: Minutes to add to UTC to get local time
+    """
+    noon = datetime.combine(on_date, time(12), tzinfo=get_zone(timezone_str))
+    return int(noon.utcoffset().total_seconds() // 60)
+
+
+def _shift(value, minutes):
+    total = (value.hour * 60 + value.minute + minutes) % MINUTES_PER_DAY
+    return time(total // 60, total % 60)
+
+
+def local_to_utc(time_ranges, timezone_str, on_date=None):
+    """
+    Convert local time ranges to GMT.
+
+    Args:
+        time_ranges (list): (start, end) pairs of time objects or 'HH:MM'
+            strings in the given timezone
+        timezone_str (str): IANA timezone name
+        on_date (date, optional): Date whose offset applies; defaults to today
+
+    Returns:
+        list: (start_time, end_time) pairs of GMT time objects
+    """
+    offset = utc_offset_minutes(timezone_str, on_date or date.today())
+    return [(_shift(_parse(start), -offset), _shift(_parse(end), -offset)) for start, end in time_ranges]
+
+
+def utc_to_local(time_ranges, timezone_str, on_date=None):
+    """
+    Convert GMT time ranges to local times.
+
+    Args:
+        time_ranges (list): (start, end) pairs of GMT time objects
+        timezone_str (str): IANA timezone name
+        on_date (date, optional): Date whose offset applies; defaults to today
+
+    Returns:
+        list: (start_time, end_time) pairs of local time objects
+    """
+    offset = utc_offset_minutes(timezone_str, on_date or date.today())
+    return shift_times(time_ranges, offset)
+
+
+def shift_times(time_ranges, minutes):
+    """
+    Shift time ranges by a fixed number of minutes, wrapping at midnight.
+
+    Args:
+        time_ranges (list): (start, end) pairs of time objects
+        minutes (int): Minutes to add, e.g. a stored UTC offset
+
+    Returns:
+        list: (start_time, end_time) pairs of shifted time objects
+    """
+    return [(_shift(start, minutes), _shift(end, minutes)) for start, end in time_ranges]
+
+
+def local_datetime_to_utc(on_date, minute, timezone_str):
+    """
+    Convert a local wall-clock time on a date to an aware UTC datetime.
+
+    Args:
+        on_date (date): The local date
+        minute (int): Minutes since local midnight; may exceed a day
+        timezone_str (str): IANA timezone name
+
+    Returns:
+        datetime: The moment in UTC
+    """
+    local = datetime.combine(on_date, time()) + timedelta(minutes=minute)
+    return local.replace(tzinfo=get_zone(timezone_str)).astimezone(timezone.utc)
+
+
+def utc_datetime_to_local(value, timezone_str):
+    """
+    Convert a UTC datetime to local wall-clock time.
+
+    Args:
+        value (datetime): The moment in UTC; naive values are taken as UTC
+        timezone_str (str): IANA timezone name
+
+    Returns:
+        datetime: Naive local date and time
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(get_zone(timezone_str)).replace(tzinfo=None)
+
+
+def _parse(value):
+    if isinstance(value, str):
+        hour, minute = map(int, value.split(':'))
+        return time(hour, minute)
+    return value
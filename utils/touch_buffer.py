@@ -0,0 +1,133 @@
+"""
+Write-coalescing buffer for low-value activity timestamps.
+
+Columns such as last_login and last_action are recorded in memory by
+touch() and written in batched UPDATEs by a background thread every
+TOUCH_FLUSH_INTERVAL seconds (and at shutdown), instead of costing every
+login its own commit. Repeated touches of the same row between flushes
+collapse into one update, and an update never moves a timestamp backwards.
+"""
+import atexit
+import datetime
+import threading
+
+from sqlalchemy import bindparam, or_
+
+
+class TouchBuffer:
+    """Pending timestamps keyed by (model, column, row id)."""
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._app = None
+        self._thread = None
+        self._wakeup = threading.Event()
+        self.interval = None
+        self.max_pending = None
+
+    def start(self, app, interval, max_pending):
+        """
+        Start flushing buffered timestamps in the background.
+
+        Args:
+            app (Flask): The Flask application (for database access)
+            interval (float): Seconds between flushes
+            max_pending (int): Buffered rows that trigger an early flush
+        """
+        self._app = app
+        self.interval = interval
+        self.max_pending = max_pending
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='touch-buffer', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def touch(self, model, column, row_id, when=None):
+        """
+        Record that a row's timestamp column should be set.
+
+        Without a running flusher (e.g. in scripts) the update is written
+        immediately.
+
+        Args:
+            model (db.Model): Model class of the row
+            column (str): Name of the timestamp column
+            row_id (int): Primary key of the row
+            when (datetime, optional): The timestamp; defaults to now (UTC)
+        """
+        when = when or datetime.datetime.utcnow()
+        key = (model, column, row_id)
+        with self._lock:
+            if key not in self._pending or self._pending[key] < when:
+                self._pending[key] = when
+            pending = len(self._pending)
+
+        if self._thread is None:
+            self.flush()
+        elif pending >= self.max_pending:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write all buffered timestamps with one UPDATE statement per column."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        batches = {}
+        for (model, column, row_id), when in pending.items():
+            batches.setdefault((model, column), []).append({'row_id': row_id, 'touched_at': when})
+
+        from db import db
+        if self._app is not None:
+            context = self._app.app_context()
+        else:
+            from flask import current_app
+            context = current_app.app_context()
+        try:
+            with context, db.engine.begin() as conn:
+                for (model, column), rows in batches.items():
+                    table = model.__table__
+                    target = table.c[column]
+                    conn.execute(
+                        table.update()
+                            .where(table.c.id == bindparam('row_id'),
+                                   or_(target.is_(None), target < bindparam('touched_at')))
+                            .values({column: bindparam('touched_at')}),
+                        rows
+                    )
+        except Exception:
+            # Keep the timestamps for the next flush unless newer ones arrived
+            with self._lock:
+                for key, when in pending.items():
+                    if key not in self._pending or self._pending[key] < when:
+                        self._pending[key] = when
+            raise
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self._app.logger.error(f"Error flushing activity timestamps: {str(e)}")
+
+
+# Process-wide buffer used by the user models
+touch_buffer = TouchBuffer()
+
+
+def init_touch_buffer(app):
+    """
+    Start the background flusher for activity timestamps.
+
+    Args:
+        app (Flask): The Flask application
+    """
+    touch_buffer.start(
+        app,
+        interval=app.config.get('TOUCH_FLUSH_INTERVAL', 10),
+        max_pending=app.config.get('TOUCH_MAX_PENDING', 500)
+    )
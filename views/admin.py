@@ -3,15 +3,15 @@ Admin views for the TutorConnect application.
 Contains routes for admin authentication, tutor verification, etc.
 """
 from flask import (Blueprint, render_template, request, url_for, redirect, 
-                  flash, current_app, session)
+                  flash, current_app, session, g)
 from sqlalchemy.exc import IntegrityError
 
 from db import db
-from models.admin import Admin
 from models.tutor import Tutor, TutorStatus
 from models.student import Student
-from auth import login_user, login_required, role_required
+from auth import authenticate_admin, login_user, login_required, role_required
 from utils.file_handling import allowed_file, save_uploaded_file
+from utils.rate_limit import throttle, record_failure, retry_message
 
 # Create a Blueprint for admin routes
 admin_bp = Blueprint('admin', __name__)
@@ -31,10 +31,19 @@ def login_submit():
         flash('Email and password are required.', 'error')
         return redirect(url_for('admin.login_form'))
     
-    # Find admin by email
-    admin = Admin.query.filter_by(email=email).first()
+    # Turn away repeated attempts before checking the password
+    retry_after = throttle('admin_login', email, email_failures_only=True)
+    if retry_after:
+        flash(f'Too many sign-in attempts. Please try again in {retry_message(retry_after)}.', 'error')
+        return redirect(url_for('admin.login_form'))
+    
+    # Check the admin's credentials
+    admin = authenticate_admin(email, password)
     
-    if admin and admin.verify_password(password):
+    if admin == 'busy':
+        flash('We are handling a lot of sign-ins right now. Please try again in a moment.', 'warning')
+        return redirect(url_for('admin.login_form'))
+    elif admin:
         # Update last login and last action
         admin.update_last_login()
         admin.update_last_action()
@@ -45,6 +54,7 @@ def login_submit():
         flash('Welcome to the admin panel!', 'success')
         return redirect(url_for('admin.dashboard'))
     else:
+        record_failure('admin_login', email)
         flash('Invalid email or password.', 'error')
         return redirect(url_for('admin.login_form'))
 
@@ -124,16 +134,14 @@ def update_tutor_status(tutor_id):
         old_status = tutor.status.value
         
         # Update tutor status
-        admin_id = session.get('user_id')
-        tutor.update_status(status_enum, admin_id)
+        admin = g.current_user
+        tutor.update_status(status_enum, admin.id)
         
         # Update admin's last action
-        admin = Admin.query.get(admin_id)
-        if admin:
-            admin.update_last_action()
+        admin.update_last_action()
         
         # Log the action
-        current_app.logger.info(f"Admin {admin_id} changed tutor {tutor_id} status from {old_status} to {new_status}")
+        current_app.logger.info(f"Admin {admin.id} changed tutor {tutor_id} status from {old_status} to {new_status}")
         
         # Flash appropriate message
         if status_enum == TutorStatus.VERIFIED:
@@ -168,12 +176,7 @@ def students():
 @role_required(['admin'])
 def settings():
     """Admin settings page."""
-    admin_id = session.get('user_id')
-    admin = Admin.query.get(admin_id)
-    
-    if not admin:
-        flash('Admin profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    admin = g.current_user
         
     return render_template('admin/settings.html', user=admin, active_section='profile')
 
@@ -182,12 +185,7 @@ def settings():
 @role_required(['admin'])
 def settings_appearance():
     """Admin settings page - Appearance section."""
-    admin_id = session.get('user_id')
-    admin = Admin.query.get(admin_id)
-    
-    if not admin:
-        flash('Admin profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    admin = g.current_user
         
     return render_template('admin/settings.html', user=admin, active_section='appearance')
 
@@ -196,12 +194,7 @@ def settings_appearance():
 @role_required(['admin'])
 def update_profile():
     """Update admin profile information."""
-    admin_id = session.get('user_id')
-    admin = Admin.query.get(admin_id)
-    
-    if not admin:
-        flash('Admin profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    admin = g.current_user
     
     try:
         # Handle profile picture upload if provided
@@ -220,7 +213,7 @@ def update_profile():
                 else:
                     flash('Invalid file type for profile picture. Allowed: png, jpg, jpeg', 'error')
         
-        db.session.commit()
+        db.session.flush()
         flash('Profile updated successfully!', 'success')
         return redirect(url_for('admin.settings'))
         
@@ -4,13 +4,15 @@ Handles OAuth login, password reset, and authentication flows.
 """
 import requests
 import secrets
-from urllib.parse import urlencode
 from flask import Blueprint, request, redirect, url_for, flash, session, current_app, render_template
-from models.student import Student
-from models.tutor import Tutor
+from models.user import UserRole
+from models.user_directory import UserDirectory
+from models.oauth_identity import OAuthIdentity
 from models.password_reset import PasswordReset
 from utils.email_utils import send_password_reset_email
 from utils.password_utils import validate_password_strength
+from utils.rate_limit import throttle, retry_message
+from utils.oidc import get_provider, OIDCError
 from auth import login_user, logout_user
 from db import db
 
@@ -18,44 +20,35 @@ from db import db
 auth_bp = Blueprint('auth', __name__)
 
 
-@auth_bp.route('/google')
-def google_login():
-    """Initiate Google OAuth login."""
-    if not current_app.config.get('GOOGLE_CLIENT_ID'):
-        flash('Google login is not configured.', 'error')
+def _start_oauth_login(provider_name, display_name):
+    """Redirect to a provider's sign-in page."""
+    provider = get_provider(provider_name)
+    if not provider.is_configured:
+        flash(f'{display_name} login is not configured.', 'error')
         return redirect(url_for('main.login'))
     
-    # Generate a random state for CSRF protection
+    # Generate a random state for CSRF protection and a nonce to bind the ID token
     state = secrets.token_urlsafe(32)
+    nonce = secrets.token_urlsafe(32)
     session['oauth_state'] = state
+    session['oauth_nonce'] = nonce
     
-    # Google OAuth 2.0 authorization URL
-    google_auth_url = 'https://accounts.google.com/o/oauth2/v2/auth'
-    
-    params = {
-        'client_id': current_app.config['GOOGLE_CLIENT_ID'],
-        'redirect_uri': url_for('auth.google_callback', _external=True),
-        'scope': 'openid email profile',
-        'response_type': 'code',
-        'state': state
-    }
-    
-    auth_url = f"{google_auth_url}?{urlencode(params)}"
-    return redirect(auth_url)
+    redirect_uri = url_for(f'auth.{provider_name}_callback', _external=True)
+    return redirect(provider.authorization_url(redirect_uri, state, nonce))
 
 
-@auth_bp.route('/google/callback')
-def google_callback():
-    """Handle Google OAuth callback."""
+def _finish_oauth_login(provider_name, display_name):
+    """Handle a provider's callback and log the user in or start registration."""
     # Verify state to prevent CSRF attacks
     if request.args.get('state') != session.get('oauth_state'):
         flash('Authentication failed: Invalid state parameter.', 'error')
         return redirect(url_for('main.login'))
     
-    # Clear the state from session
+    # Clear the state and nonce from session
     session.pop('oauth_state', None)
+    nonce = session.pop('oauth_nonce', None)
     
-    # Handle error from Google
+    # Handle error from the provider
     if request.args.get('error'):
         flash('Authentication cancelled.', 'info')
         return redirect(url_for('main.login'))
@@ -67,40 +60,29 @@ def google_callback():
         return redirect(url_for('main.login'))
     
     try:
-        # Exchange code for access token
-        token_url = 'https://oauth2.googleapis.com/token'
-        token_data = {
-            'client_id': current_app.config['GOOGLE_CLIENT_ID'],
-            'client_secret': current_app.config['GOOGLE_CLIENT_SECRET'],
-            'code': code,
-            'grant_type': 'authorization_code',
-            'redirect_uri': url_for('auth.google_callback', _external=True)
-        }
-        
-        token_response = requests.post(token_url, data=token_data)
-        token_response.raise_for_status()
-        token_json = token_response.json()
-        
-        access_token = token_json.get('access_token')
-        if not access_token:
-            flash('Authentication failed: No access token received.', 'error')
-            return redirect(url_for('main.login'))
-        
-        # Get user info from Google
-        userinfo_url = f"https://www.googleapis.com/oauth2/v2/userinfo?access_token={access_token}"
-        userinfo_response = requests.get(userinfo_url)
-        userinfo_response.raise_for_status()
-        user_data = userinfo_response.json()
+        # Exchange the code and read the user from the validated ID token
+        provider = get_provider(provider_name)
+        redirect_uri = url_for(f'auth.{provider_name}_callback', _external=True)
+        identity = provider.get_identity(code, redirect_uri, nonce)
+        email, name = identity.email, identity.name
+        roles = [UserRole.STUDENT, UserRole.TUTOR]
         
-        email = user_data.get('email')
-        name = user_data.get('name')
+        # Returning users are matched on the provider's ID for them
+        user = OAuthIdentity.find_user(provider_name, identity.subject, roles=roles)
         
-        if not email:
-            flash('Authentication failed: No email received from Google.', 'error')
+        if not user and not email:
+            flash(f'Authentication failed: No email received from {display_name}.', 'error')
             return redirect(url_for('main.login'))
         
-        # Check if user exists
-        user = Student.query.filter_by(email=email).first() or Tutor.query.filter_by(email=email).first()
+        if not user:
+            # Link an existing account only through an email the provider verified
+            user = UserDirectory.find_user(email, roles=roles)
+            if user and not identity.email_verified:
+                current_app.logger.warning(f"{display_name} sign-in with unverified email for existing account: {email}")
+                flash(f'{display_name} did not verify this email address. Please sign in with your password.', 'error')
+                return redirect(url_for('main.login'))
+            if user:
+                OAuthIdentity.link(provider_name, identity.subject, user)
         
         if user:
             # Check if tutor is verified
@@ -125,142 +107,47 @@ def google_callback():
             session['oauth_user_data'] = {
                 'email': email,
                 'name': name,
-                'provider': 'google'
+                'provider': provider_name
             }
             flash(f'Welcome {name}! Please complete your registration by selecting your role.', 'info')
             return redirect(url_for('main.role_selection'))
     
+    except OIDCError as e:
+        current_app.logger.warning(f"{display_name} OAuth rejected: {str(e)}")
+        flash('Authentication failed: The sign-in response could not be verified.', 'error')
+        return redirect(url_for('main.login'))
     except requests.RequestException as e:
-        current_app.logger.error(f"Google OAuth error: {str(e)}")
-        flash('Authentication failed: Unable to connect to Google.', 'error')
+        current_app.logger.error(f"{display_name} OAuth error: {str(e)}")
+        flash(f'Authentication failed: Unable to connect to {display_name}.', 'error')
         return redirect(url_for('main.login'))
     except Exception as e:
-        current_app.logger.error(f"Google OAuth unexpected error: {str(e)}")
+        current_app.logger.error(f"{display_name} OAuth unexpected error: {str(e)}")
         flash('Authentication failed: An unexpected error occurred.', 'error')
         return redirect(url_for('main.login'))
 
 
+@auth_bp.route('/google')
+def google_login():
+    """Initiate Google OAuth login."""
+    return _start_oauth_login('google', 'Google')
+
+
+@auth_bp.route('/google/callback')
+def google_callback():
+    """Handle Google OAuth callback."""
+    return _finish_oauth_login('google', 'Google')
+
+
 @auth_bp.route('/microsoft')
 def microsoft_login():
     """Initiate Microsoft OAuth login."""
-    if not current_app.config.get('MICROSOFT_CLIENT_ID'):
-        flash('Microsoft login is not configured.', 'error')
-        return redirect(url_for('main.login'))
-    
-    # Generate a random state for CSRF protection
-    state = secrets.token_urlsafe(32)
-    session['oauth_state'] = state
-    
-    # Microsoft OAuth 2.0 authorization URL
-    microsoft_auth_url = 'https://login.microsoftonline.com/common/oauth2/v2.0/authorize'
-    
-    params = {
-        'client_id': current_app.config['MICROSOFT_CLIENT_ID'],
-        'redirect_uri': url_for('auth.microsoft_callback', _external=True),
-        'scope': 'openid email profile',
-        'response_type': 'code',
-        'state': state
-    }
-    
-    auth_url = f"{microsoft_auth_url}?{urlencode(params)}"
-    return redirect(auth_url)
+    return _start_oauth_login('microsoft', 'Microsoft')
 
 
 @auth_bp.route('/microsoft/callback')
 def microsoft_callback():
     """Handle Microsoft OAuth callback."""
-    # Verify state to prevent CSRF attacks
-    if request.args.get('state') != session.get('oauth_state'):
-        flash('Authentication failed: Invalid state parameter.', 'error')
-        return redirect(url_for('main.login'))
-    
-    # Clear the state from session
-    session.pop('oauth_state', None)
-    
-    # Handle error from Microsoft
-    if request.args.get('error'):
-        flash('Authentication cancelled.', 'info')
-        return redirect(url_for('main.login'))
-    
-    # Get authorization code
-    code = request.args.get('code')
-    if not code:
-        flash('Authentication failed: No authorization code received.', 'error')
-        return redirect(url_for('main.login'))
-    
-    try:
-        # Exchange code for access token
-        token_url = 'https://login.microsoftonline.com/common/oauth2/v2.0/token'
-        token_data = {
-            'client_id': current_app.config['MICROSOFT_CLIENT_ID'],
-            'client_secret': current_app.config['MICROSOFT_CLIENT_SECRET'],
-            'code': code,
-            'grant_type': 'authorization_code',
-            'redirect_uri': url_for('auth.microsoft_callback', _external=True)
-        }
-        
-        token_response = requests.post(token_url, data=token_data)
-        token_response.raise_for_status()
-        token_json = token_response.json()
-        
-        access_token = token_json.get('access_token')
-        if not access_token:
-            flash('Authentication failed: No access token received.', 'error')
-            return redirect(url_for('main.login'))
-        
-        # Get user info from Microsoft Graph
-        userinfo_url = 'https://graph.microsoft.com/v1.0/me'
-        headers = {'Authorization': f'Bearer {access_token}'}
-        userinfo_response = requests.get(userinfo_url, headers=headers)
-        userinfo_response.raise_for_status()
-        user_data = userinfo_response.json()
-        
-        email = user_data.get('mail') or user_data.get('userPrincipalName')
-        name = user_data.get('displayName')
-        
-        if not email:
-            flash('Authentication failed: No email received from Microsoft.', 'error')
-            return redirect(url_for('main.login'))
-        
-        # Check if user exists
-        user = Student.query.filter_by(email=email).first() or Tutor.query.filter_by(email=email).first()
-        
-        if user:
-            # Check if tutor is verified
-            if user.role.value == 'tutor' and not user.is_verified():
-                flash('Your tutor account is pending admin verification. Please wait for approval.', 'warning')
-                return redirect(url_for('main.login'))
-            
-            # User exists, log them in
-            login_user(user.id, user.role.value, user.fullname)
-            user.update_last_login()
-            flash(f'Welcome back, {user.fullname}!', 'success')
-            
-            # Redirect based on role
-            if user.role.value == 'student':
-                return redirect(url_for('student.dashboard'))
-            elif user.role.value == 'tutor':
-                return redirect(url_for('tutor.dashboard'))
-            else:
-                return redirect(url_for('main.index'))
-        else:
-            # New user, redirect to role selection with pre-filled data
-            session['oauth_user_data'] = {
-                'email': email,
-                'name': name,
-                'provider': 'microsoft'
-            }
-            flash(f'Welcome {name}! Please complete your registration by selecting your role.', 'info')
-            return redirect(url_for('main.role_selection'))
-    
-    except requests.RequestException as e:
-        current_app.logger.error(f"Microsoft OAuth error: {str(e)}")
-        flash('Authentication failed: Unable to connect to Microsoft.', 'error')
-        return redirect(url_for('main.login'))
-    except Exception as e:
-        current_app.logger.error(f"Microsoft OAuth unexpected error: {str(e)}")
-        flash('Authentication failed: An unexpected error occurred.', 'error')
-        return redirect(url_for('main.login'))
+    return _finish_oauth_login('microsoft', 'Microsoft')
 
 
 @auth_bp.route('/forgot-password', methods=['GET', 'POST'])
@@ -273,8 +160,14 @@ def forgot_password():
             flash('Please enter your email address.', 'error')
             return render_template('forgot_password.html')
         
-        # Check if user exists (in either student or tutor table)
-        user = Student.query.filter_by(email=email).first() or Tutor.query.filter_by(email=email).first()
+        # Limit reset emails per client and per address
+        retry_after = throttle('password_reset', email)
+        if retry_after:
+            flash(f'Too many password reset requests. Please try again in {retry_message(retry_after)}.', 'error')
+            return render_template('forgot_password.html'), 429
+        
+        # Check if a student or tutor account uses this email
+        user = UserDirectory.find_user(email, roles=[UserRole.STUDENT, UserRole.TUTOR])
         
         if user:
             try:
@@ -332,8 +225,7 @@ def reset_password(token):
         
         try:
             # Find the user and update their password
-            user = Student.query.filter_by(email=reset_record.email).first() or \
-                   Tutor.query.filter_by(email=reset_record.email).first()
+            user = UserDirectory.find_user(reset_record.email, roles=[UserRole.STUDENT, UserRole.TUTOR])
             
             if user:
                 user.password = password  # This will hash the password
@@ -0,0 +1,77 @@
+"""
+Live update views for the TutorConnect application.
+Streams events for the logged-in user over Server-Sent Events.
+
+Each open stream holds a server thread, so streams are only served when
+EVENTS_ENABLED is set (on a threaded or async server), at most
+EVENTS_MAX_STREAMS at a time per process, and each one is closed after
+EVENTS_MAX_STREAM_SECONDS; the browser then reconnects.
+"""
+import json
+import queue
+import time
+
+from flask import Blueprint, Response, abort, current_app, g
+
+from auth import login_required, role_required
+from utils.events import event_bus, user_channel
+
+
+# Create a Blueprint for live update routes
+events_bp = Blueprint('events', __name__)
+
+# Milliseconds the browser waits before reconnecting when the server is at capacity
+BUSY_RETRY_MS = 30000
+
+
+def _format_event(event_type, data):
+    """Format an event in the text/event-stream wire format."""
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+@events_bp.route('/stream')
+@login_required
+@role_required(['student', 'tutor'])
+def stream():
+    """Stream new message and booking events for the current user."""
+    if not current_app.config.get('EVENTS_ENABLED'):
+        abort(404)
+
+    headers = {
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    }
+    if not event_bus.open_stream():
+        # A 200 with a long retry makes EventSource back off and reconnect;
+        # an error status would make it give up
+        return Response(f"retry: {BUSY_RETRY_MS}\n\n", mimetype='text/event-stream', headers=headers)
+
+    channel = user_channel(g.current_user.role.value, g.current_user.id)
+    keepalive = current_app.config.get('EVENTS_KEEPALIVE', 15)
+    deadline = time.monotonic() + current_app.config.get('EVENTS_MAX_STREAM_SECONDS', 300)
+    subscriber = event_bus.subscribe(channel)
+
+    def generate():
+        # Ask the browser to reconnect quickly if the stream drops
+        yield "retry: 3000\n\n"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Free the thread; the browser reconnects after the retry delay
+                return
+            try:
+                event_type, data = subscriber.get(timeout=min(keepalive, remaining))
+            except queue.Empty:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                continue
+            yield _format_event(event_type, data)
+
+    def close():
+        event_bus.unsubscribe(channel, subscriber)
+        event_bus.close_stream()
+
+    response = Response(generate(), mimetype='text/event-stream', headers=headers)
+    # Runs when the server closes the response, even if streaming never started
+    response.call_on_close(close)
+    return response
@@ -2,8 +2,11 @@
 Main views for the TutorConnect application.
 Contains routes for the homepage, about page, features page, etc.
 """
-from flask import Blueprint, render_template, request, flash, redirect, url_for, session, current_app
+from flask import Blueprint, render_template, request, flash, redirect, url_for, session, current_app, jsonify
+from sqlalchemy import and_, exists, or_
+from sqlalchemy.orm import selectinload
 from auth import authenticate_user, login_user, login_required, role_required
+from utils.rate_limit import throttle, record_failure, retry_message
 from db import db
 
 # Create a Blueprint for the main routes
@@ -32,7 +35,12 @@ def features():
 def tutorsearch():
     """Renders the tutor search page for finding tutors."""
     from models.tutor import Tutor
-    from models.availability import TutorAvailability, DayOfWeek
+    from models.availability import DayOfWeek
+    from models.subject import Subject, tutor_subjects
+    from utils.search_index import tutor_search_index, reload_if_stale as reload_search_index
+    from utils.availability_index import availability_index, reload_if_stale as reload_availability_index
+    from utils.subject_vocabulary import subject_vocabulary
+    from utils.pagination import keyset_paginate
     from datetime import time
     
     # Get search and filter parameters
@@ -48,82 +56,89 @@ def tutorsearch():
     # Build query for tutors
     query = Tutor.query.filter(Tutor.is_active == True)
     
-    # Apply search filter
+    # Resolve the search terms and availability window against the in-memory
+    # indexes, intersecting them into a single set of candidate tutor IDs
+    candidate_ids = None
     if search:
-        query = query.filter(
-            db.or_(
-                Tutor.fullname.ilike(f'%{search}%'),
-                Tutor.subjects_taught.ilike(f'%{search}%'),
-                Tutor.bio.ilike(f'%{search}%')
-            )
-        )
-    
-    # Apply subject filter
-    if subject_filter and subject_filter not in ['', 'All Subjects']:
-        query = query.filter(Tutor.subjects_taught.ilike(f'%{subject_filter}%'))
-    
-    # Apply price filter
-    if min_price is not None:
-        query = query.filter(Tutor.hourly_rate >= min_price)
-    if max_price is not None:
-        query = query.filter(Tutor.hourly_rate <= max_price)
+        reload_search_index()
+        candidate_ids = tutor_search_index.search(search)
     
-    # Apply rating filter
-    if min_rating is not None:
-        query = query.filter(Tutor.rating >= min_rating)
-    
-    # Apply availability filter
     if availability_day and availability_start and availability_end:
         try:
-            # Convert day to enum
+            # Convert day to enum; times are interpreted as UTC
             day_enum = DayOfWeek[availability_day.upper()]
             start_hour, start_min = map(int, availability_start.split(':'))
             end_hour, end_min = map(int, availability_end.split(':'))
             start_time_obj = time(start_hour, start_min)
             end_time_obj = time(end_hour, end_min)
             
-            # Find tutors with availability that overlaps the requested time
-            available_tutor_ids = db.session.query(TutorAvailability.tutor_id).filter(
-                TutorAvailability.day_of_week == day_enum,
-                TutorAvailability.start_time <= start_time_obj,
-                TutorAvailability.end_time >= end_time_obj,
-                TutorAvailability.is_available == True
-            ).distinct().all()
-            
-            if available_tutor_ids:
-                tutor_ids = [tid[0] for tid in available_tutor_ids]
-                query = query.filter(Tutor.id.in_(tutor_ids))
-            else:
-                # No tutors available at this time
-                query = query.filter(db.false())
+            # Find tutors available for the whole requested window
+            reload_availability_index()
+            available_ids = availability_index.available_tutors(day_enum, start_time_obj, end_time_obj)
+            candidate_ids = available_ids if candidate_ids is None else candidate_ids & available_ids
                 
         except (ValueError, KeyError):
             # Invalid time format or day, ignore availability filter
             pass
     
-    # Get all tutors ordered by rating (desc) then creation date (newest first)
-    tutors = query.order_by(Tutor.rating.desc(), Tutor.created_at.desc()).all()
+    # Small candidate sets are sent as an IN list; larger ones are matched
+    # against the keyset scan in Python instead of an unbounded IN list
+    keep = None
+    if candidate_ids is not None:
+        if not candidate_ids:
+            query = query.filter(db.false())
+        elif len(candidate_ids) <= current_app.config.get('TUTOR_SEARCH_MAX_IN_IDS', 500):
+            query = query.filter(Tutor.id.in_(candidate_ids))
+        else:
+            keep = lambda tutor: tutor.id in candidate_ids
+    
+    # Apply subject filter as an indexed lookup on tutor_subjects. Tutors with no
+    # tutor_subjects rows yet (not backfilled by migrate_add_subjects.py) are
+    # matched on the legacy subjects_taught column instead.
+    if subject_filter and subject_filter not in ['', 'All Subjects']:
+        subject = Subject.get_by_name(subject_filter)
+        not_backfilled = and_(
+            ~exists().where(tutor_subjects.c.tutor_id == Tutor.id),
+            Tutor.subjects_taught.ilike(f'%{subject_filter}%')
+        )
+        if subject:
+            query = query.filter(or_(
+                exists().where(tutor_subjects.c.tutor_id == Tutor.id,
+                               tutor_subjects.c.subject_id == subject.id),
+                not_backfilled
+            ))
+        else:
+            query = query.filter(not_backfilled)
+    
+    # Apply price filter
+    if min_price is not None:
+        query = query.filter(Tutor.hourly_rate >= min_price)
+    if max_price is not None:
+        query = query.filter(Tutor.hourly_rate <= max_price)
+    
+    # Apply rating filter
+    if min_rating is not None:
+        query = query.filter(Tutor.rating >= min_rating)
     
-    # Get predefined subjects list for dropdown
-    predefined_subjects = [
-        'Mathematics', 'Physics', 'Chemistry', 'Biology', 'English',
-        'History', 'Geography', 'Computer Science', 'Economics',
-        'Psychology', 'Statistics', 'Calculus', 'Algebra', 'Geometry',
-        'French', 'Spanish', 'German', 'Art', 'Music', 'Philosophy'
-    ]
+    # Get one page of tutors ordered by rating (desc), creation date (newest first), then id
+    page = keyset_paginate(
+        query.options(selectinload(Tutor.subjects)),
+        [Tutor.rating, Tutor.created_at, Tutor.id],
+        per_page=current_app.config.get('TUTOR_SEARCH_PAGE_SIZE', 12),
+        after=request.args.get('after'),
+        before=request.args.get('before'),
+        keep=keep
+    )
     
-    # Get unique subjects from current tutors to add to predefined list
-    all_tutors = Tutor.query.filter(Tutor.is_active == True).all()
-    current_subjects = set()
-    for tutor in all_tutors:
-        if tutor.subjects_taught:
-            for subject in tutor.subjects_taught.split(','):
-                current_subjects.add(subject.strip())
+    # Filters to carry over into the pagination links
+    filter_args = {key: value for key, value in request.args.items()
+                   if key not in ('after', 'before') and value}
     
-    # Combine and sort all subjects
-    all_subjects = sorted(list(set(predefined_subjects + list(current_subjects))))
+    # Get subject vocabulary with active-tutor counts for dropdown
+    all_subjects = subject_vocabulary.get()
     
-    return render_template('tutorsearch.html', tutors=tutors, subjects=all_subjects,
+    return render_template('tutorsearch.html', tutors=page.items, page=page, filter_args=filter_args,
+                         subjects=all_subjects,
                          current_search=search, current_subject=subject_filter,
                          current_min_price=min_price, current_max_price=max_price,
                          current_min_rating=min_rating, current_availability_day=availability_day,
@@ -143,21 +158,10 @@ def tutor_detail(tutor_id):
         flash('This tutor profile is not available.', 'error')
         return redirect(url_for('main.tutorsearch'))
 
-    # Get tutor availability and convert to local timezone
-    availability_slots = TutorAvailability.get_tutor_availability(tutor_id)
+    # Get tutor availability converted to their local timezone
     availability = {}
-
-    if availability_slots and tutor.timezone:
-        for day, slots in availability_slots.items():
-            day_name = day.name.lower()
-            availability[day_name] = []
-            for slot in slots:
-                local_start, local_end = slot.get_local_times(tutor.timezone)
-                availability[day_name].append({
-                    'start_time_local': local_start.strftime('%H:%M'),
-                    'end_time_local': local_end.strftime('%H:%M'),
-                    'is_available': slot.is_available
-                })
+    if tutor.timezone:
+        availability = TutorAvailability.get_local_availability(tutor_id, tutor.timezone)
 
     return render_template('tutor_detail.html', tutor=tutor, availability=availability)
 
@@ -240,6 +244,12 @@ def login():
             flash('Please provide both email and password.', 'error')
             return render_template('login.html')
 
+        # Turn away repeated attempts before checking the password
+        retry_after = throttle('login', email, email_failures_only=True)
+        if retry_after:
+            flash(f'Too many sign-in attempts. Please try again in {retry_message(retry_after)}.', 'error')
+            return render_template('login.html'), 429
+
         # Attempt to authenticate the user
         user = authenticate_user(email, password)
 
@@ -248,6 +258,10 @@ def login():
             flash('Your tutor account is pending admin verification. Please wait for approval before logging in.', 'warning')
             current_app.logger.info(f"Unverified tutor attempted login: {email}")
             return render_template('login.html')
+        elif user == 'busy':
+            current_app.logger.warning(f"Login turned away while password checks were saturated: {email}")
+            flash('We are handling a lot of sign-ins right now. Please try again in a moment.', 'warning')
+            return render_template('login.html'), 503
         elif user:
             # Log the user in
             login_user(user.id, user.role.value, user.fullname)
@@ -276,6 +290,7 @@ def login():
         else:
             # Log failed login attempt
             current_app.logger.warning(f"Failed login attempt for: {email}")
+            record_failure('login', email)
             flash('Invalid email or password.', 'error')
 
     # Render login form for GET requests and failed POST requests
@@ -288,8 +303,7 @@ def login():
 def book_session(tutor_id):
     """Show booking calendar for a specific tutor."""
     from models.tutor import Tutor
-    from models.availability import TutorAvailability
-    from models.booking import Booking
+    from models.slots import get_tutor_schedule
     from datetime import date, timedelta
 
     tutor = Tutor.query.get_or_404(tutor_id)
@@ -303,64 +317,67 @@ def book_session(tutor_id):
     start_date = date.today() + timedelta(days=1)
     end_date = start_date + timedelta(days=6)
 
-    # Get tutor's availability
-    availability_slots = TutorAvailability.get_tutor_availability(tutor_id)
-
-    # Get existing bookings for this date range
-    existing_bookings = Booking.get_tutor_bookings_for_date_range(tutor_id, start_date, end_date)
-
-    # Convert to a format that's easier to work with in the template
-    availability_calendar = {}
-    booking_calendar = {}
-
-    # Process availability
-    if availability_slots and tutor.timezone:
-        for day, slots in availability_slots.items():
-            day_name = day.name.lower()
-            availability_calendar[day_name] = []
-            for slot in slots:
-                if slot.is_available:
-                    local_start, local_end = slot.get_local_times(tutor.timezone)
-                    availability_calendar[day_name].append({
-                        'start_time': local_start.strftime('%H:%M'),
-                        'end_time': local_end.strftime('%H:%M'),
-                        'start_time_obj': local_start,
-                        'end_time_obj': local_end
-                    })
-
-    # Process existing bookings
-    for booking in existing_bookings:
-        date_str = booking.booking_date.strftime('%Y-%m-%d')
-        if date_str not in booking_calendar:
-            booking_calendar[date_str] = []
-
-        if tutor.timezone:
-            local_start, local_end = booking.get_local_times(tutor.timezone)
-            booking_calendar[date_str].append({
-                'start_time': local_start.strftime('%H:%M'),
-                'end_time': local_end.strftime('%H:%M')
-            })
+    # Compute free and booked intervals for each date
+    schedule = get_tutor_schedule(tutor, start_date, end_date)
 
     # Generate date range for template
     date_range = []
-    current_date = start_date
-    while current_date <= end_date:
-        day_name = current_date.strftime('%A').lower()
+    for day in schedule:
         date_range.append({
-            'date': current_date,
-            'date_str': current_date.strftime('%Y-%m-%d'),
-            'display_date': current_date.strftime('%B %d, %Y'),
-            'day_name': day_name,
-            'short_day': current_date.strftime('%a'),
-            'availability': availability_calendar.get(day_name, []),
-            'bookings': booking_calendar.get(current_date.strftime('%Y-%m-%d'), [])
+            'date': day.date,
+            'date_str': day.date.strftime('%Y-%m-%d'),
+            'display_date': day.date.strftime('%B %d, %Y'),
+            'day_name': day.date.strftime('%A').lower(),
+            'short_day': day.date.strftime('%a'),
+            'slots': sorted([(slot, False) for slot in day.free] + [(slot, True) for slot in day.booked],
+                            key=lambda entry: entry[0].start_minute)
         })
-        current_date += timedelta(days=1)
 
     return render_template('booking_calendar.html',
                          tutor=tutor,
                          date_range=date_range,
-                         tutor_timezone=tutor.timezone)
+                         tutor_timezone=tutor.timezone,
+                         series_max_weeks=current_app.config.get('BOOKING_SERIES_MAX_WEEKS', 8))
+
+
+@main_bp.route('/tutor/<int:tutor_id>/free_slots')
+def tutor_free_slots(tutor_id):
+    """
+    Return a tutor's bookable free intervals as JSON.
+
+    Accepts optional 'start' and 'end' dates (YYYY-MM-DD); the range defaults
+    to the next 7 days and is limited to the booking window.
+    """
+    from models.tutor import Tutor
+    from models.slots import get_tutor_schedule
+    from datetime import date, datetime, timedelta
+
+    tutor = Tutor.query.get_or_404(tutor_id)
+    if not tutor.is_active:
+        return jsonify({'error': 'This tutor is not available for booking.'}), 404
+
+    # Bookings are accepted from tomorrow up to 14 days in advance
+    min_date = date.today() + timedelta(days=1)
+    max_date = date.today() + timedelta(days=14)
+
+    try:
+        start_date = datetime.strptime(request.args.get('start'), '%Y-%m-%d').date() \
+            if request.args.get('start') else min_date
+        end_date = datetime.strptime(request.args.get('end'), '%Y-%m-%d').date() \
+            if request.args.get('end') else start_date + timedelta(days=6)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+    start_date = max(start_date, min_date)
+    end_date = min(end_date, max_date)
+
+    schedule = get_tutor_schedule(tutor, start_date, end_date) if start_date <= end_date else []
+
+    return jsonify({
+        'tutor_id': tutor.id,
+        'timezone': tutor.timezone or 'UTC',
+        'days': [day.to_dict() for day in schedule]
+    })
 
 
 @main_bp.route('/confirm_booking/<int:tutor_id>', methods=['POST'])
@@ -369,7 +386,7 @@ def book_session(tutor_id):
 def confirm_booking(tutor_id):
     """Process a booking request."""
     from models.tutor import Tutor
-    from models.booking import Booking
+    from models.booking import Booking, BookingSeries
     from datetime import datetime, date
 
     tutor = Tutor.query.get_or_404(tutor_id)
@@ -381,6 +398,7 @@ def confirm_booking(tutor_id):
     end_time_str = request.form.get('end_time')
     subject = request.form.get('subject')
     notes = request.form.get('notes')
+    repeat_weeks = request.form.get('repeat_weeks', 1, type=int)
 
     if not all([booking_date_str, start_time_str, end_time_str]):
         flash('Missing required booking information.', 'error')
@@ -392,6 +410,28 @@ def confirm_booking(tutor_id):
         flash('Invalid date format.', 'error')
         return redirect(url_for('main.book_session', tutor_id=tutor_id))
 
+    if repeat_weeks and repeat_weeks > 1:
+        # Book the same time every week
+        series, error_message = BookingSeries.create_series(
+            student_id=student_id,
+            tutor_id=tutor_id,
+            first_date=booking_date,
+            start_time_str=start_time_str,
+            end_time_str=end_time_str,
+            weeks=repeat_weeks,
+            subject=subject,
+            notes=notes
+        )
+
+        if series:
+            flash(f'Your {series.weeks} weekly sessions have been booked successfully! '
+                  'The tutor will confirm your appointments.', 'success')
+            current_app.logger.info(f"Booking series created: Student {student_id} booked {series.weeks} weeks "
+                                    f"with Tutor {tutor_id} from {booking_date}")
+            return redirect(url_for('student.dashboard'))
+        flash(error_message, 'error')
+        return redirect(url_for('main.book_session', tutor_id=tutor_id))
+
     # Create the booking
     booking, error_message = Booking.create_booking(
         student_id=student_id,
@@ -3,7 +3,7 @@ Student views for the TutorConnect application.
 Contains routes for student registration, profile management, etc.
 """
 from flask import (Blueprint, render_template, request, url_for, redirect, 
-                  flash, current_app, session)
+                  flash, current_app, g)
 from sqlalchemy.exc import IntegrityError
 
 from db import db
@@ -110,13 +110,8 @@ def dashboard():
 @role_required(['student'])
 def profile():
     """Student profile page."""
-    # Get the current student from the database
-    student_id = session.get('user_id')
-    student = Student.query.get(student_id)
-    
-    if not student:
-        flash('Student profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    # Current student, loaded once per request by auth.load_current_user
+    student = g.current_user
         
     return render_template('student/profile.html', student=student)
 
@@ -126,12 +121,7 @@ def profile():
 @role_required(['student'])
 def settings():
     """Student settings page - Profile section."""
-    student_id = session.get('user_id')
-    student = Student.query.get(student_id)
-    
-    if not student:
-        flash('Student profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    student = g.current_user
         
     return render_template('student/settings.html', user=student, active_section='profile')
 
@@ -141,12 +131,7 @@ def settings():
 @role_required(['student'])
 def settings_appearance():
     """Student settings page - Appearance section."""
-    student_id = session.get('user_id')
-    student = Student.query.get(student_id)
-    
-    if not student:
-        flash('Student profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    student = g.current_user
         
     return render_template('student/settings.html', user=student, active_section='appearance')
 
@@ -156,12 +141,7 @@ def settings_appearance():
 @role_required(['student'])
 def settings_notifications():
     """Student settings page - Notifications section."""
-    student_id = session.get('user_id')
-    student = Student.query.get(student_id)
-    
-    if not student:
-        flash('Student profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    student = g.current_user
         
     return render_template('student/settings.html', user=student, active_section='notifications')
 
@@ -171,12 +151,7 @@ def settings_notifications():
 @role_required(['student'])
 def settings_privacy():
     """Student settings page - Privacy section."""
-    student_id = session.get('user_id')
-    student = Student.query.get(student_id)
-    
-    if not student:
-        flash('Student profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    student = g.current_user
         
     return render_template('student/settings.html', user=student, active_section='privacy')
 
@@ -186,12 +161,7 @@ def settings_privacy():
 @role_required(['student'])
 def edit_profile():
     """Show student profile edit form."""
-    student_id = session.get('user_id')
-    student = Student.query.get(student_id)
-    
-    if not student:
-        flash('Student profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    student = g.current_user
         
     return render_template('student/edit_profile.html', student=student)
 
@@ -201,12 +171,7 @@ def edit_profile():
 @role_required(['student'])
 def edit_profile_submit():
     """Update student profile information."""
-    student_id = session.get('user_id')
-    student = Student.query.get(student_id)
-    
-    if not student:
-        flash('Student profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    student = g.current_user
     
     # Basic validation
     errors = []
@@ -241,7 +206,7 @@ def edit_profile_submit():
         # Handle subjects interested
         subjects = request.form.getlist('subjects[]')
         if subjects:
-            student.subjects_interested = ','.join(subjects)
+            student.set_subjects(subjects)
         
         # Handle date of birth
         if dob:
@@ -269,10 +234,13 @@ def edit_profile_submit():
                 else:
                     flash('Invalid file type for profile picture. Allowed: png, jpg, jpeg', 'error')
         
-        db.session.commit()
+        db.session.flush()
         flash('Profile updated successfully!', 'success')
         return redirect(url_for('student.profile'))
         
+    except IntegrityError:
+        db.session.rollback()
+        flash('An account with that email already exists.', 'error')
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error updating student profile: {str(e)}")
@@ -286,12 +254,7 @@ def edit_profile_submit():
 @role_required(['student'])
 def update_profile():
     """Update student profile information from settings page."""
-    student_id = session.get('user_id')
-    student = Student.query.get(student_id)
-    
-    if not student:
-        flash('Student profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    student = g.current_user
     
     try:
         # Update profile fields
@@ -305,7 +268,7 @@ def update_profile():
         # Handle subjects interested
         subjects = request.form.getlist('subjects[]')
         if subjects:
-            student.subjects_interested = ','.join(subjects)
+            student.set_subjects(subjects)
         
         # Handle profile picture upload if provided
         if 'profile_picture' in request.files:
@@ -326,9 +289,12 @@ def update_profile():
                 else:
                     flash('Invalid file type for profile picture. Allowed: png, jpg, jpeg', 'error')
 
-        db.session.commit()
+        db.session.flush()
         flash('Profile updated successfully!', 'success')
         
+    except IntegrityError:
+        db.session.rollback()
+        flash('An account with that email already exists.', 'error')
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error updating student profile: {str(e)}")
@@ -3,14 +3,17 @@ Tutor views for the TutorConnect application.
 Contains routes for tutor registration, profile management, etc.
 """
 from flask import (Blueprint, render_template, request, url_for, redirect, 
-                  flash, current_app, session)
+                  flash, current_app, session, g)
 from flask_moment import Moment
 
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, defer, with_expression
 
 from db import db
 from models.tutor import Tutor
-from models.availability import TutorAvailability, DayOfWeek
+from models.availability import (TutorAvailability, TutorAvailabilityException,
+                                 AvailabilityExceptionType, DayOfWeek)
 from auth import login_user, login_required, role_required
 from utils.file_handling import allowed_file, save_uploaded_file
 
@@ -151,32 +154,35 @@ def dashboard():
     # Get recent messages for this tutor
     tutor_id = session.get('user_id')
     recent_messages = Message.query.filter_by(receiver_id=tutor_id)\
+                                  .options(joinedload(Message.sender), defer(Message.message))\
                                   .order_by(Message.created_at.desc())\
                                   .limit(5)\
                                   .all()
 
-    # Count unread messages
-    unread_count = Message.query.filter_by(receiver_id=tutor_id, is_read=False).count()
+    # Count unread messages from the conversation summaries
+    unread_count = Message.get_inbox_stats(tutor_id)['unread']
 
     # Get upcoming bookings (next 14 days)
     today = date.today()
     end_date = today + timedelta(days=14)
-    upcoming_bookings = Booking.get_tutor_bookings_for_date_range(tutor_id, today, end_date)
-
-    # Sort by date and time
-    upcoming_bookings.sort(key=lambda x: (x.booking_date, x.start_time))
+    upcoming_bookings = Booking.active_in_range(tutor_id, today, end_date)\
+                               .options(joinedload(Booking.student))\
+                               .order_by(Booking.booking_date, Booking.start_time)\
+                               .limit(3)\
+                               .all()  # Show only 3 in dashboard
 
     # Get counts by status
-    pending_count = sum(1 for b in upcoming_bookings if b.status == BookingStatus.PENDING)
-    confirmed_count = sum(1 for b in upcoming_bookings if b.status == BookingStatus.CONFIRMED)
+    status_counts = Booking.get_status_counts(tutor_id, today, end_date)
+    pending_count = status_counts[BookingStatus.PENDING]
+    confirmed_count = status_counts[BookingStatus.CONFIRMED]
 
     return render_template('tutor/dashboard.html',
                          recent_messages=recent_messages,
                          unread_count=unread_count,
-                         upcoming_bookings=upcoming_bookings[:3],  # Show only 3 in dashboard
+                         upcoming_bookings=upcoming_bookings,
                          pending_count=pending_count,
                          confirmed_count=confirmed_count,
-                         total_upcoming=len(upcoming_bookings))
+                         total_upcoming=pending_count + confirmed_count)
 
 
 @tutor_bp.route('/profile')
@@ -184,13 +190,8 @@ def dashboard():
 @role_required(['tutor'])
 def profile():
     """Tutor profile page."""
-    # Get the current tutor from the database
-    tutor_id = session.get('user_id')
-    tutor = Tutor.query.get(tutor_id)
-    
-    if not tutor:
-        flash('Tutor profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    # Current tutor, loaded once per request by auth.load_current_user
+    tutor = g.current_user
         
     return render_template('tutor/profile.html', tutor=tutor)
 
@@ -200,12 +201,7 @@ def profile():
 @role_required(['tutor'])
 def settings():
     """Tutor settings page - Profile section."""
-    tutor_id = session.get('user_id')
-    tutor = Tutor.query.get(tutor_id)
-    
-    if not tutor:
-        flash('Tutor profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    tutor = g.current_user
         
     return render_template('tutor/settings.html', user=tutor, active_section='profile')
 
@@ -215,12 +211,7 @@ def settings():
 @role_required(['tutor'])
 def settings_appearance():
     """Tutor settings page - Appearance section."""
-    tutor_id = session.get('user_id')
-    tutor = Tutor.query.get(tutor_id)
-    
-    if not tutor:
-        flash('Tutor profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    tutor = g.current_user
         
     return render_template('tutor/settings.html', user=tutor, active_section='appearance')
 
@@ -230,12 +221,7 @@ def settings_appearance():
 @role_required(['tutor'])
 def settings_notifications():
     """Tutor settings page - Notifications section."""
-    tutor_id = session.get('user_id')
-    tutor = Tutor.query.get(tutor_id)
-    
-    if not tutor:
-        flash('Tutor profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    tutor = g.current_user
         
     return render_template('tutor/settings.html', user=tutor, active_section='notifications')
 
@@ -245,33 +231,18 @@ def settings_notifications():
 @role_required(['tutor'])
 def settings_availability():
     """Tutor settings page - Availability section."""
-    tutor_id = session.get('user_id')
-    tutor = Tutor.query.get(tutor_id)
-    
-    if not tutor:
-        flash('Tutor profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    tutor = g.current_user
     
-    # Get current availability and convert to local timezone
-    availability_slots = TutorAvailability.get_tutor_availability(tutor_id)
+    # Get current availability converted to the tutor's local timezone
     availability = {}
-    
-    if availability_slots and tutor.timezone:
-        for day, slots in availability_slots.items():
-            day_name = day.name.lower()
-            availability[day_name] = []
-            for slot in slots:
-                local_start, local_end = slot.get_local_times(tutor.timezone)
-                availability[day_name].append({
-                    'start_time_local': local_start.strftime('%H:%M'),
-                    'end_time_local': local_end.strftime('%H:%M'),
-                    'is_available': slot.is_available
-                })
+    if tutor.timezone:
+        availability = TutorAvailability.get_local_availability(tutor.id, tutor.timezone)
         
     return render_template('tutor/settings.html', 
                          user=tutor, 
                          active_section='availability',
-                         availability=availability)
+                         availability=availability,
+                         exceptions=TutorAvailabilityException.get_upcoming(tutor.id))
 
 
 @tutor_bp.route('/settings/privacy')
@@ -279,12 +250,7 @@ def settings_availability():
 @role_required(['tutor'])
 def settings_privacy():
     """Tutor settings page - Privacy section."""
-    tutor_id = session.get('user_id')
-    tutor = Tutor.query.get(tutor_id)
-    
-    if not tutor:
-        flash('Tutor profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    tutor = g.current_user
         
     return render_template('tutor/settings.html', user=tutor, active_section='privacy')
 
@@ -294,12 +260,7 @@ def settings_privacy():
 @role_required(['tutor'])
 def edit_profile():
     """Show tutor profile edit form."""
-    tutor_id = session.get('user_id')
-    tutor = Tutor.query.get(tutor_id)
-    
-    if not tutor:
-        flash('Tutor profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    tutor = g.current_user
         
     return render_template('tutor/edit_profile.html', tutor=tutor)
 
@@ -309,12 +270,7 @@ def edit_profile():
 @role_required(['tutor'])
 def edit_profile_submit():
     """Update tutor profile information."""
-    tutor_id = session.get('user_id')
-    tutor = Tutor.query.get(tutor_id)
-    
-    if not tutor:
-        flash('Tutor profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    tutor = g.current_user
     
     # Basic validation
     errors = []
@@ -353,11 +309,12 @@ def edit_profile_submit():
         tutor.fullname = fullname
         tutor.email = email
         tutor.phone = request.form.get('phone')
+        timezone_changed = timezone != tutor.timezone
         tutor.timezone = timezone
         tutor.bio = bio
         tutor.qualification = qualification
         tutor.experience = float(experience_str)
-        tutor.subjects_taught = ','.join(subjects)
+        tutor.set_subjects(subjects)
         
         # Handle hourly rate if provided
         hourly_rate_str = request.form.get('hourly_rate')
@@ -384,10 +341,17 @@ def edit_profile_submit():
                 else:
                     flash('Invalid file type for profile picture. Allowed: png, jpg, jpeg', 'error')
         
-        db.session.commit()
+        if timezone_changed:
+            # The search bitmap and availability occurrences depend on the timezone
+            TutorAvailability.refresh_derived(tutor.id, tutor.timezone)
+        
+        db.session.flush()
         flash('Profile updated successfully!', 'success')
         return redirect(url_for('tutor.profile'))
         
+    except IntegrityError:
+        db.session.rollback()
+        flash('An account with that email already exists.', 'error')
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error updating tutor profile: {str(e)}")
@@ -401,19 +365,16 @@ def edit_profile_submit():
 @role_required(['tutor'])
 def update_profile():
     """Update tutor profile information from settings page."""
-    tutor_id = session.get('user_id')
-    tutor = Tutor.query.get(tutor_id)
-    
-    if not tutor:
-        flash('Tutor profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    tutor = g.current_user
     
     try:
         # Update profile fields
         tutor.fullname = request.form.get('fullname', tutor.fullname)
         tutor.email = request.form.get('email', tutor.email)
         tutor.phone = request.form.get('phone', tutor.phone)
-        tutor.timezone = request.form.get('timezone', tutor.timezone)
+        timezone = request.form.get('timezone', tutor.timezone)
+        timezone_changed = timezone != tutor.timezone
+        tutor.timezone = timezone
         tutor.bio = request.form.get('bio', tutor.bio)
         tutor.qualification = request.form.get('qualification', tutor.qualification)
         
@@ -428,7 +389,7 @@ def update_profile():
         # Handle subjects
         subjects = request.form.getlist('subjects[]')
         if subjects:
-            tutor.subjects_taught = ','.join(subjects)
+            tutor.set_subjects(subjects)
         
         # Handle hourly rate if provided
         hourly_rate_str = request.form.get('hourly_rate')
@@ -454,9 +415,16 @@ def update_profile():
                 else:
                     flash('Invalid file type for profile picture. Allowed: png, jpg, jpeg', 'error')
         
-        db.session.commit()
+        if timezone_changed:
+            # The search bitmap and availability occurrences depend on the timezone
+            TutorAvailability.refresh_derived(tutor.id, tutor.timezone)
+        
+        db.session.flush()
         flash('Profile updated successfully!', 'success')
         
+    except IntegrityError:
+        db.session.rollback()
+        flash('An account with that email already exists.', 'error')
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error updating tutor profile: {str(e)}")
@@ -470,12 +438,7 @@ def update_profile():
 @role_required(['tutor'])
 def update_availability():
     """Update tutor availability settings."""
-    tutor_id = session.get('user_id')
-    tutor = Tutor.query.get(tutor_id)
-    
-    if not tutor:
-        flash('Tutor profile not found.', 'error')
-        return redirect(url_for('main.index'))
+    tutor = g.current_user
     
     if not tutor.timezone:
         flash('Please set your timezone in profile settings before setting availability.', 'error')
@@ -505,7 +468,7 @@ def update_availability():
         
         # Update availability using the model method
         TutorAvailability.update_tutor_availability(
-            tutor_id=tutor_id,
+            tutor_id=tutor.id,
             availability_data=availability_data,
             tutor_timezone=tutor.timezone
         )
@@ -520,26 +483,127 @@ def update_availability():
     return redirect(url_for('tutor.settings_availability'))
 
 
+@tutor_bp.route('/settings/availability/exceptions/add', methods=['POST'])
+@login_required
+@role_required(['tutor'])
+def add_availability_exception():
+    """Block dates (e.g. holidays) or add extra availability for specific dates."""
+    from datetime import datetime
+    
+    tutor = g.current_user
+    
+    try:
+        exception_type = AvailabilityExceptionType(request.form.get('exception-type'))
+        start_date = datetime.strptime(request.form.get('exception-start-date', ''), '%Y-%m-%d').date()
+        end_date_str = request.form.get('exception-end-date')
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else None
+    except ValueError:
+        flash('Please choose an exception type and valid dates.', 'error')
+        return redirect(url_for('tutor.settings_availability'))
+    
+    exception, error_message = TutorAvailabilityException.create_exception(
+        tutor_id=tutor.id,
+        exception_type=exception_type,
+        start_date=start_date,
+        end_date=end_date,
+        start_time_str=request.form.get('exception-start-time') or None,
+        end_time_str=request.form.get('exception-end-time') or None,
+        note=request.form.get('exception-note') or None
+    )
+    
+    if exception:
+        flash('Availability exception saved.', 'success')
+    else:
+        flash(error_message, 'error')
+    
+    return redirect(url_for('tutor.settings_availability'))
+
+
+@tutor_bp.route('/settings/availability/exceptions/<int:exception_id>/delete', methods=['POST'])
+@login_required
+@role_required(['tutor'])
+def delete_availability_exception(exception_id):
+    """Remove an availability exception."""
+    tutor = g.current_user
+    
+    exception = TutorAvailabilityException.query.filter_by(id=exception_id, tutor_id=tutor.id).first_or_404()
+    db.session.delete(exception)
+    db.session.flush()
+    flash('Availability exception removed.', 'success')
+    
+    return redirect(url_for('tutor.settings_availability'))
+
+
 @tutor_bp.route('/messages')
 @login_required
 @role_required(['tutor'])
 def messages():
-    """View all messages received by the tutor."""
+    """View the tutor's conversations, one row per student, most recent first."""
+    from models.message import Message
+    from models.conversation import Conversation
+    from utils.pagination import keyset_paginate
+    
+    tutor_id = session.get('user_id')
+    
+    # Get one page of conversations with their last message (body not loaded)
+    conversation_query = Conversation.query.filter_by(tutor_id=tutor_id)\
+                                           .options(joinedload(Conversation.student),
+                                                    joinedload(Conversation.last_message)
+                                                    .defer(Message.message))
+    page = keyset_paginate(
+        conversation_query,
+        [Conversation.last_message_at, Conversation.id],
+        per_page=current_app.config.get('TUTOR_INBOX_PAGE_SIZE', 20),
+        after=request.args.get('after'),
+        before=request.args.get('before')
+    )
+    
+    # Get total, unread and student counts from the conversation rows
+    stats = Message.get_inbox_stats(tutor_id)
+    
+    return render_template('tutor/conversations.html',
+                         conversations=page.items,
+                         page=page,
+                         stats=stats,
+                         unread_count=stats['unread'])
+
+
+@tutor_bp.route('/messages/student/<int:student_id>')
+@login_required
+@role_required(['tutor'])
+def conversation(student_id):
+    """View messages from one student, one page at a time."""
     from models.message import Message
+    from models.conversation import Conversation
+    from utils.pagination import keyset_paginate
     
     tutor_id = session.get('user_id')
+    conversation = Conversation.query.filter_by(tutor_id=tutor_id, student_id=student_id)\
+                                     .options(joinedload(Conversation.student))\
+                                     .first_or_404()
     
-    # Get all messages for this tutor, ordered by creation date (newest first)
-    all_messages = Message.query.filter_by(receiver_id=tutor_id)\
-                                .order_by(Message.created_at.desc())\
-                                .all()
+    # Get one page of messages, newest first, with a short preview instead of the full body
+    thread_query = Message.query.filter_by(receiver_id=tutor_id, sender_id=student_id)\
+                                .options(joinedload(Message.sender),
+                                         defer(Message.message),
+                                         with_expression(Message.preview,
+                                                         func.substr(Message.message, 1, Message.PREVIEW_LENGTH + 1)))
+    page = keyset_paginate(
+        thread_query,
+        [Message.created_at, Message.id],
+        per_page=current_app.config.get('TUTOR_INBOX_PAGE_SIZE', 20),
+        after=request.args.get('after'),
+        before=request.args.get('before')
+    )
     
-    # Count unread messages
-    unread_count = Message.query.filter_by(receiver_id=tutor_id, is_read=False).count()
+    stats = {'total': conversation.message_count, 'unread': conversation.tutor_unread_count}
     
     return render_template('tutor/messages.html', 
-                         messages=all_messages, 
-                         unread_count=unread_count)
+                         messages=page.items, 
+                         page=page,
+                         conversation=conversation,
+                         stats=stats,
+                         unread_count=stats['unread'])
 
 
 @tutor_bp.route('/message/<int:message_id>')
@@ -572,17 +636,16 @@ def bookings():
     page = request.args.get('page', 1, type=int)
     per_page = 20
 
-    # Get paginated bookings for this tutor, ordered by date (newest first)
+    # Get paginated bookings for this tutor, ordered by date (newest first);
+    # the series sets each booking's reschedule window
     pagination_obj = Booking.query.filter_by(tutor_id=tutor_id)\
+                                   .options(joinedload(Booking.student), joinedload(Booking.series))\
                                    .order_by(Booking.booking_date.desc(),
                                             Booking.start_time.desc())\
                                    .paginate(page=page, per_page=per_page, error_out=False)
 
-    # Get all bookings for status counts
-    all_bookings = Booking.query.filter_by(tutor_id=tutor_id).all()
-    pending_count = sum(1 for b in all_bookings if b.status == BookingStatus.PENDING)
-    confirmed_count = sum(1 for b in all_bookings if b.status == BookingStatus.CONFIRMED)
-    completed_count = sum(1 for b in all_bookings if b.status == BookingStatus.COMPLETED)
+    # Get status counts with a single aggregate query
+    status_counts = Booking.get_status_counts(tutor_id)
 
     # Create pagination info
     pagination = {
@@ -601,10 +664,10 @@ def bookings():
     return render_template('tutor/bookings.html',
                          bookings=pagination_obj.items,
                          pagination=pagination,
-                         total_bookings=len(all_bookings),
-                         pending_count=pending_count,
-                         confirmed_count=confirmed_count,
-                         completed_count=completed_count)
+                         total_bookings=sum(status_counts.values()),
+                         pending_count=status_counts[BookingStatus.PENDING],
+                         confirmed_count=status_counts[BookingStatus.CONFIRMED],
+                         completed_count=status_counts[BookingStatus.COMPLETED])
 
 
 @tutor_bp.route('/booking/<int:booking_id>')
@@ -626,10 +689,10 @@ def booking_detail(booking_id):
     end_datetime = datetime.combine(booking.booking_date, booking.end_time)
     duration = int((end_datetime - start_datetime).total_seconds() / 60)
 
-    # Calculate min and max dates for rescheduling (1-14 days from today)
+    # Calculate min and max dates for rescheduling (from tomorrow to the booking's window)
     today = date.today()
     min_date = (today + timedelta(days=1)).strftime('%Y-%m-%d')
-    max_date = (today + timedelta(days=14)).strftime('%Y-%m-%d')
+    max_date = booking.latest_reschedule_date().strftime('%Y-%m-%d')
 
     return render_template('tutor/booking_detail.html',
                          booking=booking,
@@ -688,7 +751,7 @@ def cancel_booking(booking_id):
 def reschedule_booking(booking_id):
     """Reschedule a booking."""
     from models.booking import Booking
-    from datetime import datetime, date, timedelta
+    from datetime import datetime
 
     tutor_id = session.get('user_id')
 
@@ -708,48 +771,23 @@ def reschedule_booking(booking_id):
         # Parse new date
         new_date = datetime.strptime(new_date_str, '%Y-%m-%d').date()
 
-        # Validate new date (1-14 days from today)
-        today = date.today()
-        min_date = today + timedelta(days=1)
-        max_date = today + timedelta(days=14)
-
-        if new_date < min_date:
-            flash('Cannot reschedule within 24 hours. Please select a future date.', 'error')
-            return redirect(url_for('tutor.booking_detail', booking_id=booking_id))
-
-        if new_date > max_date:
-            flash('Cannot reschedule more than 14 days in advance.', 'error')
+        # Validate the date and times; series sessions may move within the series window
+        new_start_time, new_end_time, error_message = Booking.validate_request(
+            new_date, new_start_time_str, new_end_time_str, latest_date=booking.latest_reschedule_date()
+        )
+        if error_message:
+            flash(error_message, 'error')
             return redirect(url_for('tutor.booking_detail', booking_id=booking_id))
 
-        # Parse new times
-        new_start_hour, new_start_min = map(int, new_start_time_str.split(':'))
-        new_end_hour, new_end_min = map(int, new_end_time_str.split(':'))
-        from datetime import time
-        new_start_time = time(new_start_hour, new_start_min)
-        new_end_time = time(new_end_hour, new_end_min)
+        # Check for conflicts with other bookings while holding the tutor-day claim
+        from models.booking import TutorBookingDay
 
-        if new_start_time >= new_end_time:
-            flash('End time must be after start time.', 'error')
-            return redirect(url_for('tutor.booking_detail', booking_id=booking_id))
-
-        # Check for conflicts with other bookings
-        from sqlalchemy import and_
-        from models.booking import BookingStatus
-
-        conflict = Booking.query.filter(
-            and_(
-                Booking.tutor_id == tutor_id,
-                Booking.id != booking_id,  # Exclude current booking
-                Booking.booking_date == new_date,
-                Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
-                and_(
-                    Booking.start_time < new_end_time,
-                    Booking.end_time > new_start_time
-                )
-            )
-        ).first()
+        TutorBookingDay.claim(tutor_id, new_date)
+        conflict = Booking.find_conflict(tutor_id, new_date, new_start_time, new_end_time,
+                                         exclude_id=booking_id)
 
         if conflict:
+            db.session.rollback()
             flash('This time slot conflicts with another booking.', 'error')
             return redirect(url_for('tutor.booking_detail', booking_id=booking_id))
 
@@ -758,8 +796,9 @@ def reschedule_booking(booking_id):
         booking.start_time = new_start_time
         booking.end_time = new_end_time
         booking.updated_at = datetime.utcnow()
+        booking.publish_change('booking.updated')
 
-        db.session.commit()
+        db.session.flush()
         flash('Booking rescheduled successfully!', 'success')
 
     except ValueError as e: